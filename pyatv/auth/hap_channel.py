@@ -8,6 +8,7 @@ from pyatv import exceptions
 from pyatv.auth.hap_pairing import PairVerifyProcedure
 from pyatv.auth.hap_session import HAPSession
 from pyatv.support import log_binary
+from pyatv.support.framing import FrameBuffer
 from pyatv.support.state_producer import StateProducer
 
 _LOGGER = logging.getLogger(__name__)
@@ -19,7 +20,7 @@ class AbstractHAPChannel(ABC, StateProducer, asyncio.Protocol):
     def __init__(self, output_key: bytes, input_key: bytes) -> None:
         """Initialize a new AbstractHAPChannel instance."""
         super().__init__()
-        self.buffer: bytes = b""
+        self.buffer: FrameBuffer = FrameBuffer()
         self.transport: Optional[asyncio.Transport] = None
         self.session: HAPSession = HAPSession()
         self.session.enable(output_key, input_key)
@@ -55,7 +56,7 @@ class AbstractHAPChannel(ABC, StateProducer, asyncio.Protocol):
         log_binary(_LOGGER, "Received data", Data=data)
         decrypt = self.session.decrypt(data)
         if decrypt:
-            self.buffer += decrypt
+            self.buffer.append(decrypt)
             self.handle_received()
 
     @abstractmethod
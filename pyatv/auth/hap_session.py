@@ -3,6 +3,7 @@
 from typing import Optional
 
 from pyatv.support.chacha20 import Chacha20Cipher
+from pyatv.support.framing import FrameBuffer
 
 
 class HAPSession:
@@ -21,7 +22,7 @@ class HAPSession:
         self,
     ) -> None:
         """Initialize a new HAPSession instance."""
-        self._encrypted_data = b""
+        self._encrypted_data: FrameBuffer = FrameBuffer()
         self.chacha20: Optional[Chacha20Cipher] = None
 
     def enable(self, output_key: bytes, input_key: bytes) -> None:
@@ -33,34 +34,30 @@ class HAPSession:
         if self.chacha20 is None:
             return data
 
-        self._encrypted_data += data
+        self._encrypted_data.append(data)
 
-        output = b""
-        while self._encrypted_data:
-            length = self._encrypted_data[0:2]
-            block_length = (
-                int.from_bytes(length, byteorder="little") + self.AUTH_TAG_LENGTH
-            )
-            if len(self._encrypted_data) < block_length + 2:
-                return output
-
-            block = self._encrypted_data[2 : 2 + block_length]
-            output += self.chacha20.decrypt(block, aad=length)
+        output = []
+        while True:
+            frame = self._encrypted_data.read_frame(2, self._frame_length)
+            if frame is None:
+                break
 
-            self._encrypted_data = self._encrypted_data[2 + block_length :]
-        return output
+            output.append(
+                self.chacha20.decrypt(bytes(frame[2:]), aad=bytes(frame[0:2]))
+            )
+        return b"".join(output)
 
     def encrypt(self, data: bytes) -> bytes:
         """Encrypt outgoing data."""
         if self.chacha20 is None:
             return data
 
-        output = b""
-        while data:
-            frame = data[0 : self.FRAME_LENGTH]
-            data = data[self.FRAME_LENGTH :]
-
+        output = []
+        for offset in range(0, len(data), self.FRAME_LENGTH):
+            frame = data[offset : offset + self.FRAME_LENGTH]
             length = int.to_bytes(len(frame), 2, byteorder="little")
-            frame = self.chacha20.encrypt(frame, aad=length)
-            output += length + frame
-        return output
+            output += [length, self.chacha20.encrypt(frame, aad=length)]
+        return b"".join(output)
+
+    def _frame_length(self, header: memoryview) -> int:
+        return 2 + int.from_bytes(header, byteorder="little") + self.AUTH_TAG_LENGTH
@@ -1,7 +1,7 @@
 """Constants used in the public API."""
 # pylint: disable=invalid-name
 
-from enum import Enum
+from enum import Enum, Flag
 
 MAJOR_VERSION = "0"
 MINOR_VERSION = "9"
@@ -203,6 +203,32 @@ class PairingRequirement(Enum):
     """Pairing must be performed."""
 
 
+class UpdateSubscription(Flag):
+    """Updates pushed by a device that are subscribed to.
+
+    This is only used by MRP. Features depending on updates that are not subscribed
+    to are reported as unavailable.
+    """
+
+    PlayState = 0
+    """Only what is currently playing (always subscribed to)."""
+
+    Artwork = 1
+    """Artwork updates."""
+
+    Volume = 2
+    """Volume updates."""
+
+    Keyboard = 4
+    """Keyboard (text input) updates."""
+
+    OutputDevices = 8
+    """Output device updates."""
+
+    All = 15
+    """All updates (default)."""
+
+
 class FeatureState(Enum):
     """State of a particular feature."""
 
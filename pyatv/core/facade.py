@@ -14,7 +14,18 @@ import asyncio
 import io
 import logging
 from queue import Queue
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from pyatv import const, exceptions, interface
 from pyatv.const import FeatureName, FeatureState, InputAction, Protocol
@@ -303,9 +314,17 @@ class FacadeStream(Relayer, interface.Stream):  # pylint: disable=too-few-public
 
         await self.relay("play_url")(url, **kwargs)
 
-    async def stream_file(self, file: Union[str, io.BufferedReader], **kwargs) -> None:
+    async def stream_file(
+        self,
+        file: Union[str, io.BufferedReader, Sequence[Union[str, io.BufferedReader]]],
+        **kwargs
+    ) -> None:
         """Stream local file to device.
 
+        If a list of files is given, they are played after each other without any
+        gaps. The next file is prepared while the current file is playing. Audio can
+        also be streamed from a HTTP(S) URL, it is then played while being downloaded.
+
         INCUBATING METHOD - MIGHT CHANGE IN THE FUTURE!
         """
         await self.relay("stream_file")(file, **kwargs)
@@ -404,6 +423,13 @@ class FacadePushUpdater(
         if updater == self.main_instance:
             self.listener.playstatus_error(updater, exception)
 
+    def playstatus_delta(
+        self, updater, changes: Dict[str, interface.FieldChange]
+    ) -> None:
+        """Inform about which fields of what is currently playing that changed."""
+        if updater == self.main_instance:
+            self.listener.playstatus_delta(updater, changes)
+
 
 class FacadeAppleTV(interface.AppleTV):
     """Facade implementation of the external interface."""
@@ -20,6 +20,7 @@ from typing import (
     MutableMapping,
     NamedTuple,
     Optional,
+    Sequence,
     Set,
     Tuple,
     TypeVar,
@@ -35,6 +36,7 @@ from pyatv.const import (
     OperatingSystem,
     PairingRequirement,
     Protocol,
+    UpdateSubscription,
 )
 from pyatv.support.device_info import lookup_version
 from pyatv.support.http import ClientSessionManager
@@ -52,6 +54,10 @@ __pdoc__ = {
 
 _ALL_FEATURES = {}  # type: Dict[int, Tuple[str, str]]
 
+# Default values of protocol specific service settings
+_DEFAULT_PUSH_UPDATE_WINDOW = 0.0
+_DEFAULT_PUSH_UPDATE_MAX_LATENCY = 0.5
+
 ReturnType = TypeVar("ReturnType", bound=Callable[..., Any])
 
 
@@ -64,6 +70,13 @@ class ArtworkInfo(NamedTuple):
     height: int
 
 
+class FieldChange(NamedTuple):
+    """Old and new value of a changed field."""
+
+    old: Any
+    new: Any
+
+
 class FeatureInfo(NamedTuple):
     """Feature state and options."""
 
@@ -138,6 +151,17 @@ class BaseService(ABC):
         self._properties: MutableMapping[str, str] = dict(properties or {})
         self.credentials: Optional[str] = credentials
         self.password: Optional[str] = password
+        self.update_subscriptions: UpdateSubscription = UpdateSubscription.All
+        """Updates to subscribe to when connecting (only used by MRP)."""
+
+        self.push_update_window: float = _DEFAULT_PUSH_UPDATE_WINDOW
+        """Seconds to coalesce bursts of push updates for (only used by MRP)."""
+
+        self.push_update_max_latency: float = _DEFAULT_PUSH_UPDATE_MAX_LATENCY
+        """Max seconds to delay a coalesced push update (only used by MRP)."""
+
+        self.artwork_cache_dir: Optional[str] = None
+        """Directory to persistently cache artwork in (only used by MRP)."""
 
     @property
     def identifier(self) -> Optional[str]:
@@ -172,12 +196,21 @@ class BaseService(ABC):
     def merge(self, other) -> None:
         """Merge with other service of same type.
 
-        Merge will only include credentials, password and properties.
+        Merge will only include credentials, password, properties and settings that
+        have been changed from their defaults in other service.
         """
         self.credentials = other.credentials or self.credentials
         self.password = other.password or self.password
         self._properties.update(other.properties)
 
+        if other.update_subscriptions != UpdateSubscription.All:
+            self.update_subscriptions = other.update_subscriptions
+        if other.push_update_window != _DEFAULT_PUSH_UPDATE_WINDOW:
+            self.push_update_window = other.push_update_window
+        if other.push_update_max_latency != _DEFAULT_PUSH_UPDATE_MAX_LATENCY:
+            self.push_update_max_latency = other.push_update_max_latency
+        self.artwork_cache_dir = other.artwork_cache_dir or self.artwork_cache_dir
+
     def __str__(self) -> str:
         """Return a string representation of this object."""
         return (
@@ -696,6 +729,14 @@ class PushListener(ABC):
     def playstatus_error(self, updater, exception: Exception) -> None:
         """Inform about an error when updating play status."""
 
+    def playstatus_delta(self, updater, changes: Dict[str, FieldChange]) -> None:
+        """Inform about which fields of what is currently playing that changed.
+
+        Keys are names of properties in `pyatv.interface.Playing`. Called right
+        after playstatus_update with the same update. All fields are included in
+        the first update (with None as old value). Implementing this is optional.
+        """
+
 
 class PushUpdater(ABC, StateProducer):
     """Base class for push/async updates from an Apple TV.
@@ -731,11 +772,23 @@ class PushUpdater(ABC, StateProducer):
 
     def post_update(self, playing: Playing) -> None:
         """Post an update to listener."""
-        if playing != self._previous_state:
+        changes = self._changes(playing)
+        if changes:
             self.loop.call_soon(self.listener.playstatus_update, self, playing)
+            self.loop.call_soon(self.listener.playstatus_delta, self, changes)
 
         self._previous_state = playing
 
+    def _changes(self, playing: Playing) -> Dict[str, FieldChange]:
+        previous = self._previous_state
+        changes = {}
+        for prop in Playing._PROPERTIES:  # pylint: disable=protected-access
+            new = getattr(playing, prop)
+            old = None if previous is None else getattr(previous, prop)
+            if previous is None or old != new:
+                changes[prop] = FieldChange(old, new)
+        return changes
+
 
 class Stream:  # pylint: disable=too-few-public-methods
     """Base class for stream functionality."""
@@ -750,9 +803,17 @@ class Stream:  # pylint: disable=too-few-public-methods
         raise exceptions.NotSupportedError()
 
     @feature(44, "StreamFile", "Stream local file to device.")
-    async def stream_file(self, file: Union[str, io.BufferedReader], **kwargs) -> None:
+    async def stream_file(
+        self,
+        file: Union[str, io.BufferedReader, Sequence[Union[str, io.BufferedReader]]],
+        **kwargs
+    ) -> None:
         """Stream local file to device.
 
+        If a list of files is given, they are played after each other without any
+        gaps. The next file is prepared while the current file is playing. Audio can
+        also be streamed from a HTTP(S) URL, it is then played while being downloaded.
+
         INCUBATING METHOD - MIGHT CHANGE IN THE FUTURE!
         """
         raise exceptions.NotSupportedError()
@@ -49,6 +49,14 @@ from pyatv.support.state_producer import StateProducer
 
 _LOGGER = logging.getLogger(__name__)
 
+# Settings copied from a configured MRP service when tunneling MRP over AirPlay
+_TUNNELED_MRP_SETTINGS = [
+    "update_subscriptions",
+    "push_update_window",
+    "push_update_max_latency",
+    "artwork_cache_dir",
+]
+
 
 class AirPlayFeatures(Features):
     """Implementation of supported feature functionality."""
@@ -230,6 +238,10 @@ def setup(  # pylint: disable=too-many-locals
 
         # When tunneling, we don't have any identifier or port available at this stage
         mrp_service = MutableService(None, Protocol.MRP, 0, {})
+        configured_service = config.get_service(Protocol.MRP)
+        if configured_service:
+            for setting in _TUNNELED_MRP_SETTINGS:
+                setattr(mrp_service, setting, getattr(configured_service, setting))
         config.add_service(mrp_service)
         (
             _,
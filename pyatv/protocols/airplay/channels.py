@@ -12,7 +12,7 @@ from pyatv.auth.hap_channel import AbstractHAPChannel
 from pyatv.protocols.mrp import protobuf
 from pyatv.support.http import parse_request
 from pyatv.support.packet import defpacket
-from pyatv.support.variant import read_variant, write_variant
+from pyatv.support.variant import decode_variant, write_variant
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,18 +23,50 @@ DataHeader = defpacket(
 )
 
 
+def _frame_length(header: memoryview) -> int:
+    return int.from_bytes(header[0:4], byteorder="big")
+
+
+def _content_length(header: bytes) -> int:
+    for line in header.decode("utf-8").split("\r\n")[1:]:
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "content-length":
+            return int(value)
+    return 0
+
+
 class EventChannel(AbstractHAPChannel):
     """Connection used to handle the event channel."""
 
     def handle_received(self) -> None:
         """Handle received data that was put in buffer."""
-        self.buffer: bytes
         while self.buffer:
+            # Only data belonging to the next request is copied and parsed, not
+            # everything in the buffer
+            header_end = self.buffer.find(b"\r\n\r\n")
+            if header_end == -1:
+                _LOGGER.debug("Not enough data to parse request on event channel")
+                break
+
+            header = bytes(self.buffer.peek(header_end + 4))
             try:
-                request, self.buffer = parse_request(self.buffer)
+                length = len(header) + _content_length(header)
+            except ValueError:
+                # Discard the header, otherwise it would be parsed again (and fail)
+                # every time data is received
+                _LOGGER.exception("Failed to parse header on event channel")
+                self.buffer.read(len(header))
+                continue
+
+            message = self.buffer.read(length)
+            if message is None:
+                _LOGGER.debug("Not enough data to parse request on event channel")
+                break
+
+            try:
+                request, _ = parse_request(bytes(message))
                 if request is None:
-                    _LOGGER.debug("Not enough data to parse request on event channel")
-                    break
+                    raise ValueError("incomplete request on event channel")
 
                 _LOGGER.debug("Got message on event channel: %s", request)
 
@@ -59,7 +91,7 @@ class EventChannel(AbstractHAPChannel):
 class DataStreamListener(ABC):
     """Listener interface for DataStreamChannel."""
 
-    def handle_protobuf(self, message: protobuf.ProtocolMessage) -> None:
+    def handle_protobuf(self, message: "protobuf.ProtocolMessage") -> None:
         """Handle incoming protobuf message."""
 
     def handle_connection_lost(self, exc: Optional[Exception]) -> None:
@@ -80,27 +112,23 @@ class DataStreamChannel(AbstractHAPChannel):
 
     def handle_received(self) -> None:
         """Handle received data that was put in buffer."""
-        self.buffer: bytes
-        while len(self.buffer) >= DataHeader.length:
-            header = DataHeader.decode(self.buffer, allow_excessive=True)
-            if len(self.buffer) < header.size:
+        while self.buffer:
+            frame = self.buffer.read_frame(DataHeader.length, _frame_length)
+            if frame is None:
                 _LOGGER.debug(
-                    "Not enough data on data channel (has %d, expects %d)",
-                    len(self.buffer),
-                    header.size,
+                    "Not enough data on data channel (has %d)", len(self.buffer)
                 )
                 break
 
             try:
-                self._process_message_from_buffer(header)
+                header = DataHeader.decode(frame, allow_excessive=True)
+                self._process_message_from_buffer(header, frame)
             except Exception:
                 _LOGGER.exception("failed to process data frame")
 
-            self.buffer = self.buffer[header.size :]
-
-    def _process_message_from_buffer(self, header) -> None:
+    def _process_message_from_buffer(self, header, frame: memoryview) -> None:
         # Decode payload and process it
-        payload = plistlib.loads(self.buffer[DataHeader.length : header.size])
+        payload = plistlib.loads(frame[DataHeader.length :])
         if payload:
             self._process_payload(payload)
 
@@ -122,20 +150,21 @@ class DataStreamChannel(AbstractHAPChannel):
             _LOGGER.debug("Got message with unsupported format: %s", message)
             return
 
-        while data:
-            length, raw = read_variant(data)
-            if len(raw) < length:
-                _LOGGER.warning("Expected %d bytes, got %d", length, len(raw))
+        offset = 0
+        while offset < len(data):
+            length, offset = decode_variant(data, offset)
+            if len(data) - offset < length:
+                _LOGGER.warning("Expected %d bytes, got %d", length, len(data) - offset)
                 return
 
-            message = raw[:length]
-            data = raw[length:]
+            message = data[offset : offset + length]
+            offset += length
 
             pb_msg = protobuf.ProtocolMessage()
             pb_msg.ParseFromString(message)
             self.listener.handle_protobuf(pb_msg)
 
-    def send_protobuf(self, message: protobuf.ProtocolMessage) -> None:
+    def send_protobuf(self, message: "protobuf.ProtocolMessage") -> None:
         """Serialize a protobuf message and send it to receiver."""
         serialized_message = message.SerializeToString()
         serialized_length = write_variant(len(serialized_message))
@@ -49,13 +49,13 @@ class AirPlayMrpConnection(AbstractMrpConnection, DataStreamListener):
             self.data_channel.close()
             self.data_channel = None
 
-    def send(self, message: protobuf.ProtocolMessage) -> None:
+    def send(self, message: "protobuf.ProtocolMessage") -> None:
         """Send protobuf message to device."""
         if self.data_channel is not None:
             self.data_channel.send_protobuf(message)
             log_protobuf(_LOGGER, ">> Send: Protobuf", message)
 
-    def handle_protobuf(self, message: protobuf.ProtocolMessage) -> None:
+    def handle_protobuf(self, message: "protobuf.ProtocolMessage") -> None:
         """Handle incoming protobuf message."""
         log_protobuf(_LOGGER, "<< Receive: Protobuf", message)
 
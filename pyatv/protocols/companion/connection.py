@@ -4,10 +4,11 @@ import asyncio
 from collections import deque
 from enum import Enum
 import logging
-from typing import Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 from pyatv import exceptions
 from pyatv.support import chacha20, log_binary
+from pyatv.support.framing import FrameBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +42,10 @@ class FrameType(Enum):
 #  pylint: enable=invalid-name
 
 
+def _frame_length(header: memoryview) -> int:
+    return HEADER_LENGTH + int.from_bytes(header[1:4], byteorder="big")
+
+
 class CompanionConnectionListener(ABC):
     """Listener interface for a Companion connection."""
 
@@ -64,7 +69,7 @@ class CompanionConnection(asyncio.Protocol):
         self.port = port
         self.listener: Optional[CompanionConnectionListener] = listener
         self.transport = None
-        self._buffer: bytes = b""
+        self._buffer: FrameBuffer = FrameBuffer()
         self._chacha: Optional[chacha20.Chacha20Cipher] = None
         self._queue: deque = deque()
 
@@ -93,7 +98,8 @@ class CompanionConnection(asyncio.Protocol):
     ) -> Tuple[bytes, bytes]:
         """Send message and wait for response."""
         semaphore = asyncio.Semaphore(value=0)
-        self._queue.append([None, frame_type, data, semaphore])
+        receiver: List[Any] = [b"", frame_type, data, semaphore]
+        self._queue.append(receiver)
 
         if len(self._queue) == 1:
             self._send_first_in_queue()
@@ -104,11 +110,14 @@ class CompanionConnection(asyncio.Protocol):
             # Note here: This will break if the response is just late, not sure how to
             # deal with that as there are no identifier in the message that can be used
             # to match response
-            self._queue.popleft()
-            self._send_first_in_queue()
+            if self._queue and self._queue[0] is receiver:
+                self._queue.popleft()
+                self._send_first_in_queue()
+            elif receiver in self._queue:
+                self._queue.remove(receiver)
             raise
 
-        response = self._queue.popleft()[0]
+        response = receiver[0]
         log_binary(_LOGGER, "Recv data", Data=response)
 
         header, data = response[0:4], response[4:]
@@ -117,9 +126,6 @@ class CompanionConnection(asyncio.Protocol):
             data = self._chacha.decrypt(data, aad=header)
             log_binary(_LOGGER, "<< Receive data", Header=header, Decrypted=data)
 
-        # If anyone has a pending request, make sure to send it
-        self._send_first_in_queue()
-
         return header, data
 
     def _send_first_in_queue(self) -> None:
@@ -151,27 +157,28 @@ class CompanionConnection(asyncio.Protocol):
 
     def data_received(self, data):
         """Handle data received from companion."""
-        self._buffer += data
+        self._buffer.append(data)
         log_binary(_LOGGER, "Received data", Data=data)
 
-        payload_length = HEADER_LENGTH + int.from_bytes(data[1:4], byteorder="big")
-        if len(self._buffer) < payload_length:
-            _LOGGER.debug(
-                "Require %d bytes but only %d in buffer",
-                len(self._buffer),
-                payload_length,
-            )
-            return
-
-        data = self._buffer[0:payload_length]
-        self._buffer = self._buffer[payload_length:]
-
-        if self._queue:
-            receiver = self._queue[0]
-            receiver[0] = data
-            receiver[3].release()
-        else:
-            log_binary(_LOGGER, "Received data with not receiver", Data=data)
+        while self._buffer:
+            frame = self._buffer.read_frame(HEADER_LENGTH, _frame_length)
+            if frame is None:
+                _LOGGER.debug(
+                    "Waiting for more data (%d bytes in buffer)", len(self._buffer)
+                )
+                break
+
+            # Each request gets one response, the receiver is removed once it has
+            # been delivered so that additional frames are not mixed up with it
+            if self._queue:
+                receiver = self._queue.popleft()
+                receiver[0] = bytes(frame)
+                receiver[3].release()
+
+                # If anyone has a pending request, make sure to send it
+                self._send_first_in_queue()
+            else:
+                log_binary(_LOGGER, "Received data with not receiver", Data=frame)
 
     @staticmethod
     def error_received(exc):
@@ -21,6 +21,7 @@ from pyatv.const import (
     Protocol,
     RepeatState,
     ShuffleState,
+    UpdateSubscription,
 )
 from pyatv.core import MutableService, SetupData, TakeoverMethod, mdns
 from pyatv.core.scan import ScanHandler, ScanHandlerReturn
@@ -49,7 +50,7 @@ from pyatv.protocols.mrp.protobuf import CommandInfo_pb2
 from pyatv.protocols.mrp.protobuf import ContentItemMetadata as cim
 from pyatv.protocols.mrp.protobuf import PlaybackState
 from pyatv.protocols.mrp.protocol import MrpProtocol
-from pyatv.support.cache import Cache
+from pyatv.support.cache import ArtworkCache
 from pyatv.support.device_info import lookup_model, lookup_version
 from pyatv.support.http import ClientSessionManager
 from pyatv.support.state_producer import StateProducer
@@ -253,13 +254,13 @@ def build_playing_instance(state: PlayerState) -> Playing:
 
 async def _send_hid_key(protocol: MrpProtocol, key: str, action: InputAction) -> None:
     async def _do_press(keycode: Tuple[int, int], hold: bool):
-        await protocol.send(messages.send_hid_event(keycode[0], keycode[1], True))
+        await protocol.send(messages.prepared_hid_event(keycode[0], keycode[1], True))
 
         if hold:
             # Hardcoded hold time for one second
             await asyncio.sleep(1)
 
-        await protocol.send(messages.send_hid_event(keycode[0], keycode[1], False))
+        await protocol.send(messages.prepared_hid_event(keycode[0], keycode[1], False))
 
     keycode = _KEY_LOOKUP.get(key)
     if not keycode:
@@ -292,7 +293,13 @@ class MrpRemoteControl(RemoteControl):
         self.protocol = protocol
 
     async def _send_command(self, command, **kwargs):
-        resp = await self.protocol.send_and_receive(messages.command(command, **kwargs))
+        # Commands without options are sent often, so use a template for them
+        if kwargs:
+            message = messages.command(command, **kwargs)
+        else:
+            message = messages.prepared_command(command)
+
+        resp = await self.protocol.send_and_receive(message)
         inner = resp.inner()
 
         if inner.sendError == protobuf.SendError.NoError:
@@ -436,7 +443,7 @@ class MrpMetadata(Metadata):
         self.protocol = protocol
         self.psm = psm
         self.identifier = identifier
-        self.artwork_cache = Cache(limit=4)
+        self.artwork_cache = ArtworkCache(directory=protocol.service.artwork_cache_dir)
 
     @property
     def device_id(self) -> Optional[str]:
@@ -454,22 +461,27 @@ class MrpMetadata(Metadata):
         default size. Set one of them and let the other one be None to keep original
         aspect ratio.
         """
+        if UpdateSubscription.Artwork not in self.protocol.subscriptions:
+            _LOGGER.debug("Not subscribed to artwork updates")
+            return None
+
         identifier = self.artwork_id
         if not identifier:
             _LOGGER.debug("No artwork available")
             return None
 
-        if identifier in self.artwork_cache:
+        artwork = await self.artwork_cache.get(identifier, width, height)
+        if artwork:
             _LOGGER.debug("Retrieved artwork %s from cache", identifier)
-            return self.artwork_cache.get(identifier)
+            return artwork
 
-        artwork: Optional[ArtworkInfo] = None
         try:
             artwork = await self._fetch_artwork(width or 0, height or -1)
         except Exception:
             _LOGGER.warning("Artwork not present in response")
         else:
-            self.artwork_cache.put(identifier, artwork)
+            if artwork:
+                await self.artwork_cache.put(identifier, width, height, artwork)
 
         return artwork
 
@@ -585,13 +597,29 @@ class MrpPower(Power):
 
 
 class MrpPushUpdater(PushUpdater):
-    """Implementation of API for handling push update from an Apple TV."""
+    """Implementation of API for handling push update from an Apple TV.
 
-    def __init__(self, loop, metadata, psm):
+    State changes can be coalesced: an update is posted once no state has changed
+    for coalesce_window seconds, but never more than max_latency seconds after the
+    first unposted state change. A window of zero posts every state change.
+    """
+
+    def __init__(
+        self,
+        loop,
+        metadata,
+        psm,
+        coalesce_window: float = 0.0,
+        max_latency: float = 0.5,
+    ):
         """Initialize a new MrpPushUpdater instance."""
         super().__init__(loop)
         self.metadata = metadata
         self.psm = psm
+        self.coalesce_window = coalesce_window
+        self.max_latency = max_latency
+        self._first_change: Optional[float] = None
+        self._pending: Optional[asyncio.TimerHandle] = None
 
     @property
     def active(self):
@@ -609,14 +637,41 @@ class MrpPushUpdater(PushUpdater):
             return
 
         self.psm.listener = self
-        asyncio.ensure_future(self.state_updated())
+        asyncio.ensure_future(self._post_playing())
 
     def stop(self):
         """No longer forward updates to listener."""
         self.psm.listener = None
+        self._cancel_pending()
+        self._first_change = None
 
     async def state_updated(self):
         """State was updated for active player."""
+        if self.coalesce_window <= 0:
+            await self._post_playing()
+            return
+
+        now = self.loop.time()
+        if self._first_change is None:
+            self._first_change = now
+
+        self._cancel_pending()
+        self._pending = self.loop.call_at(
+            min(now + self.coalesce_window, self._first_change + self.max_latency),
+            self._post_pending,
+        )
+
+    def _cancel_pending(self) -> None:
+        if self._pending:
+            self._pending.cancel()
+            self._pending = None
+
+    def _post_pending(self) -> None:
+        self._pending = None
+        self._first_change = None
+        asyncio.ensure_future(self._post_playing())
+
+    async def _post_playing(self) -> None:
         try:
             playstatus = await self.metadata.playing()
             self.post_update(playstatus)
@@ -645,6 +700,10 @@ class MrpAudio(Audio):
         return self._volume_controls_available and self._output_device_uid is not None
 
     def _add_listeners(self):
+        # Volume is not updated by device unless subscribed to (no need to listen)
+        if UpdateSubscription.Volume not in self.protocol.subscriptions:
+            return
+
         self.protocol.add_listener(
             self._volume_control_availability,
             protobuf.VOLUME_CONTROL_AVAILABILITY_MESSAGE,
@@ -723,21 +782,52 @@ class MrpAudio(Audio):
 
 
 class MrpFeatures(Features):
-    """Implementation of API for supported feature functionality."""
+    """Implementation of API for supported feature functionality.
+
+    State of all features is computed once into a snapshot, which is re-computed
+    first when player state or volume control availability has changed.
+    """
 
     def __init__(self, config: BaseConfig, psm: PlayerStateManager, audio: MrpAudio):
         """Initialize a new MrpFeatures instance."""
         self.config = config
         self.psm = psm
         self.audio = audio
+        self._snapshot_key: Optional[Tuple[int, bool]] = None
+        self._snapshot: Dict[FeatureName, FeatureInfo] = {}
+        self._supported: Dict[FeatureName, FeatureInfo] = {}
 
-    def get_feature(  # pylint: disable=too-many-return-statements,too-many-branches
-        self, feature_name: FeatureName
-    ) -> FeatureInfo:
+    def get_feature(self, feature_name: FeatureName) -> FeatureInfo:
         """Return current state of a feature."""
+        self._update_snapshot()
+        return self._snapshot[feature_name]
+
+    def all_features(self, include_unsupported=False) -> Dict[FeatureName, FeatureInfo]:
+        """Return state of all features."""
+        self._update_snapshot()
+        return dict(self._snapshot if include_unsupported else self._supported)
+
+    def _update_snapshot(self) -> None:
+        key = (self.psm.generation, self.audio.is_available)
+        if key == self._snapshot_key:
+            return
+
+        self._snapshot = {name: self._compute_feature(name) for name in FeatureName}
+        self._supported = {
+            name: info
+            for name, info in self._snapshot.items()
+            if info.state != FeatureState.Unsupported
+        }
+        self._snapshot_key = key
+
+    def _compute_feature(self, feature_name: FeatureName) -> FeatureInfo:
+        # pylint: disable=too-many-return-statements,too-many-branches
         if feature_name in _FEATURES_SUPPORTED:
             return FeatureInfo(state=FeatureState.Available)
         if feature_name == FeatureName.Artwork:
+            if UpdateSubscription.Artwork not in self.psm.protocol.subscriptions:
+                return FeatureInfo(state=FeatureState.Unavailable)
+
             metadata = self.psm.playing.metadata
             if metadata and metadata.artworkAvailable:
                 return FeatureInfo(state=FeatureState.Available)
@@ -756,12 +846,12 @@ class MrpFeatures(Features):
         # into consideration here.
         if feature_name == FeatureName.PlayPause:
             playback_state = self.psm.playing.playback_state
-            if playback_state == PlaybackState.Playing and self.in_state(
-                FeatureState.Available, FeatureName.Pause
+            if playback_state == PlaybackState.Playing and self._is_available(
+                FeatureName.Pause
             ):
                 return FeatureInfo(state=FeatureState.Available)
-            if playback_state == PlaybackState.Paused and self.in_state(
-                FeatureState.Available, FeatureName.Play
+            if playback_state == PlaybackState.Paused and self._is_available(
+                FeatureName.Play
             ):
                 return FeatureInfo(state=FeatureState.Available)
 
@@ -783,12 +873,18 @@ class MrpFeatures(Features):
             FeatureName.Volume,
             FeatureName.SetVolume,
         ]:
-            if self.audio.is_available:
+            volume_subscribed = (
+                UpdateSubscription.Volume in self.psm.protocol.subscriptions
+            )
+            if volume_subscribed and self.audio.is_available:
                 return FeatureInfo(state=FeatureState.Available)
             return FeatureInfo(state=FeatureState.Unavailable)
 
         return FeatureInfo(state=FeatureState.Unsupported)
 
+    def _is_available(self, feature_name: FeatureName) -> bool:
+        return self._compute_feature(feature_name).state == FeatureState.Available
+
 
 def mrp_service_handler(
     mdns_service: mdns.Service, response: mdns.Response
@@ -874,7 +970,13 @@ def create_with_connection(  # pylint: disable=too-many-locals
     remote_control = MrpRemoteControl(loop, psm, protocol)
     metadata = MrpMetadata(protocol, psm, config.identifier)
     power = MrpPower(loop, protocol, remote_control)
-    push_updater = MrpPushUpdater(loop, metadata, psm)
+    push_updater = MrpPushUpdater(
+        loop,
+        metadata,
+        psm,
+        coalesce_window=service.push_update_window,
+        max_latency=service.push_update_max_latency,
+    )
     audio = MrpAudio(protocol)
 
     interfaces = {
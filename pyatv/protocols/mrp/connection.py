@@ -3,16 +3,60 @@
 from abc import abstractmethod
 import asyncio
 import logging
+from typing import Optional, Tuple
 
 from pyatv import exceptions
 from pyatv.protocols.mrp import protobuf
 from pyatv.support import chacha20, log_binary, log_protobuf
+from pyatv.support.framing import FrameBuffer
 from pyatv.support.net import tcp_keepalive
 from pyatv.support.state_producer import StateProducer
-from pyatv.support.variant import read_variant, write_variant
+from pyatv.support.variant import decode_variant, write_variant
 
 _LOGGER = logging.getLogger(__name__)
 
+# Wire types and field numbers used when decoding message header
+_WIRE_VARINT = 0
+_WIRE_64BIT = 1
+_WIRE_LENGTH_DELIMITED = 2
+_WIRE_32BIT = 5
+_FIELD_TYPE = 1
+_FIELD_IDENTIFIER = 2
+
+
+def decode_header(data: bytes) -> Tuple[int, Optional[str]]:
+    """Decode type and identifier of a serialized ProtocolMessage.
+
+    Only top level fields are traversed and everything else, e.g. the inner
+    message, is skipped without being decoded. ValueError is raised if data is
+    malformed.
+    """
+    message_type = 0
+    identifier = None
+    offset = 0
+    while offset < len(data):
+        tag, offset = decode_variant(data, offset)
+        field, wire_type = tag >> 3, tag & 0x07
+        if wire_type == _WIRE_VARINT:
+            value, offset = decode_variant(data, offset)
+            if field == _FIELD_TYPE:
+                message_type = value
+        elif wire_type == _WIRE_LENGTH_DELIMITED:
+            length, start = decode_variant(data, offset)
+            offset = start + length
+            if field == _FIELD_IDENTIFIER:
+                identifier = bytes(data[start:offset]).decode("utf-8")
+        elif wire_type == _WIRE_64BIT:
+            offset += 8
+        elif wire_type == _WIRE_32BIT:
+            offset += 4
+        else:
+            raise ValueError(f"unsupported wire type: {wire_type}")
+
+    if offset > len(data):
+        raise ValueError("truncated message")
+    return message_type, identifier
+
 
 class AbstractMrpConnection(asyncio.Protocol, StateProducer):
     """Abstract base class for an MRP connection."""
@@ -31,7 +75,7 @@ class AbstractMrpConnection(asyncio.Protocol, StateProducer):
         """Close connection to device."""
 
     @abstractmethod
-    def send(self, message: protobuf.ProtocolMessage) -> None:
+    def send(self, message: "protobuf.ProtocolMessage") -> None:
         """Send protobuf message to device."""
 
 
@@ -48,9 +92,10 @@ class MrpConnection(
         self.atv = atv
         self.loop = loop
         self._log_str = ""
-        self._buffer = b""
+        self._buffer = FrameBuffer()
         self._chacha = None
         self._transport = None
+        self.skipped_messages: int = 0
 
     def connection_made(self, transport):
         """Device connection was made."""
@@ -107,7 +152,7 @@ class MrpConnection(
         self._transport = None
         self._chacha = None
 
-    def send(self, message: protobuf.ProtocolMessage) -> None:
+    def send(self, message: "protobuf.ProtocolMessage") -> None:
         """Send protobuf message to device."""
         serialized = message.SerializeToString()
 
@@ -134,26 +179,23 @@ class MrpConnection(
         """Message was received from device."""
         # A message might be split over several reads, so we store a buffer and
         # try to decode messages from that buffer
-        self._buffer += data
+        self._buffer.append(data)
         log_binary(_LOGGER, self._log_str + "<< Receive", Data=data)
 
         while self._buffer:
-            # The variant tells us how much data must follow
-            length, raw = read_variant(self._buffer)
-            if len(raw) < length:
+            # Each message is prefixed with a variant telling its length
+            frame = self._buffer.read_variant_frame()
+            if frame is None:
                 _LOGGER.debug(
-                    "%s Require %d bytes but only %d in buffer",
+                    "%s Waiting for more data (%d bytes in buffer)",
                     self._log_str,
-                    length,
-                    len(raw),
+                    len(self._buffer),
                 )
                 break
 
-            data = raw[:length]  # Incoming message (might be encrypted)
-            self._buffer = raw[length:]  # Buffer, might contain more messages
-
             try:
-                self._handle_message(data)
+                # Incoming message (might be encrypted)
+                self._handle_message(bytes(frame))
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("%s Failed to handle message", self._log_str)
 
@@ -162,6 +204,24 @@ class MrpConnection(
             data = self._chacha.decrypt(data)
             log_binary(_LOGGER, self._log_str + "<< Receive", Decrypted=data)
 
+        # Peek at the header and only decode the full message (including the inner
+        # message) if someone is interested in it
+        try:
+            message_type, identifier = decode_header(data)
+        except ValueError:
+            _LOGGER.debug("%s Failed to decode message header", self._log_str)
+        else:
+            # pylint: disable=no-member
+            if self.listener.should_skip_message(message_type, identifier):
+                self.skipped_messages += 1
+                _LOGGER.debug(
+                    "%s Skipping message of type %d (%d skipped)",
+                    self._log_str,
+                    message_type,
+                    self.skipped_messages,
+                )
+                return
+
         parsed = protobuf.ProtocolMessage()
         parsed.ParseFromString(data)
         log_protobuf(_LOGGER, self._log_str + "<< Receive: Protobuf", parsed)
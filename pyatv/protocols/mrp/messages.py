@@ -1,6 +1,7 @@
 """Helper code for dealing with protobuf messages."""
 
 import binascii
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 from uuid import uuid4
 
 from pyatv import const
@@ -19,6 +20,122 @@ def create(message_type, error_code=0, identifier=None):
     return message
 
 
+# Identifiers are generated with uuid4 and always have this length, which means
+# that they can be replaced in a serialized message without changing its layout
+IDENTIFIER_LENGTH = 36
+
+_PLACEHOLDERS = {
+    "identifier": IDENTIFIER_LENGTH * "I",
+    "uniqueIdentifier": IDENTIFIER_LENGTH * "U",
+}
+
+
+class MessageTemplate:
+    """Pre-serialized message with placeholders for identifiers.
+
+    Rendering a template gives the same bytes as serializing the message with the
+    identifiers set, but without creating and serializing protobuf objects.
+    """
+
+    def __init__(
+        self, message: "protobuf.ProtocolMessage", with_identifier: bool
+    ) -> None:
+        """Initialize a new MessageTemplate instance."""
+        self.message_type: int = message.type
+        prototype = protobuf.ProtocolMessage()
+        prototype.CopyFrom(message)
+        prototype.ClearField("identifier")
+        fields = ["uniqueIdentifier"] + (["identifier"] if with_identifier else [])
+        for field in fields:
+            setattr(prototype, field, _PLACEHOLDERS[field])
+        data = prototype.SerializeToString()
+
+        slots: List[Tuple[int, str]] = []
+        for field in fields:
+            placeholder = _PLACEHOLDERS[field].encode("utf-8")
+            if data.count(placeholder) != 1:
+                raise ValueError(f"could not locate {field} in template")
+            slots.append((data.index(placeholder), field))
+
+        self._chunks: List[bytes] = []
+        self._fields: List[str] = []
+        start = 0
+        for offset, field in sorted(slots):
+            self._chunks.append(data[start:offset])
+            self._fields.append(field)
+            start = offset + IDENTIFIER_LENGTH
+        self._chunks.append(data[start:])
+
+    def render(self, **identifiers: str) -> bytes:
+        """Return serialized message with identifiers (uuid strings) spliced in."""
+        parts = [self._chunks[0]]
+        for field, chunk in zip(self._fields, self._chunks[1:]):
+            parts += [identifiers[field].encode("utf-8"), chunk]
+        return b"".join(parts)
+
+
+class PreparedMessage:
+    """Message serialized from templates instead of protobuf objects.
+
+    It can be sent (and given an identifier) just like a ProtocolMessage. Use
+    to_protobuf to get a regular ProtocolMessage.
+    """
+
+    def __init__(self, templates: Tuple[MessageTemplate, MessageTemplate]) -> None:
+        """Initialize a new PreparedMessage instance."""
+        self._templates = templates
+        self.type: int = templates[0].message_type
+        self.identifier: Optional[str] = None
+        self.uniqueIdentifier: str = str(  # pylint: disable=invalid-name
+            uuid4()
+        ).upper()
+
+    def SerializeToString(self) -> bytes:  # pylint: disable=invalid-name
+        """Serialize message to binary format."""
+        if len(self.uniqueIdentifier) != IDENTIFIER_LENGTH:
+            return self.to_protobuf().SerializeToString()
+
+        if not self.identifier:
+            return self._templates[0].render(uniqueIdentifier=self.uniqueIdentifier)
+
+        if len(self.identifier) != IDENTIFIER_LENGTH:
+            return self.to_protobuf().SerializeToString()
+
+        return self._templates[1].render(
+            identifier=self.identifier, uniqueIdentifier=self.uniqueIdentifier
+        )
+
+    def to_protobuf(self) -> "protobuf.ProtocolMessage":
+        """Return message as a ProtocolMessage."""
+        message = protobuf.ProtocolMessage()
+        message.ParseFromString(
+            self._templates[0].render(uniqueIdentifier=IDENTIFIER_LENGTH * "0")
+        )
+        message.uniqueIdentifier = self.uniqueIdentifier
+        if self.identifier:
+            message.identifier = self.identifier
+        return message
+
+
+_TEMPLATES: Dict[Hashable, Tuple[MessageTemplate, MessageTemplate]] = {}
+
+
+def prepare(
+    key: Hashable, factory: Callable[[], "protobuf.ProtocolMessage"]
+) -> PreparedMessage:
+    """Create a message from cached templates.
+
+    The factory is called to create the message the first time a key is used. Only
+    identifiers may differ between messages created with the same key.
+    """
+    templates = _TEMPLATES.get(key)
+    if templates is None:
+        message = factory()
+        templates = (MessageTemplate(message, False), MessageTemplate(message, True))
+        _TEMPLATES[key] = templates
+    return PreparedMessage(templates)
+
+
 def device_information(name, identifier, update=False):
     """Create a new DEVICE_INFO_MESSAGE."""
     msg_type = (
@@ -136,6 +253,14 @@ def send_hid_event(use_page, usage, down):
     return message
 
 
+def prepared_hid_event(use_page: int, usage: int, down: bool) -> PreparedMessage:
+    """Create a new SEND_HID_EVENT_MESSAGE from a template."""
+    return prepare(
+        ("hid_event", use_page, usage, down),
+        lambda: send_hid_event(use_page, usage, down),
+    )
+
+
 def command(cmd, **kwargs):
     """Playback command request."""
     message = create(protobuf.SEND_COMMAND_MESSAGE)
@@ -146,6 +271,16 @@ def command(cmd, **kwargs):
     return message
 
 
+def prepared_command(cmd) -> PreparedMessage:
+    """Playback command request (without options) created from a template."""
+    return prepare(("command", cmd), lambda: command(cmd))
+
+
+def prepared_generic() -> PreparedMessage:
+    """Create a new GENERIC_MESSAGE (e.g. heartbeat) from a template."""
+    return prepare("generic", lambda: create(protobuf.GENERIC_MESSAGE))
+
+
 def command_result(identifier, send_error=protobuf.SendError.NoError):
     """Playback command request."""
     message = create(protobuf.SEND_COMMAND_RESULT_MESSAGE, identifier=identifier)
@@ -191,7 +326,7 @@ def seek_to_position(position):
     return message
 
 
-def set_volume(device_uid: str, volume: float) -> protobuf.ProtocolMessage:
+def set_volume(device_uid: str, volume: float) -> "protobuf.ProtocolMessage":
     """Change volume on a device."""
     message = create(protobuf.SET_VOLUME_MESSAGE)
     inner = message.inner()
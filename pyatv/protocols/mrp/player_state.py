@@ -1,9 +1,8 @@
 """Module responsible for keeping track of media player states."""
 
-from itertools import chain
 import logging
 import math
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import weakref
 
 from pyatv.protocols.mrp import protobuf as pb
@@ -14,14 +13,75 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_PLAYER_ID = "MediaRemote-DefaultPlayer"
 
 
+def _merge_metadata(
+    existing: pb.ContentItemMetadata, updated: pb.ContentItemMetadata
+) -> None:
+    # MergeFrom appends to repeated fields, so replace them instead to not make
+    # them grow with every update
+    for field, _ in updated.ListFields():
+        if field.label == field.LABEL_REPEATED:
+            existing.ClearField(field.name)
+    existing.MergeFrom(updated)
+
+
+def _index_commands(commands: Iterable[pb.CommandInfo]) -> Dict[int, pb.CommandInfo]:
+    # First occurrence of a command takes precedence
+    index: Dict[int, pb.CommandInfo] = {}
+    for cmd in commands:
+        index.setdefault(cmd.command, cmd)
+    return index
+
+
+class PlaybackQueue:
+    """Content items in a playback queue, indexed by item identifier."""
+
+    def __init__(self, items: Iterable[pb.ContentItem] = ()) -> None:
+        """Initialize a new PlaybackQueue instance."""
+        self._items: List[pb.ContentItem] = list(items)
+        self._index: Dict[str, pb.ContentItem] = {}
+        for item in reversed(self._items):
+            self._index[item.identifier] = item
+
+    def __len__(self) -> int:
+        """Return number of items in queue."""
+        return len(self._items)
+
+    def __getitem__(self, location: int) -> pb.ContentItem:
+        """Return item at a location in queue."""
+        return self._items[location]
+
+    def __iter__(self) -> Iterator[pb.ContentItem]:
+        """Iterate over items in queue."""
+        return iter(self._items)
+
+    def get(self, identifier: str) -> Optional[pb.ContentItem]:
+        """Return item with an identifier or None if not in queue."""
+        return self._index.get(identifier)
+
+    def update(self, updated_item: pb.ContentItem) -> bool:
+        """Merge an updated item into matching item in queue.
+
+        Returns True if a matching item was found, otherwise False.
+        """
+        existing = self._index.get(updated_item.identifier)
+        if existing is None:
+            return False
+
+        # Other parts of the ContentItem should be merged as well, but those are
+        # not used right now so will do that when needed.
+        _merge_metadata(existing.metadata, updated_item.metadata)
+        return True
+
+
 class PlayerState:
     """Represent what is currently playing on a device."""
 
     def __init__(self, parent, player: pb.NowPlayingPlayer):
         """Initialize a new PlayerState instance."""
         self._playback_state = None
-        self.supported_commands: List[pb.CommandInfo] = []
-        self.items: List[pb.ContentItem] = []
+        self._supported_commands: List[pb.CommandInfo] = []
+        self._commands: Dict[int, pb.CommandInfo] = {}
+        self.items: PlaybackQueue = PlaybackQueue()
         self.location: int = 0
 
         self.identifier: Optional[str] = player.identifier
@@ -38,6 +98,17 @@ class PlayerState:
         """Update player metadata."""
         self.display_name = player.displayName or self.display_name
 
+    @property
+    def supported_commands(self) -> List[pb.CommandInfo]:
+        """Return commands supported by player."""
+        return self._supported_commands
+
+    @supported_commands.setter
+    def supported_commands(self, commands: List[pb.CommandInfo]) -> None:
+        """Change commands supported by player."""
+        self._supported_commands = commands
+        self._commands = _index_commands(commands)
+
     @property
     def playback_state(self):  # pylint: disable=too-many-return-statements
         """Playback state of device."""
@@ -90,10 +161,10 @@ class PlayerState:
 
     def command_info(self, command):
         """Return supported command info."""
-        for cmd in chain(self.supported_commands, self.parent.supported_commands):
-            if cmd.command == command:
-                return cmd
-        return None
+        cmd = self._commands.get(command)
+        if cmd is None:
+            return self.parent.command_info(command)
+        return cmd
 
     def handle_set_state(self, setstate):
         """Update current state with new data from SetStateMessage."""
@@ -105,21 +176,13 @@ class PlayerState:
 
         if setstate.HasField("playbackQueue"):
             queue = setstate.playbackQueue
-            self.items = queue.contentItems
+            self.items = PlaybackQueue(queue.contentItems)
             self.location = queue.location
 
     def handle_content_item_update(self, item_update):
         """Update current state with new data from ContentItemUpdate."""
         for updated_item in item_update.contentItems:
-            for existing in self.items:
-                if updated_item.identifier == existing.identifier:
-                    # Other parts of the ContentItem should be merged as
-                    # well, but those are not used right now so will do that
-                    # when needed.
-                    #
-                    # NB: MergeFrom will append repeated fields (which is
-                    # likely not what is expected)!
-                    existing.metadata.MergeFrom(updated_item.metadata)
+            self.items.update(updated_item)
 
     def __eq__(self, other):
         """Compare if instance is equal to other instance."""
@@ -135,9 +198,25 @@ class Client:
         self.display_name: Optional[str] = None
         self._active_player: Optional[PlayerState] = None
         self.players: Dict[str, PlayerState] = {}
-        self.supported_commands: List[pb.CommandInfo] = []
+        self._supported_commands: List[pb.CommandInfo] = []
+        self._commands: Dict[int, pb.CommandInfo] = {}
         self.update(client)
 
+    @property
+    def supported_commands(self) -> List[pb.CommandInfo]:
+        """Return default commands supported by players of client."""
+        return self._supported_commands
+
+    @supported_commands.setter
+    def supported_commands(self, commands: List[pb.CommandInfo]) -> None:
+        """Change default commands supported by players of client."""
+        self._supported_commands = commands
+        self._commands = _index_commands(commands)
+
+    def command_info(self, command) -> Optional[pb.CommandInfo]:
+        """Return default supported command info."""
+        return self._commands.get(command)
+
     @property
     def active_player(self) -> PlayerState:
         """Return currently active player."""
@@ -187,6 +266,7 @@ class PlayerStateManager:
         """Initialize a new PlayerStateManager instance."""
         self.protocol = protocol
         self.volume_controls_available = None
+        self.generation: int = 0
         self._active_client = None
         self._clients: Dict[str, Client] = {}
         self._listener = None
@@ -316,6 +396,9 @@ class PlayerStateManager:
         await self._state_updated(client=client)
 
     async def _state_updated(self, client=None, player=None):
+        # Lets others (e.g. features) know that cached state must be re-computed
+        self.generation += 1
+
         is_active_client = client == self.client
         is_active_player = player == self.playing
         is_always = client is None and player is None
@@ -1,294 +1,500 @@
 """Simplified extension handling for protobuf messages.
 
 THIS CODE IS AUTO-GENERATED - DO NOT EDIT!!!
+
+Generated modules are imported when first used to not slow down importing pyatv. All
+modules with extensions (inner messages) are imported when ProtocolMessage is first
+used, so that extensions are registered before any message is parsed. Everything is
+imported directly in python 3.6 as lazy module attributes (PEP 562) are not supported.
 """
 
-from .ProtocolMessage_pb2 import ProtocolMessage
+from importlib import import_module
+import sys
+from typing import TYPE_CHECKING
+
+from .ProtocolMessage_pb2 import ProtocolMessage as _ProtocolMessage
+
+if TYPE_CHECKING:
+    from .ProtocolMessage_pb2 import ProtocolMessage
 
+    from . import AudioFadeMessage_pb2
+    from . import AudioFadeResponseMessage_pb2
+    from . import ClientUpdatesConfigMessage_pb2
+    from . import CryptoPairingMessage_pb2
+    from . import DeviceInfoMessage_pb2
+    from . import GenericMessage_pb2
+    from . import GetKeyboardSessionMessage_pb2
+    from . import GetRemoteTextInputSessionMessage_pb2
+    from . import GetVolumeMessage_pb2
+    from . import GetVolumeResultMessage_pb2
+    from . import KeyboardMessage_pb2
+    from . import NotificationMessage_pb2
+    from . import OriginClientPropertiesMessage_pb2
+    from . import PlaybackQueueRequestMessage_pb2
+    from . import PlayerClientPropertiesMessage_pb2
+    from . import RegisterForGameControllerEventsMessage_pb2
+    from . import RegisterHIDDeviceMessage_pb2
+    from . import RegisterHIDDeviceResultMessage_pb2
+    from . import RegisterVoiceInputDeviceMessage_pb2
+    from . import RegisterVoiceInputDeviceResponseMessage_pb2
+    from . import RemoteTextInputMessage_pb2
+    from . import RemoveClientMessage_pb2
+    from . import RemoveEndpointsMessage_pb2
+    from . import RemoveOutputDevicesMessage_pb2
+    from . import RemovePlayerMessage_pb2
+    from . import SendCommandMessage_pb2
+    from . import SendCommandResultMessage_pb2
+    from . import SendHIDEventMessage_pb2
+    from . import SendPackedVirtualTouchEventMessage_pb2
+    from . import SendVoiceInputMessage_pb2
+    from . import SetArtworkMessage_pb2
+    from . import SetConnectionStateMessage_pb2
+    from . import SetDefaultSupportedCommandsMessage_pb2
+    from . import SetDiscoveryModeMessage_pb2
+    from . import SetHiliteModeMessage_pb2
+    from . import SetNowPlayingClientMessage_pb2
+    from . import SetNowPlayingPlayerMessage_pb2
+    from . import SetRecordingStateMessage_pb2
+    from . import SetStateMessage_pb2
+    from . import SetVolumeMessage_pb2
+    from . import TextInputMessage_pb2
+    from . import TransactionMessage_pb2
+    from . import UpdateClientMessage_pb2
+    from . import UpdateContentItemArtworkMessage_pb2
+    from . import UpdateContentItemMessage_pb2
+    from . import UpdateEndPointsMessage_pb2
+    from . import UpdateOutputDeviceMessage_pb2
+    from . import VolumeControlAvailabilityMessage_pb2
+    from . import VolumeControlCapabilitiesDidChangeMessage_pb2
+    from . import VolumeDidChangeMessage_pb2
+    from . import WakeDeviceMessage_pb2
 
-from . import AudioFadeMessage_pb2
-from . import AudioFadeResponseMessage_pb2
-from . import ClientUpdatesConfigMessage_pb2
-from . import CryptoPairingMessage_pb2
-from . import DeviceInfoMessage_pb2
-from . import GenericMessage_pb2
-from . import GetKeyboardSessionMessage_pb2
-from . import GetRemoteTextInputSessionMessage_pb2
-from . import GetVolumeMessage_pb2
-from . import GetVolumeResultMessage_pb2
-from . import KeyboardMessage_pb2
-from . import NotificationMessage_pb2
-from . import OriginClientPropertiesMessage_pb2
-from . import PlaybackQueueRequestMessage_pb2
-from . import PlayerClientPropertiesMessage_pb2
-from . import RegisterForGameControllerEventsMessage_pb2
-from . import RegisterHIDDeviceMessage_pb2
-from . import RegisterHIDDeviceResultMessage_pb2
-from . import RegisterVoiceInputDeviceMessage_pb2
-from . import RegisterVoiceInputDeviceResponseMessage_pb2
-from . import RemoteTextInputMessage_pb2
-from . import RemoveClientMessage_pb2
-from . import RemoveEndpointsMessage_pb2
-from . import RemoveOutputDevicesMessage_pb2
-from . import RemovePlayerMessage_pb2
-from . import SendCommandMessage_pb2
-from . import SendCommandResultMessage_pb2
-from . import SendHIDEventMessage_pb2
-from . import SendPackedVirtualTouchEventMessage_pb2
-from . import SendVoiceInputMessage_pb2
-from . import SetArtworkMessage_pb2
-from . import SetConnectionStateMessage_pb2
-from . import SetDefaultSupportedCommandsMessage_pb2
-from . import SetDiscoveryModeMessage_pb2
-from . import SetHiliteModeMessage_pb2
-from . import SetNowPlayingClientMessage_pb2
-from . import SetNowPlayingPlayerMessage_pb2
-from . import SetRecordingStateMessage_pb2
-from . import SetStateMessage_pb2
-from . import SetVolumeMessage_pb2
-from . import TextInputMessage_pb2
-from . import TransactionMessage_pb2
-from . import UpdateClientMessage_pb2
-from . import UpdateContentItemArtworkMessage_pb2
-from . import UpdateContentItemMessage_pb2
-from . import UpdateEndPointsMessage_pb2
-from . import UpdateOutputDeviceMessage_pb2
-from . import VolumeControlAvailabilityMessage_pb2
-from . import VolumeControlCapabilitiesDidChangeMessage_pb2
-from . import VolumeDidChangeMessage_pb2
-from . import WakeDeviceMessage_pb2
+    from .AudioFadeMessage_pb2 import AudioFadeMessage
+    from .AudioFadeResponseMessage_pb2 import AudioFadeResponseMessage
+    from .AudioFormatSettingsMessage_pb2 import AudioFormatSettings
+    from .ClientUpdatesConfigMessage_pb2 import ClientUpdatesConfigMessage
+    from .CommandInfo_pb2 import CommandInfo
+    from .CommandInfo_pb2 import DisableReason
+    from .CommandInfo_pb2 import PreloadedPlaybackSessionInfo
+    from .CommandInfo_pb2 import QueueEndAction
+    from .CommandOptions_pb2 import CommandOptions
+    from .Common_pb2 import DeviceClass
+    from .Common_pb2 import DeviceSubType
+    from .Common_pb2 import DeviceType
+    from .Common_pb2 import PlaybackState
+    from .Common_pb2 import RepeatMode
+    from .Common_pb2 import ShuffleMode
+    from .ContentItemMetadata_pb2 import ActiveFormatJustification
+    from .ContentItemMetadata_pb2 import AlbumTraits
+    from .ContentItemMetadata_pb2 import AudioFormat
+    from .ContentItemMetadata_pb2 import AudioRoute
+    from .ContentItemMetadata_pb2 import AudioRouteType
+    from .ContentItemMetadata_pb2 import AudioTier
+    from .ContentItemMetadata_pb2 import ContentItemMetadata
+    from .ContentItemMetadata_pb2 import FormatTier
+    from .ContentItemMetadata_pb2 import PlaylistTraits
+    from .ContentItemMetadata_pb2 import SongTraits
+    from .ContentItem_pb2 import ContentItem
+    from .ContentItem_pb2 import LanguageOptionGroup
+    from .CryptoPairingMessage_pb2 import CryptoPairingMessage
+    from .DeviceInfoMessage_pb2 import DeviceInfoMessage
+    from .GenericMessage_pb2 import GenericMessage
+    from .GetKeyboardSessionMessage_pb2 import GetKeyboardSessionMessage
+    from .GetRemoteTextInputSessionMessage_pb2 import GetRemoteTextInputSessionMessage
+    from .GetVolumeMessage_pb2 import GetVolumeMessage
+    from .GetVolumeResultMessage_pb2 import GetVolumeResultMessage
+    from .KeyboardMessage_pb2 import AutocapitalizationType
+    from .KeyboardMessage_pb2 import KeyboardMessage
+    from .KeyboardMessage_pb2 import KeyboardState
+    from .KeyboardMessage_pb2 import KeyboardType
+    from .KeyboardMessage_pb2 import ReturnKeyType
+    from .KeyboardMessage_pb2 import TextEditingAttributes
+    from .KeyboardMessage_pb2 import TextInputTraits
+    from .LanguageOption_pb2 import LanguageOption
+    from .NotificationMessage_pb2 import NotificationMessage
+    from .NowPlayingClient_pb2 import NowPlayingClient
+    from .NowPlayingInfo_pb2 import NowPlayingInfo
+    from .NowPlayingPlayer_pb2 import NowPlayingPlayer
+    from .OriginClientPropertiesMessage_pb2 import OriginClientPropertiesMessage
+    from .Origin_pb2 import Origin
+    from .PlaybackQueueCapabilities_pb2 import PlaybackQueueCapabilities
+    from .PlaybackQueueContext_pb2 import PlaybackQueueContext
+    from .PlaybackQueueRequestMessage_pb2 import PlaybackQueueRequestMessage
+    from .PlaybackQueue_pb2 import PlaybackQueue
+    from .PlayerClientPropertiesMessage_pb2 import PlayerClientPropertiesMessage
+    from .PlayerPath_pb2 import PlayerPath
+    from .RegisterForGameControllerEventsMessage_pb2 import RegisterForGameControllerEventsMessage
+    from .RegisterHIDDeviceMessage_pb2 import RegisterHIDDeviceMessage
+    from .RegisterHIDDeviceResultMessage_pb2 import RegisterHIDDeviceResultMessage
+    from .RegisterVoiceInputDeviceMessage_pb2 import RegisterVoiceInputDeviceMessage
+    from .RegisterVoiceInputDeviceResponseMessage_pb2 import RegisterVoiceInputDeviceResponseMessage
+    from .RemoteTextInputMessage_pb2 import RemoteTextInputMessage
+    from .RemoveClientMessage_pb2 import RemoveClientMessage
+    from .RemoveEndpointsMessage_pb2 import RemoveEndpointsMessage
+    from .RemoveOutputDevicesMessage_pb2 import RemoveOutputDevicesMessage
+    from .RemovePlayerMessage_pb2 import RemovePlayerMessage
+    from .SendButtonEventMessage_pb2 import SendButtonEventMessage
+    from .SendCommandMessage_pb2 import SendCommandMessage
+    from .SendCommandResultMessage_pb2 import HandlerReturnStatus
+    from .SendCommandResultMessage_pb2 import SendCommandResult
+    from .SendCommandResultMessage_pb2 import SendCommandResultMessage
+    from .SendCommandResultMessage_pb2 import SendCommandResultStatus
+    from .SendCommandResultMessage_pb2 import SendCommandResultType
+    from .SendCommandResultMessage_pb2 import SendCommandStatusCode
+    from .SendCommandResultMessage_pb2 import SendError
+    from .SendHIDEventMessage_pb2 import SendHIDEventMessage
+    from .SendPackedVirtualTouchEventMessage_pb2 import SendPackedVirtualTouchEventMessage
+    from .SendVoiceInputMessage_pb2 import AudioBuffer
+    from .SendVoiceInputMessage_pb2 import AudioDataBlock
+    from .SendVoiceInputMessage_pb2 import AudioStreamPacketDescription
+    from .SendVoiceInputMessage_pb2 import AudioTime
+    from .SendVoiceInputMessage_pb2 import SendVoiceInputMessage
+    from .SetArtworkMessage_pb2 import SetArtworkMessage
+    from .SetConnectionStateMessage_pb2 import SetConnectionStateMessage
+    from .SetDefaultSupportedCommandsMessage_pb2 import SetDefaultSupportedCommandsMessage
+    from .SetDiscoveryModeMessage_pb2 import SetDiscoveryModeMessage
+    from .SetHiliteModeMessage_pb2 import SetHiliteModeMessage
+    from .SetNowPlayingClientMessage_pb2 import SetNowPlayingClientMessage
+    from .SetNowPlayingPlayerMessage_pb2 import SetNowPlayingPlayerMessage
+    from .SetRecordingStateMessage_pb2 import SetRecordingStateMessage
+    from .SetStateMessage_pb2 import SetStateMessage
+    from .SetVolumeMessage_pb2 import SetVolumeMessage
+    from .SupportedCommands_pb2 import SupportedCommands
+    from .TextInputMessage_pb2 import ActionType
+    from .TextInputMessage_pb2 import TextInputMessage
+    from .TransactionKey_pb2 import TransactionKey
+    from .TransactionMessage_pb2 import TransactionMessage
+    from .TransactionPacket_pb2 import TransactionPacket
+    from .TransactionPackets_pb2 import TransactionPackets
+    from .UpdateClientMessage_pb2 import UpdateClientMessage
+    from .UpdateContentItemArtworkMessage_pb2 import UpdateContentItemArtworkMessage
+    from .UpdateContentItemMessage_pb2 import UpdateContentItemMessage
+    from .UpdateEndPointsMessage_pb2 import AVEndpointDescriptor
+    from .UpdateEndPointsMessage_pb2 import UpdateEndPointsMessage
+    from .UpdateOutputDeviceMessage_pb2 import AVOutputDeviceDescriptor
+    from .UpdateOutputDeviceMessage_pb2 import AVOutputDeviceSourceInfo
+    from .UpdateOutputDeviceMessage_pb2 import UpdateOutputDeviceMessage
+    from .VirtualTouchDeviceDescriptorMessage_pb2 import VirtualTouchDeviceDescriptor
+    from .VoiceInputDeviceDescriptorMessage_pb2 import VoiceInputDeviceDescriptor
+    from .VolumeControlAvailabilityMessage_pb2 import VolumeCapabilities
+    from .VolumeControlAvailabilityMessage_pb2 import VolumeControlAvailabilityMessage
+    from .VolumeControlCapabilitiesDidChangeMessage_pb2 import VolumeControlCapabilitiesDidChangeMessage
+    from .VolumeDidChangeMessage_pb2 import VolumeDidChangeMessage
+    from .WakeDeviceMessage_pb2 import WakeDeviceMessage
 
 
-from .AudioFadeMessage_pb2 import AudioFadeMessage
-from .AudioFadeResponseMessage_pb2 import AudioFadeResponseMessage
-from .AudioFormatSettingsMessage_pb2 import AudioFormatSettings
-from .ClientUpdatesConfigMessage_pb2 import ClientUpdatesConfigMessage
-from .CommandInfo_pb2 import CommandInfo
-from .CommandInfo_pb2 import DisableReason
-from .CommandInfo_pb2 import PreloadedPlaybackSessionInfo
-from .CommandInfo_pb2 import QueueEndAction
-from .CommandOptions_pb2 import CommandOptions
-from .Common_pb2 import DeviceClass
-from .Common_pb2 import DeviceSubType
-from .Common_pb2 import DeviceType
-from .Common_pb2 import PlaybackState
-from .Common_pb2 import RepeatMode
-from .Common_pb2 import ShuffleMode
-from .ContentItemMetadata_pb2 import ActiveFormatJustification
-from .ContentItemMetadata_pb2 import AlbumTraits
-from .ContentItemMetadata_pb2 import AudioFormat
-from .ContentItemMetadata_pb2 import AudioRoute
-from .ContentItemMetadata_pb2 import AudioRouteType
-from .ContentItemMetadata_pb2 import AudioTier
-from .ContentItemMetadata_pb2 import ContentItemMetadata
-from .ContentItemMetadata_pb2 import FormatTier
-from .ContentItemMetadata_pb2 import PlaylistTraits
-from .ContentItemMetadata_pb2 import SongTraits
-from .ContentItem_pb2 import ContentItem
-from .ContentItem_pb2 import LanguageOptionGroup
-from .CryptoPairingMessage_pb2 import CryptoPairingMessage
-from .DeviceInfoMessage_pb2 import DeviceInfoMessage
-from .GenericMessage_pb2 import GenericMessage
-from .GetKeyboardSessionMessage_pb2 import GetKeyboardSessionMessage
-from .GetRemoteTextInputSessionMessage_pb2 import GetRemoteTextInputSessionMessage
-from .GetVolumeMessage_pb2 import GetVolumeMessage
-from .GetVolumeResultMessage_pb2 import GetVolumeResultMessage
-from .KeyboardMessage_pb2 import AutocapitalizationType
-from .KeyboardMessage_pb2 import KeyboardMessage
-from .KeyboardMessage_pb2 import KeyboardState
-from .KeyboardMessage_pb2 import KeyboardType
-from .KeyboardMessage_pb2 import ReturnKeyType
-from .KeyboardMessage_pb2 import TextEditingAttributes
-from .KeyboardMessage_pb2 import TextInputTraits
-from .LanguageOption_pb2 import LanguageOption
-from .NotificationMessage_pb2 import NotificationMessage
-from .NowPlayingClient_pb2 import NowPlayingClient
-from .NowPlayingInfo_pb2 import NowPlayingInfo
-from .NowPlayingPlayer_pb2 import NowPlayingPlayer
-from .OriginClientPropertiesMessage_pb2 import OriginClientPropertiesMessage
-from .Origin_pb2 import Origin
-from .PlaybackQueueCapabilities_pb2 import PlaybackQueueCapabilities
-from .PlaybackQueueContext_pb2 import PlaybackQueueContext
-from .PlaybackQueueRequestMessage_pb2 import PlaybackQueueRequestMessage
-from .PlaybackQueue_pb2 import PlaybackQueue
-from .PlayerClientPropertiesMessage_pb2 import PlayerClientPropertiesMessage
-from .PlayerPath_pb2 import PlayerPath
-from .RegisterForGameControllerEventsMessage_pb2 import RegisterForGameControllerEventsMessage
-from .RegisterHIDDeviceMessage_pb2 import RegisterHIDDeviceMessage
-from .RegisterHIDDeviceResultMessage_pb2 import RegisterHIDDeviceResultMessage
-from .RegisterVoiceInputDeviceMessage_pb2 import RegisterVoiceInputDeviceMessage
-from .RegisterVoiceInputDeviceResponseMessage_pb2 import RegisterVoiceInputDeviceResponseMessage
-from .RemoteTextInputMessage_pb2 import RemoteTextInputMessage
-from .RemoveClientMessage_pb2 import RemoveClientMessage
-from .RemoveEndpointsMessage_pb2 import RemoveEndpointsMessage
-from .RemoveOutputDevicesMessage_pb2 import RemoveOutputDevicesMessage
-from .RemovePlayerMessage_pb2 import RemovePlayerMessage
-from .SendButtonEventMessage_pb2 import SendButtonEventMessage
-from .SendCommandMessage_pb2 import SendCommandMessage
-from .SendCommandResultMessage_pb2 import HandlerReturnStatus
-from .SendCommandResultMessage_pb2 import SendCommandResult
-from .SendCommandResultMessage_pb2 import SendCommandResultMessage
-from .SendCommandResultMessage_pb2 import SendCommandResultStatus
-from .SendCommandResultMessage_pb2 import SendCommandResultType
-from .SendCommandResultMessage_pb2 import SendCommandStatusCode
-from .SendCommandResultMessage_pb2 import SendError
-from .SendHIDEventMessage_pb2 import SendHIDEventMessage
-from .SendPackedVirtualTouchEventMessage_pb2 import SendPackedVirtualTouchEventMessage
-from .SendVoiceInputMessage_pb2 import AudioBuffer
-from .SendVoiceInputMessage_pb2 import AudioDataBlock
-from .SendVoiceInputMessage_pb2 import AudioStreamPacketDescription
-from .SendVoiceInputMessage_pb2 import AudioTime
-from .SendVoiceInputMessage_pb2 import SendVoiceInputMessage
-from .SetArtworkMessage_pb2 import SetArtworkMessage
-from .SetConnectionStateMessage_pb2 import SetConnectionStateMessage
-from .SetDefaultSupportedCommandsMessage_pb2 import SetDefaultSupportedCommandsMessage
-from .SetDiscoveryModeMessage_pb2 import SetDiscoveryModeMessage
-from .SetHiliteModeMessage_pb2 import SetHiliteModeMessage
-from .SetNowPlayingClientMessage_pb2 import SetNowPlayingClientMessage
-from .SetNowPlayingPlayerMessage_pb2 import SetNowPlayingPlayerMessage
-from .SetRecordingStateMessage_pb2 import SetRecordingStateMessage
-from .SetStateMessage_pb2 import SetStateMessage
-from .SetVolumeMessage_pb2 import SetVolumeMessage
-from .SupportedCommands_pb2 import SupportedCommands
-from .TextInputMessage_pb2 import ActionType
-from .TextInputMessage_pb2 import TextInputMessage
-from .TransactionKey_pb2 import TransactionKey
-from .TransactionMessage_pb2 import TransactionMessage
-from .TransactionPacket_pb2 import TransactionPacket
-from .TransactionPackets_pb2 import TransactionPackets
-from .UpdateClientMessage_pb2 import UpdateClientMessage
-from .UpdateContentItemArtworkMessage_pb2 import UpdateContentItemArtworkMessage
-from .UpdateContentItemMessage_pb2 import UpdateContentItemMessage
-from .UpdateEndPointsMessage_pb2 import AVEndpointDescriptor
-from .UpdateEndPointsMessage_pb2 import UpdateEndPointsMessage
-from .UpdateOutputDeviceMessage_pb2 import AVOutputDeviceDescriptor
-from .UpdateOutputDeviceMessage_pb2 import AVOutputDeviceSourceInfo
-from .UpdateOutputDeviceMessage_pb2 import UpdateOutputDeviceMessage
-from .VirtualTouchDeviceDescriptorMessage_pb2 import VirtualTouchDeviceDescriptor
-from .VoiceInputDeviceDescriptorMessage_pb2 import VoiceInputDeviceDescriptor
-from .VolumeControlAvailabilityMessage_pb2 import VolumeCapabilities
-from .VolumeControlAvailabilityMessage_pb2 import VolumeControlAvailabilityMessage
-from .VolumeControlCapabilitiesDidChangeMessage_pb2 import VolumeControlCapabilitiesDidChangeMessage
-from .VolumeDidChangeMessage_pb2 import VolumeDidChangeMessage
-from .WakeDeviceMessage_pb2 import WakeDeviceMessage
+_EXTENSION_MODULES = [
+    "AudioFadeMessage_pb2",
+    "AudioFadeResponseMessage_pb2",
+    "ClientUpdatesConfigMessage_pb2",
+    "CryptoPairingMessage_pb2",
+    "DeviceInfoMessage_pb2",
+    "GenericMessage_pb2",
+    "GetKeyboardSessionMessage_pb2",
+    "GetRemoteTextInputSessionMessage_pb2",
+    "GetVolumeMessage_pb2",
+    "GetVolumeResultMessage_pb2",
+    "KeyboardMessage_pb2",
+    "NotificationMessage_pb2",
+    "OriginClientPropertiesMessage_pb2",
+    "PlaybackQueueRequestMessage_pb2",
+    "PlayerClientPropertiesMessage_pb2",
+    "RegisterForGameControllerEventsMessage_pb2",
+    "RegisterHIDDeviceMessage_pb2",
+    "RegisterHIDDeviceResultMessage_pb2",
+    "RegisterVoiceInputDeviceMessage_pb2",
+    "RegisterVoiceInputDeviceResponseMessage_pb2",
+    "RemoteTextInputMessage_pb2",
+    "RemoveClientMessage_pb2",
+    "RemoveEndpointsMessage_pb2",
+    "RemoveOutputDevicesMessage_pb2",
+    "RemovePlayerMessage_pb2",
+    "SendCommandMessage_pb2",
+    "SendCommandResultMessage_pb2",
+    "SendHIDEventMessage_pb2",
+    "SendPackedVirtualTouchEventMessage_pb2",
+    "SendVoiceInputMessage_pb2",
+    "SetArtworkMessage_pb2",
+    "SetConnectionStateMessage_pb2",
+    "SetDefaultSupportedCommandsMessage_pb2",
+    "SetDiscoveryModeMessage_pb2",
+    "SetHiliteModeMessage_pb2",
+    "SetNowPlayingClientMessage_pb2",
+    "SetNowPlayingPlayerMessage_pb2",
+    "SetRecordingStateMessage_pb2",
+    "SetStateMessage_pb2",
+    "SetVolumeMessage_pb2",
+    "TextInputMessage_pb2",
+    "TransactionMessage_pb2",
+    "UpdateClientMessage_pb2",
+    "UpdateContentItemArtworkMessage_pb2",
+    "UpdateContentItemMessage_pb2",
+    "UpdateEndPointsMessage_pb2",
+    "UpdateOutputDeviceMessage_pb2",
+    "VolumeControlAvailabilityMessage_pb2",
+    "VolumeControlCapabilitiesDidChangeMessage_pb2",
+    "VolumeDidChangeMessage_pb2",
+    "WakeDeviceMessage_pb2",
+]
+
+
+_MESSAGE_MODULES = {
+    "AVEndpointDescriptor": "UpdateEndPointsMessage_pb2",
+    "AVOutputDeviceDescriptor": "UpdateOutputDeviceMessage_pb2",
+    "AVOutputDeviceSourceInfo": "UpdateOutputDeviceMessage_pb2",
+    "ActionType": "TextInputMessage_pb2",
+    "ActiveFormatJustification": "ContentItemMetadata_pb2",
+    "AlbumTraits": "ContentItemMetadata_pb2",
+    "AudioBuffer": "SendVoiceInputMessage_pb2",
+    "AudioDataBlock": "SendVoiceInputMessage_pb2",
+    "AudioFadeMessage": "AudioFadeMessage_pb2",
+    "AudioFadeResponseMessage": "AudioFadeResponseMessage_pb2",
+    "AudioFormat": "ContentItemMetadata_pb2",
+    "AudioFormatSettings": "AudioFormatSettingsMessage_pb2",
+    "AudioRoute": "ContentItemMetadata_pb2",
+    "AudioRouteType": "ContentItemMetadata_pb2",
+    "AudioStreamPacketDescription": "SendVoiceInputMessage_pb2",
+    "AudioTier": "ContentItemMetadata_pb2",
+    "AudioTime": "SendVoiceInputMessage_pb2",
+    "AutocapitalizationType": "KeyboardMessage_pb2",
+    "ClientUpdatesConfigMessage": "ClientUpdatesConfigMessage_pb2",
+    "CommandInfo": "CommandInfo_pb2",
+    "CommandOptions": "CommandOptions_pb2",
+    "ContentItem": "ContentItem_pb2",
+    "ContentItemMetadata": "ContentItemMetadata_pb2",
+    "CryptoPairingMessage": "CryptoPairingMessage_pb2",
+    "DeviceClass": "Common_pb2",
+    "DeviceInfoMessage": "DeviceInfoMessage_pb2",
+    "DeviceSubType": "Common_pb2",
+    "DeviceType": "Common_pb2",
+    "DisableReason": "CommandInfo_pb2",
+    "FormatTier": "ContentItemMetadata_pb2",
+    "GenericMessage": "GenericMessage_pb2",
+    "GetKeyboardSessionMessage": "GetKeyboardSessionMessage_pb2",
+    "GetRemoteTextInputSessionMessage": "GetRemoteTextInputSessionMessage_pb2",
+    "GetVolumeMessage": "GetVolumeMessage_pb2",
+    "GetVolumeResultMessage": "GetVolumeResultMessage_pb2",
+    "HandlerReturnStatus": "SendCommandResultMessage_pb2",
+    "KeyboardMessage": "KeyboardMessage_pb2",
+    "KeyboardState": "KeyboardMessage_pb2",
+    "KeyboardType": "KeyboardMessage_pb2",
+    "LanguageOption": "LanguageOption_pb2",
+    "LanguageOptionGroup": "ContentItem_pb2",
+    "NotificationMessage": "NotificationMessage_pb2",
+    "NowPlayingClient": "NowPlayingClient_pb2",
+    "NowPlayingInfo": "NowPlayingInfo_pb2",
+    "NowPlayingPlayer": "NowPlayingPlayer_pb2",
+    "Origin": "Origin_pb2",
+    "OriginClientPropertiesMessage": "OriginClientPropertiesMessage_pb2",
+    "PlaybackQueue": "PlaybackQueue_pb2",
+    "PlaybackQueueCapabilities": "PlaybackQueueCapabilities_pb2",
+    "PlaybackQueueContext": "PlaybackQueueContext_pb2",
+    "PlaybackQueueRequestMessage": "PlaybackQueueRequestMessage_pb2",
+    "PlaybackState": "Common_pb2",
+    "PlayerClientPropertiesMessage": "PlayerClientPropertiesMessage_pb2",
+    "PlayerPath": "PlayerPath_pb2",
+    "PlaylistTraits": "ContentItemMetadata_pb2",
+    "PreloadedPlaybackSessionInfo": "CommandInfo_pb2",
+    "QueueEndAction": "CommandInfo_pb2",
+    "RegisterForGameControllerEventsMessage": "RegisterForGameControllerEventsMessage_pb2",
+    "RegisterHIDDeviceMessage": "RegisterHIDDeviceMessage_pb2",
+    "RegisterHIDDeviceResultMessage": "RegisterHIDDeviceResultMessage_pb2",
+    "RegisterVoiceInputDeviceMessage": "RegisterVoiceInputDeviceMessage_pb2",
+    "RegisterVoiceInputDeviceResponseMessage": "RegisterVoiceInputDeviceResponseMessage_pb2",
+    "RemoteTextInputMessage": "RemoteTextInputMessage_pb2",
+    "RemoveClientMessage": "RemoveClientMessage_pb2",
+    "RemoveEndpointsMessage": "RemoveEndpointsMessage_pb2",
+    "RemoveOutputDevicesMessage": "RemoveOutputDevicesMessage_pb2",
+    "RemovePlayerMessage": "RemovePlayerMessage_pb2",
+    "RepeatMode": "Common_pb2",
+    "ReturnKeyType": "KeyboardMessage_pb2",
+    "SendButtonEventMessage": "SendButtonEventMessage_pb2",
+    "SendCommandMessage": "SendCommandMessage_pb2",
+    "SendCommandResult": "SendCommandResultMessage_pb2",
+    "SendCommandResultMessage": "SendCommandResultMessage_pb2",
+    "SendCommandResultStatus": "SendCommandResultMessage_pb2",
+    "SendCommandResultType": "SendCommandResultMessage_pb2",
+    "SendCommandStatusCode": "SendCommandResultMessage_pb2",
+    "SendError": "SendCommandResultMessage_pb2",
+    "SendHIDEventMessage": "SendHIDEventMessage_pb2",
+    "SendPackedVirtualTouchEventMessage": "SendPackedVirtualTouchEventMessage_pb2",
+    "SendVoiceInputMessage": "SendVoiceInputMessage_pb2",
+    "SetArtworkMessage": "SetArtworkMessage_pb2",
+    "SetConnectionStateMessage": "SetConnectionStateMessage_pb2",
+    "SetDefaultSupportedCommandsMessage": "SetDefaultSupportedCommandsMessage_pb2",
+    "SetDiscoveryModeMessage": "SetDiscoveryModeMessage_pb2",
+    "SetHiliteModeMessage": "SetHiliteModeMessage_pb2",
+    "SetNowPlayingClientMessage": "SetNowPlayingClientMessage_pb2",
+    "SetNowPlayingPlayerMessage": "SetNowPlayingPlayerMessage_pb2",
+    "SetRecordingStateMessage": "SetRecordingStateMessage_pb2",
+    "SetStateMessage": "SetStateMessage_pb2",
+    "SetVolumeMessage": "SetVolumeMessage_pb2",
+    "ShuffleMode": "Common_pb2",
+    "SongTraits": "ContentItemMetadata_pb2",
+    "SupportedCommands": "SupportedCommands_pb2",
+    "TextEditingAttributes": "KeyboardMessage_pb2",
+    "TextInputMessage": "TextInputMessage_pb2",
+    "TextInputTraits": "KeyboardMessage_pb2",
+    "TransactionKey": "TransactionKey_pb2",
+    "TransactionMessage": "TransactionMessage_pb2",
+    "TransactionPacket": "TransactionPacket_pb2",
+    "TransactionPackets": "TransactionPackets_pb2",
+    "UpdateClientMessage": "UpdateClientMessage_pb2",
+    "UpdateContentItemArtworkMessage": "UpdateContentItemArtworkMessage_pb2",
+    "UpdateContentItemMessage": "UpdateContentItemMessage_pb2",
+    "UpdateEndPointsMessage": "UpdateEndPointsMessage_pb2",
+    "UpdateOutputDeviceMessage": "UpdateOutputDeviceMessage_pb2",
+    "VirtualTouchDeviceDescriptor": "VirtualTouchDeviceDescriptorMessage_pb2",
+    "VoiceInputDeviceDescriptor": "VoiceInputDeviceDescriptorMessage_pb2",
+    "VolumeCapabilities": "VolumeControlAvailabilityMessage_pb2",
+    "VolumeControlAvailabilityMessage": "VolumeControlAvailabilityMessage_pb2",
+    "VolumeControlCapabilitiesDidChangeMessage": "VolumeControlCapabilitiesDidChangeMessage_pb2",
+    "VolumeDidChangeMessage": "VolumeDidChangeMessage_pb2",
+    "WakeDeviceMessage": "WakeDeviceMessage_pb2",
+}
 
 
 _EXTENSION_LOOKUP = {
-    ProtocolMessage.AUDIO_FADE_MESSAGE: AudioFadeMessage_pb2.audioFadeMessage,
-    ProtocolMessage.AUDIO_FADE_RESPONSE_MESSAGE: AudioFadeResponseMessage_pb2.audioFadeResponseMessage,
-    ProtocolMessage.CLIENT_UPDATES_CONFIG_MESSAGE: ClientUpdatesConfigMessage_pb2.clientUpdatesConfigMessage,
-    ProtocolMessage.CRYPTO_PAIRING_MESSAGE: CryptoPairingMessage_pb2.cryptoPairingMessage,
-    ProtocolMessage.DEVICE_INFO_MESSAGE: DeviceInfoMessage_pb2.deviceInfoMessage,
-    ProtocolMessage.DEVICE_INFO_UPDATE_MESSAGE: DeviceInfoMessage_pb2.deviceInfoMessage,
-    ProtocolMessage.GENERIC_MESSAGE: GenericMessage_pb2.genericMessage,
-    ProtocolMessage.GET_KEYBOARD_SESSION_MESSAGE: GetKeyboardSessionMessage_pb2.getKeyboardSessionMessage,
-    ProtocolMessage.GET_REMOTE_TEXT_INPUT_SESSION_MESSAGE: GetRemoteTextInputSessionMessage_pb2.getRemoteTextInputSessionMessage,
-    ProtocolMessage.GET_VOLUME_MESSAGE: GetVolumeMessage_pb2.getVolumeMessage,
-    ProtocolMessage.GET_VOLUME_RESULT_MESSAGE: GetVolumeResultMessage_pb2.getVolumeResultMessage,
-    ProtocolMessage.KEYBOARD_MESSAGE: KeyboardMessage_pb2.keyboardMessage,
-    ProtocolMessage.NOTIFICATION_MESSAGE: NotificationMessage_pb2.notificationMessage,
-    ProtocolMessage.ORIGIN_CLIENT_PROPERTIES_MESSAGE: OriginClientPropertiesMessage_pb2.originClientPropertiesMessage,
-    ProtocolMessage.PLAYBACK_QUEUE_REQUEST_MESSAGE: PlaybackQueueRequestMessage_pb2.playbackQueueRequestMessage,
-    ProtocolMessage.PLAYER_CLIENT_PROPERTIES_MESSAGE: PlayerClientPropertiesMessage_pb2.playerClientPropertiesMessage,
-    ProtocolMessage.REGISTER_FOR_GAME_CONTROLLER_EVENTS_MESSAGE: RegisterForGameControllerEventsMessage_pb2.registerForGameControllerEventsMessage,
-    ProtocolMessage.REGISTER_HID_DEVICE_MESSAGE: RegisterHIDDeviceMessage_pb2.registerHIDDeviceMessage,
-    ProtocolMessage.REGISTER_HID_DEVICE_RESULT_MESSAGE: RegisterHIDDeviceResultMessage_pb2.registerHIDDeviceResultMessage,
-    ProtocolMessage.REGISTER_VOICE_INPUT_DEVICE_MESSAGE: RegisterVoiceInputDeviceMessage_pb2.registerVoiceInputDeviceMessage,
-    ProtocolMessage.REGISTER_VOICE_INPUT_DEVICE_RESPONSE_MESSAGE: RegisterVoiceInputDeviceResponseMessage_pb2.registerVoiceInputDeviceResponseMessage,
-    ProtocolMessage.REMOTE_TEXT_INPUT_MESSAGE: RemoteTextInputMessage_pb2.remoteTextInputMessage,
-    ProtocolMessage.REMOVE_CLIENT_MESSAGE: RemoveClientMessage_pb2.removeClientMessage,
-    ProtocolMessage.REMOVE_ENDPOINTS_MESSAGE: RemoveEndpointsMessage_pb2.removeEndpointsMessage,
-    ProtocolMessage.REMOVE_OUTPUT_DEVICES_MESSAGE: RemoveOutputDevicesMessage_pb2.removeOutputDevicesMessage,
-    ProtocolMessage.REMOVE_PLAYER_MESSAGE: RemovePlayerMessage_pb2.removePlayerMessage,
-    ProtocolMessage.SEND_COMMAND_MESSAGE: SendCommandMessage_pb2.sendCommandMessage,
-    ProtocolMessage.SEND_COMMAND_RESULT_MESSAGE: SendCommandResultMessage_pb2.sendCommandResultMessage,
-    ProtocolMessage.SEND_HID_EVENT_MESSAGE: SendHIDEventMessage_pb2.sendHIDEventMessage,
-    ProtocolMessage.SEND_PACKED_VIRTUAL_TOUCH_EVENT_MESSAGE: SendPackedVirtualTouchEventMessage_pb2.sendPackedVirtualTouchEventMessage,
-    ProtocolMessage.SEND_VOICE_INPUT_MESSAGE: SendVoiceInputMessage_pb2.sendVoiceInputMessage,
-    ProtocolMessage.SET_ARTWORK_MESSAGE: SetArtworkMessage_pb2.setArtworkMessage,
-    ProtocolMessage.SET_CONNECTION_STATE_MESSAGE: SetConnectionStateMessage_pb2.setConnectionStateMessage,
-    ProtocolMessage.SET_DEFAULT_SUPPORTED_COMMANDS_MESSAGE: SetDefaultSupportedCommandsMessage_pb2.setDefaultSupportedCommandsMessage,
-    ProtocolMessage.SET_DISCOVERY_MODE_MESSAGE: SetDiscoveryModeMessage_pb2.setDiscoveryModeMessage,
-    ProtocolMessage.SET_HILITE_MODE_MESSAGE: SetHiliteModeMessage_pb2.setHiliteModeMessage,
-    ProtocolMessage.SET_NOW_PLAYING_CLIENT_MESSAGE: SetNowPlayingClientMessage_pb2.setNowPlayingClientMessage,
-    ProtocolMessage.SET_NOW_PLAYING_PLAYER_MESSAGE: SetNowPlayingPlayerMessage_pb2.setNowPlayingPlayerMessage,
-    ProtocolMessage.SET_RECORDING_STATE_MESSAGE: SetRecordingStateMessage_pb2.setRecordingStateMessage,
-    ProtocolMessage.SET_STATE_MESSAGE: SetStateMessage_pb2.setStateMessage,
-    ProtocolMessage.SET_VOLUME_MESSAGE: SetVolumeMessage_pb2.setVolumeMessage,
-    ProtocolMessage.TEXT_INPUT_MESSAGE: TextInputMessage_pb2.textInputMessage,
-    ProtocolMessage.TRANSACTION_MESSAGE: TransactionMessage_pb2.transactionMessage,
-    ProtocolMessage.UPDATE_CLIENT_MESSAGE: UpdateClientMessage_pb2.updateClientMessage,
-    ProtocolMessage.UPDATE_CONTENT_ITEM_ARTWORK_MESSAGE: UpdateContentItemArtworkMessage_pb2.updateContentItemArtworkMessage,
-    ProtocolMessage.UPDATE_CONTENT_ITEM_MESSAGE: UpdateContentItemMessage_pb2.updateContentItemMessage,
-    ProtocolMessage.UPDATE_END_POINTS_MESSAGE: UpdateEndPointsMessage_pb2.updateEndPointsMessage,
-    ProtocolMessage.UPDATE_OUTPUT_DEVICE_MESSAGE: UpdateOutputDeviceMessage_pb2.updateOutputDeviceMessage,
-    ProtocolMessage.VOLUME_CONTROL_AVAILABILITY_MESSAGE: VolumeControlAvailabilityMessage_pb2.volumeControlAvailabilityMessage,
-    ProtocolMessage.VOLUME_CONTROL_CAPABILITIES_DID_CHANGE_MESSAGE: VolumeControlCapabilitiesDidChangeMessage_pb2.volumeControlCapabilitiesDidChangeMessage,
-    ProtocolMessage.VOLUME_DID_CHANGE_MESSAGE: VolumeDidChangeMessage_pb2.volumeDidChangeMessage,
-    ProtocolMessage.WAKE_DEVICE_MESSAGE: WakeDeviceMessage_pb2.wakeDeviceMessage,
+    _ProtocolMessage.AUDIO_FADE_MESSAGE: ("AudioFadeMessage_pb2", "audioFadeMessage"),
+    _ProtocolMessage.AUDIO_FADE_RESPONSE_MESSAGE: ("AudioFadeResponseMessage_pb2", "audioFadeResponseMessage"),
+    _ProtocolMessage.CLIENT_UPDATES_CONFIG_MESSAGE: ("ClientUpdatesConfigMessage_pb2", "clientUpdatesConfigMessage"),
+    _ProtocolMessage.CRYPTO_PAIRING_MESSAGE: ("CryptoPairingMessage_pb2", "cryptoPairingMessage"),
+    _ProtocolMessage.DEVICE_INFO_MESSAGE: ("DeviceInfoMessage_pb2", "deviceInfoMessage"),
+    _ProtocolMessage.DEVICE_INFO_UPDATE_MESSAGE: ("DeviceInfoMessage_pb2", "deviceInfoMessage"),
+    _ProtocolMessage.GENERIC_MESSAGE: ("GenericMessage_pb2", "genericMessage"),
+    _ProtocolMessage.GET_KEYBOARD_SESSION_MESSAGE: ("GetKeyboardSessionMessage_pb2", "getKeyboardSessionMessage"),
+    _ProtocolMessage.GET_REMOTE_TEXT_INPUT_SESSION_MESSAGE: ("GetRemoteTextInputSessionMessage_pb2", "getRemoteTextInputSessionMessage"),
+    _ProtocolMessage.GET_VOLUME_MESSAGE: ("GetVolumeMessage_pb2", "getVolumeMessage"),
+    _ProtocolMessage.GET_VOLUME_RESULT_MESSAGE: ("GetVolumeResultMessage_pb2", "getVolumeResultMessage"),
+    _ProtocolMessage.KEYBOARD_MESSAGE: ("KeyboardMessage_pb2", "keyboardMessage"),
+    _ProtocolMessage.NOTIFICATION_MESSAGE: ("NotificationMessage_pb2", "notificationMessage"),
+    _ProtocolMessage.ORIGIN_CLIENT_PROPERTIES_MESSAGE: ("OriginClientPropertiesMessage_pb2", "originClientPropertiesMessage"),
+    _ProtocolMessage.PLAYBACK_QUEUE_REQUEST_MESSAGE: ("PlaybackQueueRequestMessage_pb2", "playbackQueueRequestMessage"),
+    _ProtocolMessage.PLAYER_CLIENT_PROPERTIES_MESSAGE: ("PlayerClientPropertiesMessage_pb2", "playerClientPropertiesMessage"),
+    _ProtocolMessage.REGISTER_FOR_GAME_CONTROLLER_EVENTS_MESSAGE: ("RegisterForGameControllerEventsMessage_pb2", "registerForGameControllerEventsMessage"),
+    _ProtocolMessage.REGISTER_HID_DEVICE_MESSAGE: ("RegisterHIDDeviceMessage_pb2", "registerHIDDeviceMessage"),
+    _ProtocolMessage.REGISTER_HID_DEVICE_RESULT_MESSAGE: ("RegisterHIDDeviceResultMessage_pb2", "registerHIDDeviceResultMessage"),
+    _ProtocolMessage.REGISTER_VOICE_INPUT_DEVICE_MESSAGE: ("RegisterVoiceInputDeviceMessage_pb2", "registerVoiceInputDeviceMessage"),
+    _ProtocolMessage.REGISTER_VOICE_INPUT_DEVICE_RESPONSE_MESSAGE: ("RegisterVoiceInputDeviceResponseMessage_pb2", "registerVoiceInputDeviceResponseMessage"),
+    _ProtocolMessage.REMOTE_TEXT_INPUT_MESSAGE: ("RemoteTextInputMessage_pb2", "remoteTextInputMessage"),
+    _ProtocolMessage.REMOVE_CLIENT_MESSAGE: ("RemoveClientMessage_pb2", "removeClientMessage"),
+    _ProtocolMessage.REMOVE_ENDPOINTS_MESSAGE: ("RemoveEndpointsMessage_pb2", "removeEndpointsMessage"),
+    _ProtocolMessage.REMOVE_OUTPUT_DEVICES_MESSAGE: ("RemoveOutputDevicesMessage_pb2", "removeOutputDevicesMessage"),
+    _ProtocolMessage.REMOVE_PLAYER_MESSAGE: ("RemovePlayerMessage_pb2", "removePlayerMessage"),
+    _ProtocolMessage.SEND_COMMAND_MESSAGE: ("SendCommandMessage_pb2", "sendCommandMessage"),
+    _ProtocolMessage.SEND_COMMAND_RESULT_MESSAGE: ("SendCommandResultMessage_pb2", "sendCommandResultMessage"),
+    _ProtocolMessage.SEND_HID_EVENT_MESSAGE: ("SendHIDEventMessage_pb2", "sendHIDEventMessage"),
+    _ProtocolMessage.SEND_PACKED_VIRTUAL_TOUCH_EVENT_MESSAGE: ("SendPackedVirtualTouchEventMessage_pb2", "sendPackedVirtualTouchEventMessage"),
+    _ProtocolMessage.SEND_VOICE_INPUT_MESSAGE: ("SendVoiceInputMessage_pb2", "sendVoiceInputMessage"),
+    _ProtocolMessage.SET_ARTWORK_MESSAGE: ("SetArtworkMessage_pb2", "setArtworkMessage"),
+    _ProtocolMessage.SET_CONNECTION_STATE_MESSAGE: ("SetConnectionStateMessage_pb2", "setConnectionStateMessage"),
+    _ProtocolMessage.SET_DEFAULT_SUPPORTED_COMMANDS_MESSAGE: ("SetDefaultSupportedCommandsMessage_pb2", "setDefaultSupportedCommandsMessage"),
+    _ProtocolMessage.SET_DISCOVERY_MODE_MESSAGE: ("SetDiscoveryModeMessage_pb2", "setDiscoveryModeMessage"),
+    _ProtocolMessage.SET_HILITE_MODE_MESSAGE: ("SetHiliteModeMessage_pb2", "setHiliteModeMessage"),
+    _ProtocolMessage.SET_NOW_PLAYING_CLIENT_MESSAGE: ("SetNowPlayingClientMessage_pb2", "setNowPlayingClientMessage"),
+    _ProtocolMessage.SET_NOW_PLAYING_PLAYER_MESSAGE: ("SetNowPlayingPlayerMessage_pb2", "setNowPlayingPlayerMessage"),
+    _ProtocolMessage.SET_RECORDING_STATE_MESSAGE: ("SetRecordingStateMessage_pb2", "setRecordingStateMessage"),
+    _ProtocolMessage.SET_STATE_MESSAGE: ("SetStateMessage_pb2", "setStateMessage"),
+    _ProtocolMessage.SET_VOLUME_MESSAGE: ("SetVolumeMessage_pb2", "setVolumeMessage"),
+    _ProtocolMessage.TEXT_INPUT_MESSAGE: ("TextInputMessage_pb2", "textInputMessage"),
+    _ProtocolMessage.TRANSACTION_MESSAGE: ("TransactionMessage_pb2", "transactionMessage"),
+    _ProtocolMessage.UPDATE_CLIENT_MESSAGE: ("UpdateClientMessage_pb2", "updateClientMessage"),
+    _ProtocolMessage.UPDATE_CONTENT_ITEM_ARTWORK_MESSAGE: ("UpdateContentItemArtworkMessage_pb2", "updateContentItemArtworkMessage"),
+    _ProtocolMessage.UPDATE_CONTENT_ITEM_MESSAGE: ("UpdateContentItemMessage_pb2", "updateContentItemMessage"),
+    _ProtocolMessage.UPDATE_END_POINTS_MESSAGE: ("UpdateEndPointsMessage_pb2", "updateEndPointsMessage"),
+    _ProtocolMessage.UPDATE_OUTPUT_DEVICE_MESSAGE: ("UpdateOutputDeviceMessage_pb2", "updateOutputDeviceMessage"),
+    _ProtocolMessage.VOLUME_CONTROL_AVAILABILITY_MESSAGE: ("VolumeControlAvailabilityMessage_pb2", "volumeControlAvailabilityMessage"),
+    _ProtocolMessage.VOLUME_CONTROL_CAPABILITIES_DID_CHANGE_MESSAGE: ("VolumeControlCapabilitiesDidChangeMessage_pb2", "volumeControlCapabilitiesDidChangeMessage"),
+    _ProtocolMessage.VOLUME_DID_CHANGE_MESSAGE: ("VolumeDidChangeMessage_pb2", "volumeDidChangeMessage"),
+    _ProtocolMessage.WAKE_DEVICE_MESSAGE: ("WakeDeviceMessage_pb2", "wakeDeviceMessage"),
 }
 
 
-AUDIO_FADE_MESSAGE = ProtocolMessage.AUDIO_FADE_MESSAGE
-AUDIO_FADE_RESPONSE_MESSAGE = ProtocolMessage.AUDIO_FADE_RESPONSE_MESSAGE
-CLIENT_UPDATES_CONFIG_MESSAGE = ProtocolMessage.CLIENT_UPDATES_CONFIG_MESSAGE
-CRYPTO_PAIRING_MESSAGE = ProtocolMessage.CRYPTO_PAIRING_MESSAGE
-DEVICE_INFO_MESSAGE = ProtocolMessage.DEVICE_INFO_MESSAGE
-DEVICE_INFO_UPDATE_MESSAGE = ProtocolMessage.DEVICE_INFO_UPDATE_MESSAGE
-GENERIC_MESSAGE = ProtocolMessage.GENERIC_MESSAGE
-GET_KEYBOARD_SESSION_MESSAGE = ProtocolMessage.GET_KEYBOARD_SESSION_MESSAGE
-GET_REMOTE_TEXT_INPUT_SESSION_MESSAGE = ProtocolMessage.GET_REMOTE_TEXT_INPUT_SESSION_MESSAGE
-GET_VOLUME_MESSAGE = ProtocolMessage.GET_VOLUME_MESSAGE
-GET_VOLUME_RESULT_MESSAGE = ProtocolMessage.GET_VOLUME_RESULT_MESSAGE
-KEYBOARD_MESSAGE = ProtocolMessage.KEYBOARD_MESSAGE
-NOTIFICATION_MESSAGE = ProtocolMessage.NOTIFICATION_MESSAGE
-ORIGIN_CLIENT_PROPERTIES_MESSAGE = ProtocolMessage.ORIGIN_CLIENT_PROPERTIES_MESSAGE
-PLAYBACK_QUEUE_REQUEST_MESSAGE = ProtocolMessage.PLAYBACK_QUEUE_REQUEST_MESSAGE
-PLAYER_CLIENT_PROPERTIES_MESSAGE = ProtocolMessage.PLAYER_CLIENT_PROPERTIES_MESSAGE
-REGISTER_FOR_GAME_CONTROLLER_EVENTS_MESSAGE = ProtocolMessage.REGISTER_FOR_GAME_CONTROLLER_EVENTS_MESSAGE
-REGISTER_HID_DEVICE_MESSAGE = ProtocolMessage.REGISTER_HID_DEVICE_MESSAGE
-REGISTER_HID_DEVICE_RESULT_MESSAGE = ProtocolMessage.REGISTER_HID_DEVICE_RESULT_MESSAGE
-REGISTER_VOICE_INPUT_DEVICE_MESSAGE = ProtocolMessage.REGISTER_VOICE_INPUT_DEVICE_MESSAGE
-REGISTER_VOICE_INPUT_DEVICE_RESPONSE_MESSAGE = ProtocolMessage.REGISTER_VOICE_INPUT_DEVICE_RESPONSE_MESSAGE
-REMOTE_TEXT_INPUT_MESSAGE = ProtocolMessage.REMOTE_TEXT_INPUT_MESSAGE
-REMOVE_CLIENT_MESSAGE = ProtocolMessage.REMOVE_CLIENT_MESSAGE
-REMOVE_ENDPOINTS_MESSAGE = ProtocolMessage.REMOVE_ENDPOINTS_MESSAGE
-REMOVE_OUTPUT_DEVICES_MESSAGE = ProtocolMessage.REMOVE_OUTPUT_DEVICES_MESSAGE
-REMOVE_PLAYER_MESSAGE = ProtocolMessage.REMOVE_PLAYER_MESSAGE
-SEND_COMMAND_MESSAGE = ProtocolMessage.SEND_COMMAND_MESSAGE
-SEND_COMMAND_RESULT_MESSAGE = ProtocolMessage.SEND_COMMAND_RESULT_MESSAGE
-SEND_HID_EVENT_MESSAGE = ProtocolMessage.SEND_HID_EVENT_MESSAGE
-SEND_PACKED_VIRTUAL_TOUCH_EVENT_MESSAGE = ProtocolMessage.SEND_PACKED_VIRTUAL_TOUCH_EVENT_MESSAGE
-SEND_VOICE_INPUT_MESSAGE = ProtocolMessage.SEND_VOICE_INPUT_MESSAGE
-SET_ARTWORK_MESSAGE = ProtocolMessage.SET_ARTWORK_MESSAGE
-SET_CONNECTION_STATE_MESSAGE = ProtocolMessage.SET_CONNECTION_STATE_MESSAGE
-SET_DEFAULT_SUPPORTED_COMMANDS_MESSAGE = ProtocolMessage.SET_DEFAULT_SUPPORTED_COMMANDS_MESSAGE
-SET_DISCOVERY_MODE_MESSAGE = ProtocolMessage.SET_DISCOVERY_MODE_MESSAGE
-SET_HILITE_MODE_MESSAGE = ProtocolMessage.SET_HILITE_MODE_MESSAGE
-SET_NOW_PLAYING_CLIENT_MESSAGE = ProtocolMessage.SET_NOW_PLAYING_CLIENT_MESSAGE
-SET_NOW_PLAYING_PLAYER_MESSAGE = ProtocolMessage.SET_NOW_PLAYING_PLAYER_MESSAGE
-SET_RECORDING_STATE_MESSAGE = ProtocolMessage.SET_RECORDING_STATE_MESSAGE
-SET_STATE_MESSAGE = ProtocolMessage.SET_STATE_MESSAGE
-SET_VOLUME_MESSAGE = ProtocolMessage.SET_VOLUME_MESSAGE
-TEXT_INPUT_MESSAGE = ProtocolMessage.TEXT_INPUT_MESSAGE
-TRANSACTION_MESSAGE = ProtocolMessage.TRANSACTION_MESSAGE
-UPDATE_CLIENT_MESSAGE = ProtocolMessage.UPDATE_CLIENT_MESSAGE
-UPDATE_CONTENT_ITEM_ARTWORK_MESSAGE = ProtocolMessage.UPDATE_CONTENT_ITEM_ARTWORK_MESSAGE
-UPDATE_CONTENT_ITEM_MESSAGE = ProtocolMessage.UPDATE_CONTENT_ITEM_MESSAGE
-UPDATE_END_POINTS_MESSAGE = ProtocolMessage.UPDATE_END_POINTS_MESSAGE
-UPDATE_OUTPUT_DEVICE_MESSAGE = ProtocolMessage.UPDATE_OUTPUT_DEVICE_MESSAGE
-VOLUME_CONTROL_AVAILABILITY_MESSAGE = ProtocolMessage.VOLUME_CONTROL_AVAILABILITY_MESSAGE
-VOLUME_CONTROL_CAPABILITIES_DID_CHANGE_MESSAGE = ProtocolMessage.VOLUME_CONTROL_CAPABILITIES_DID_CHANGE_MESSAGE
-VOLUME_DID_CHANGE_MESSAGE = ProtocolMessage.VOLUME_DID_CHANGE_MESSAGE
-WAKE_DEVICE_MESSAGE = ProtocolMessage.WAKE_DEVICE_MESSAGE
+AUDIO_FADE_MESSAGE = _ProtocolMessage.AUDIO_FADE_MESSAGE
+AUDIO_FADE_RESPONSE_MESSAGE = _ProtocolMessage.AUDIO_FADE_RESPONSE_MESSAGE
+CLIENT_UPDATES_CONFIG_MESSAGE = _ProtocolMessage.CLIENT_UPDATES_CONFIG_MESSAGE
+CRYPTO_PAIRING_MESSAGE = _ProtocolMessage.CRYPTO_PAIRING_MESSAGE
+DEVICE_INFO_MESSAGE = _ProtocolMessage.DEVICE_INFO_MESSAGE
+DEVICE_INFO_UPDATE_MESSAGE = _ProtocolMessage.DEVICE_INFO_UPDATE_MESSAGE
+GENERIC_MESSAGE = _ProtocolMessage.GENERIC_MESSAGE
+GET_KEYBOARD_SESSION_MESSAGE = _ProtocolMessage.GET_KEYBOARD_SESSION_MESSAGE
+GET_REMOTE_TEXT_INPUT_SESSION_MESSAGE = _ProtocolMessage.GET_REMOTE_TEXT_INPUT_SESSION_MESSAGE
+GET_VOLUME_MESSAGE = _ProtocolMessage.GET_VOLUME_MESSAGE
+GET_VOLUME_RESULT_MESSAGE = _ProtocolMessage.GET_VOLUME_RESULT_MESSAGE
+KEYBOARD_MESSAGE = _ProtocolMessage.KEYBOARD_MESSAGE
+NOTIFICATION_MESSAGE = _ProtocolMessage.NOTIFICATION_MESSAGE
+ORIGIN_CLIENT_PROPERTIES_MESSAGE = _ProtocolMessage.ORIGIN_CLIENT_PROPERTIES_MESSAGE
+PLAYBACK_QUEUE_REQUEST_MESSAGE = _ProtocolMessage.PLAYBACK_QUEUE_REQUEST_MESSAGE
+PLAYER_CLIENT_PROPERTIES_MESSAGE = _ProtocolMessage.PLAYER_CLIENT_PROPERTIES_MESSAGE
+REGISTER_FOR_GAME_CONTROLLER_EVENTS_MESSAGE = _ProtocolMessage.REGISTER_FOR_GAME_CONTROLLER_EVENTS_MESSAGE
+REGISTER_HID_DEVICE_MESSAGE = _ProtocolMessage.REGISTER_HID_DEVICE_MESSAGE
+REGISTER_HID_DEVICE_RESULT_MESSAGE = _ProtocolMessage.REGISTER_HID_DEVICE_RESULT_MESSAGE
+REGISTER_VOICE_INPUT_DEVICE_MESSAGE = _ProtocolMessage.REGISTER_VOICE_INPUT_DEVICE_MESSAGE
+REGISTER_VOICE_INPUT_DEVICE_RESPONSE_MESSAGE = _ProtocolMessage.REGISTER_VOICE_INPUT_DEVICE_RESPONSE_MESSAGE
+REMOTE_TEXT_INPUT_MESSAGE = _ProtocolMessage.REMOTE_TEXT_INPUT_MESSAGE
+REMOVE_CLIENT_MESSAGE = _ProtocolMessage.REMOVE_CLIENT_MESSAGE
+REMOVE_ENDPOINTS_MESSAGE = _ProtocolMessage.REMOVE_ENDPOINTS_MESSAGE
+REMOVE_OUTPUT_DEVICES_MESSAGE = _ProtocolMessage.REMOVE_OUTPUT_DEVICES_MESSAGE
+REMOVE_PLAYER_MESSAGE = _ProtocolMessage.REMOVE_PLAYER_MESSAGE
+SEND_COMMAND_MESSAGE = _ProtocolMessage.SEND_COMMAND_MESSAGE
+SEND_COMMAND_RESULT_MESSAGE = _ProtocolMessage.SEND_COMMAND_RESULT_MESSAGE
+SEND_HID_EVENT_MESSAGE = _ProtocolMessage.SEND_HID_EVENT_MESSAGE
+SEND_PACKED_VIRTUAL_TOUCH_EVENT_MESSAGE = _ProtocolMessage.SEND_PACKED_VIRTUAL_TOUCH_EVENT_MESSAGE
+SEND_VOICE_INPUT_MESSAGE = _ProtocolMessage.SEND_VOICE_INPUT_MESSAGE
+SET_ARTWORK_MESSAGE = _ProtocolMessage.SET_ARTWORK_MESSAGE
+SET_CONNECTION_STATE_MESSAGE = _ProtocolMessage.SET_CONNECTION_STATE_MESSAGE
+SET_DEFAULT_SUPPORTED_COMMANDS_MESSAGE = _ProtocolMessage.SET_DEFAULT_SUPPORTED_COMMANDS_MESSAGE
+SET_DISCOVERY_MODE_MESSAGE = _ProtocolMessage.SET_DISCOVERY_MODE_MESSAGE
+SET_HILITE_MODE_MESSAGE = _ProtocolMessage.SET_HILITE_MODE_MESSAGE
+SET_NOW_PLAYING_CLIENT_MESSAGE = _ProtocolMessage.SET_NOW_PLAYING_CLIENT_MESSAGE
+SET_NOW_PLAYING_PLAYER_MESSAGE = _ProtocolMessage.SET_NOW_PLAYING_PLAYER_MESSAGE
+SET_RECORDING_STATE_MESSAGE = _ProtocolMessage.SET_RECORDING_STATE_MESSAGE
+SET_STATE_MESSAGE = _ProtocolMessage.SET_STATE_MESSAGE
+SET_VOLUME_MESSAGE = _ProtocolMessage.SET_VOLUME_MESSAGE
+TEXT_INPUT_MESSAGE = _ProtocolMessage.TEXT_INPUT_MESSAGE
+TRANSACTION_MESSAGE = _ProtocolMessage.TRANSACTION_MESSAGE
+UPDATE_CLIENT_MESSAGE = _ProtocolMessage.UPDATE_CLIENT_MESSAGE
+UPDATE_CONTENT_ITEM_ARTWORK_MESSAGE = _ProtocolMessage.UPDATE_CONTENT_ITEM_ARTWORK_MESSAGE
+UPDATE_CONTENT_ITEM_MESSAGE = _ProtocolMessage.UPDATE_CONTENT_ITEM_MESSAGE
+UPDATE_END_POINTS_MESSAGE = _ProtocolMessage.UPDATE_END_POINTS_MESSAGE
+UPDATE_OUTPUT_DEVICE_MESSAGE = _ProtocolMessage.UPDATE_OUTPUT_DEVICE_MESSAGE
+VOLUME_CONTROL_AVAILABILITY_MESSAGE = _ProtocolMessage.VOLUME_CONTROL_AVAILABILITY_MESSAGE
+VOLUME_CONTROL_CAPABILITIES_DID_CHANGE_MESSAGE = _ProtocolMessage.VOLUME_CONTROL_CAPABILITIES_DID_CHANGE_MESSAGE
+VOLUME_DID_CHANGE_MESSAGE = _ProtocolMessage.VOLUME_DID_CHANGE_MESSAGE
+WAKE_DEVICE_MESSAGE = _ProtocolMessage.WAKE_DEVICE_MESSAGE
+
+
+def _import(module_name):
+    return import_module("." + module_name, __name__)
 
 
 def _inner_message(self):
     extension = _EXTENSION_LOOKUP.get(self.type, None)
     if extension:
-        return self.Extensions[extension]
+        module_name, accessor = extension
+        return self.Extensions[getattr(_import(module_name), accessor)]
 
     raise Exception('unknown type: ' + str(self.type))
 
 
-ProtocolMessage.inner = _inner_message  # type: ignore
+def __getattr__(name):
+    if name == "ProtocolMessage":
+        for module_name in _EXTENSION_MODULES:
+            _import(module_name)
+        value = _ProtocolMessage
+    elif name in _MESSAGE_MODULES:
+        value = getattr(_import(_MESSAGE_MODULES[name]), name)
+    elif name.endswith("_pb2"):
+        value = _import(name)
+    else:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+
+    globals()[name] = value
+    return value
+
+
+_ProtocolMessage.inner = _inner_message  # type: ignore
+
+if sys.version_info < (3, 7):
+    for _name in ["ProtocolMessage", *_MESSAGE_MODULES]:
+        __getattr__(_name)
@@ -8,8 +8,9 @@ import uuid
 
 from pyatv import exceptions
 from pyatv.auth.hap_pairing import parse_credentials
+from pyatv.const import UpdateSubscription
 from pyatv.core.protocol import heartbeater
-from pyatv.protocols.mrp import messages, protobuf
+from pyatv.protocols.mrp import messages
 from pyatv.protocols.mrp.auth import MrpPairVerifyProcedure
 
 _LOGGER = logging.getLogger(__name__)
@@ -49,7 +50,7 @@ async def heartbeat_loop(protocol):
     _LOGGER.debug("Starting heartbeat loop")
     count = 0
     attempts = 0
-    message = messages.create(protobuf.GENERIC_MESSAGE)
+    message = messages.prepared_generic()
     while True:
         try:
             # Re-attempts are made with no initial delay to more quickly
@@ -101,6 +102,11 @@ class MrpProtocol:
         self._listeners = {}
         self._state = ProtocolState.NOT_CONNECTED
 
+    @property
+    def subscriptions(self) -> UpdateSubscription:
+        """Return updates subscribed to from device."""
+        return self.service.update_subscriptions
+
     def add_listener(self, listener, message_type, data=None):
         """Add a listener that will receice incoming messages."""
         if message_type not in self._listeners:
@@ -145,8 +151,19 @@ class MrpProtocol:
             await self.send(messages.set_connection_state())
 
             # Subscribe to updates at this stage
-            await self.send_and_receive(messages.client_updates_config())
-            await self.send_and_receive(messages.get_keyboard_session())
+            subscriptions = self.subscriptions
+            await self.send_and_receive(
+                messages.client_updates_config(
+                    artwork=UpdateSubscription.Artwork in subscriptions,
+                    volume=UpdateSubscription.Volume in subscriptions,
+                    keyboard=UpdateSubscription.Keyboard in subscriptions,
+                    output_device_updates=(
+                        UpdateSubscription.OutputDevices in subscriptions
+                    ),
+                )
+            )
+            if UpdateSubscription.Keyboard in subscriptions:
+                await self.send_and_receive(messages.get_keyboard_session())
         except Exception:
             # Something went wrong, let's do cleanup
             self.stop()
@@ -176,7 +193,7 @@ class MrpProtocol:
                 name=str(self.connection),
                 sender_func=self.send_and_receive,
                 failure_func=lambda exc: self.connection.close,
-                message_factory=lambda: messages.create(protobuf.GENERIC_MESSAGE),
+                message_factory=messages.prepared_generic,
             )
         )
 
@@ -249,6 +266,15 @@ class MrpProtocol:
         del self._outstanding[identifier]
         return response
 
+    def should_skip_message(self, message_type, identifier):
+        """Return if a message can be skipped without decoding it.
+
+        Messages not waited for by a request and without a listener are skipped.
+        """
+        if (identifier or "type_" + str(message_type)) in self._outstanding:
+            return False
+        return message_type not in self._listeners
+
     def message_received(self, message, _):
         """Message was received from device."""
         # If the message identifier is outstanding, then someone is
@@ -4,7 +4,19 @@ import asyncio
 import io
 import logging
 import math
-from typing import Any, Dict, Generator, Mapping, Optional, Set, Tuple, Union, cast
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from pyatv import const, exceptions
 from pyatv.auth.hap_pairing import AuthenticationType, parse_credentials
@@ -35,8 +47,17 @@ from pyatv.interface import (
 from pyatv.protocols.airplay import service_info as airplay_service_info
 from pyatv.protocols.airplay.pairing import AirPlayPairingHandler
 from pyatv.protocols.airplay.utils import AirPlayFlags, parse_features
-from pyatv.protocols.raop.audio_source import AudioSource, open_source
+from pyatv.protocols.raop.audio_source import (
+    AudioFileCache,
+    AudioSource,
+    BufferedReaderSource,
+    is_url,
+    open_source,
+)
+from pyatv.protocols.raop.latency import LatencyController
+from pyatv.protocols.raop.metrics import RaopMetrics
 from pyatv.protocols.raop.raop import (
+    AudioFanout,
     PlaybackInfo,
     RaopClient,
     RaopContext,
@@ -45,7 +66,12 @@ from pyatv.protocols.raop.raop import (
 from pyatv.support import map_range
 from pyatv.support.collections import dict_merge
 from pyatv.support.device_info import lookup_model
-from pyatv.support.http import ClientSessionManager, HttpConnection, http_connect
+from pyatv.support.http import (
+    ClientSessionManager,
+    HttpConnection,
+    create_session,
+    http_connect,
+)
 from pyatv.support.metadata import EMPTY_METADATA, AudioMetadata, get_metadata
 from pyatv.support.rtsp import RtspSession
 from pyatv.support.state_producer import StateProducer
@@ -54,6 +80,9 @@ _LOGGER = logging.getLogger(__name__)
 
 INITIAL_VOLUME = 33.0  # Percent
 
+# Seconds to keep an idle RAOP session alive after playback has finished
+IDLE_TIMEOUT = 30.0
+
 DBFS_MIN = -30.0
 DBFS_MAX = 0.0
 PERCENTAGE_MIN = 0.0
@@ -99,7 +128,12 @@ class RaopPushUpdater(PushUpdater):
 
 
 class RaopPlaybackManager:
-    """Manage current play state for RAOP."""
+    """Manage current play state for RAOP.
+
+    A RAOP session is kept alive when playback has finished, so that it can be re-used
+    for streaming more audio. If the session is not used again within a certain time,
+    it is torn down.
+    """
 
     def __init__(self, address: str, port: int) -> None:
         """Initialize a new RaopPlaybackManager instance."""
@@ -108,9 +142,13 @@ class RaopPlaybackManager:
         self._address: str = address
         self._port: int = port
         self._context: RaopContext = RaopContext()
+        self._latency_controller: LatencyController = LatencyController()
+        self.metrics: RaopMetrics = RaopMetrics()
         self._connection: Optional[HttpConnection] = None
         self._rtsp: Optional[RtspSession] = None
         self._raop: Optional[RaopClient] = None
+        self._idle_timer: Optional[asyncio.TimerHandle] = None
+        self._is_closed: bool = False
 
     @property
     def context(self) -> RaopContext:
@@ -122,34 +160,90 @@ class RaopPlaybackManager:
         """Return RAOP client if a session is active."""
         return self._raop
 
+    @property
+    def is_acquired(self) -> bool:
+        """Return if playback manager is acquired for playback."""
+        return self._is_acquired
+
     def acquire(self) -> None:
         """Acquire playback manager for playback."""
         if self._is_acquired:
             raise exceptions.InvalidStateError("already streaming to device")
 
         self._is_acquired = True
+        self._cancel_idle_timer()
+
+    async def release(self, idle_timeout: float = IDLE_TIMEOUT) -> None:
+        """Release playback manager after playback.
+
+        Current session is kept alive for idle_timeout seconds.
+        """
+        self._is_acquired = False
+        if self._is_closed:
+            await self.teardown()
+        elif self._raop:
+            _LOGGER.debug("Keeping RAOP session alive for %fs", idle_timeout)
+            self._idle_timer = asyncio.get_event_loop().call_later(
+                idle_timeout, self._idle_timeout
+            )
 
     async def setup(self) -> Tuple[RaopClient, RtspSession, RaopContext]:
         """Set up a session or return active if it exists."""
         if self._raop and self._rtsp and self._context:
-            return self._raop, self._rtsp, self._context
+            transport = self._connection.transport if self._connection else None
+            if transport and not transport.is_closing():
+                return self._raop, self._rtsp, self._context
+
+            _LOGGER.debug("Connection for idle RAOP session was closed")
+            await self._close_session()
 
         self._connection = await http_connect(self._address, self._port)
         self._rtsp = RtspSession(self._connection)
-        self._raop = RaopClient(self._rtsp, self._context)
+        self._raop = RaopClient(
+            self._rtsp, self._context, self._latency_controller, self.metrics
+        )
         return self._raop, self._rtsp, self._context
 
+    async def renew(self) -> Tuple[RaopClient, RtspSession, RaopContext]:
+        """Tear down current session (if any) and set up a new one."""
+        await self._close_session()
+        return await self.setup()
+
     async def teardown(self) -> None:
         """Tear down and disconnect current session."""
+        await self._close_session()
+        self._is_acquired = False
+
+    async def _close_session(self) -> None:
+        self._cancel_idle_timer()
         if self._raop:
+            try:
+                await self._raop.teardown()
+            except Exception as ex:
+                _LOGGER.debug("Failed to tear down RAOP session: %s", ex)
             self._raop.close()
         if self._connection:
-            self._connection = None
+            self._connection.close()
         self._raop = None
         self._context.reset()
         self._rtsp = None
         self._connection = None
-        self._is_acquired = False
+
+    def _idle_timeout(self) -> None:
+        if not self._is_acquired:
+            asyncio.ensure_future(self.teardown())
+
+    def close(self) -> Set[asyncio.Task]:
+        """Close playback manager and tear down session once playback has finished."""
+        self._is_closed = True
+        if self._is_acquired:
+            return set()
+        return {asyncio.ensure_future(self.teardown())}
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
 
 
 class RaopMetadata(Metadata):
@@ -216,7 +310,7 @@ class RaopFeatures(Features):
             return FeatureInfo(FeatureState.Available)
 
         if feature_name == FeatureName.Stop:
-            is_streaming = self.playback_manager.raop is not None
+            is_streaming = self.playback_manager.is_acquired
             return FeatureInfo(
                 FeatureState.Available if is_streaming else FeatureState.Unavailable
             )
@@ -294,6 +388,7 @@ class RaopStream(Stream):
         listener: RaopListener,
         audio: RaopAudio,
         playback_manager: RaopPlaybackManager,
+        session_manager: ClientSessionManager,
         takeover: TakeoverMethod,
     ) -> None:
         """Initialize a new RaopStream instance."""
@@ -302,66 +397,222 @@ class RaopStream(Stream):
         self.listener = listener
         self.audio = audio
         self.playback_manager = playback_manager
+        self.session_manager = session_manager
         self.takeover = takeover
 
-    async def stream_file(self, file: Union[str, io.BufferedReader], **kwargs) -> None:
+    @property
+    def metrics(self) -> RaopMetrics:
+        """Return metrics for current (or last) stream.
+
+        Set a listener to get notified when metrics are updated.
+        """
+        return self.playback_manager.metrics
+
+    async def stream_file(
+        self,
+        file: Union[str, io.BufferedReader, Sequence[Union[str, io.BufferedReader]]],
+        **kwargs
+    ) -> None:
         """Stream local file to device.
 
+        If a list of files is given, they are played after each other without any
+        gaps. The next file is prepared while the current file is playing. Audio can
+        also be streamed from a HTTP(S) URL, it is then played while being downloaded.
+
         INCUBATING METHOD - MIGHT CHANGE IN THE FUTURE!
         """
         self.playback_manager.acquire()
         audio_file: Optional[AudioSource] = None
         takeover_release = self.takeover(Audio, Metadata, PushUpdater, RemoteControl)
         try:
-            client, _, context = await self.playback_manager.setup()
-            client.credentials = parse_credentials(self.service.credentials)
-            client.password = self.service.password
-
-            client.listener = self.listener
-            await client.initialize(self.service.properties)
-
-            # Try to load metadata and pass it along if it succeeds
-            metadata: AudioMetadata = EMPTY_METADATA
-            try:
-                # Source must support seeking to read metadata (or point to file)
-                if isinstance(file, str) or file.seekable:
-                    metadata = await get_metadata(file)
-                else:
-                    _LOGGER.debug(
-                        "Seeking not supported by source, not loading metadata"
-                    )
-            except Exception as ex:
-                _LOGGER.exception("Failed to extract metadata from %s: %s", file, ex)
+            client = await _setup_client(
+                self.playback_manager, self.service, self.listener, **kwargs
+            )
+            cache = _audio_cache(**kwargs)
+            metadata = await _load_metadata(file, cache)
 
             # After initialize has been called, all the audio properties will be
             # initialized and can be used in the miniaudio wrapper
+            context = self.playback_manager.context
             audio_file = await open_source(
                 file,
                 context.sample_rate,
                 context.channels,
                 context.bytes_per_channel,
+                cache,
+                self.session_manager.session,
+                *_buffer_times(**kwargs),
             )
 
-            # If the user didn't change volume level prior to streaming, try to extract
-            # volume level from device (if supported). Otherwise set the default level
-            # in pyatv.
-            if not self.audio.has_changed_volume and "initialVolume" in client.info:
-                initial_volume = client.info["initialVolume"]
-                if not isinstance(initial_volume, float):
-                    raise exceptions.ProtocolError(
-                        f"initial volume {initial_volume} has "
-                        "incorrect type {type(initial_volume)}",
-                    )
-                context.volume = initial_volume
-            else:
-                await self.audio.set_volume(self.audio.volume)
-
+            await _init_volume(client, self.audio)
             await client.send_audio(audio_file, metadata)
+        except Exception:
+            # Session might be in a bad state, so don't re-use it
+            await self.playback_manager.teardown()
+            raise
         finally:
             takeover_release()
             if audio_file:
                 await audio_file.close()
-            await self.playback_manager.teardown()
+            await self.playback_manager.release(
+                float(kwargs.get("idle_timeout", IDLE_TIMEOUT))
+            )
+
+
+async def _setup_client(
+    playback_manager: RaopPlaybackManager,
+    service: BaseService,
+    listener: Optional[RaopListener],
+    **kwargs,
+) -> RaopClient:
+    buffered = bool(kwargs.get("buffered", False))
+    client, _, _ = await playback_manager.setup()
+    if client.is_initialized and client.buffered != buffered:
+        # Audio transport is chosen when setting up the session
+        _LOGGER.debug("Audio transport changed, setting up new session")
+        client, _, _ = await playback_manager.renew()
+
+    client.credentials = parse_credentials(service.credentials)
+    client.password = service.password
+    client.compress = bool(kwargs.get("compress", False))
+    client.threaded_pacing = bool(kwargs.get("threaded_pacing", False))
+    client.buffered = buffered
+    client.latency_controller.set_bounds(
+        _optional_float(kwargs.get("min_latency")),
+        _optional_float(kwargs.get("max_latency")),
+    )
+    if "metrics_listener" in kwargs:
+        client.metrics.listener = kwargs["metrics_listener"]
+
+    client.listener = listener
+    if not client.is_initialized:
+        await client.initialize(service.properties)
+    return client
+
+
+def _optional_float(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _audio_cache(**kwargs) -> Optional[AudioFileCache]:
+    cache_dir = kwargs.get("cache_dir")
+    if cache_dir is None:
+        return None
+    return AudioFileCache(
+        str(cache_dir), int(kwargs.get("cache_size", AudioFileCache.DEFAULT_MAX_SIZE))
+    )
+
+
+def _buffer_times(**kwargs) -> Tuple[float, float]:
+    return (
+        float(kwargs.get("prebuffer_time", BufferedReaderSource.PREBUFFER_TIME)),
+        float(
+            kwargs.get("low_watermark_time", BufferedReaderSource.LOW_WATERMARK_TIME)
+        ),
+    )
+
+
+async def _load_metadata(
+    file: Union[str, io.BufferedReader, Sequence[Union[str, io.BufferedReader]]],
+    cache: Optional[AudioFileCache] = None,
+) -> AudioMetadata:
+    # Metadata is only sent once, so use metadata from first file in a playlist
+    source = cast(
+        Union[str, io.BufferedReader],
+        file[0] if isinstance(file, (list, tuple)) else file,
+    )
+
+    if is_url(source):
+        _LOGGER.debug("Not loading metadata from URL %s", source)
+        return EMPTY_METADATA
+
+    # Try to load metadata and pass it along if it succeeds
+    try:
+        # Source must support seeking to read metadata (or point to file)
+        if isinstance(source, str) and cache:
+            return await cache.get_metadata(source)
+        if isinstance(source, str) or source.seekable:
+            return await get_metadata(source)
+        _LOGGER.debug("Seeking not supported by source, not loading metadata")
+    except Exception as ex:
+        _LOGGER.exception("Failed to extract metadata from %s: %s", source, ex)
+    return EMPTY_METADATA
+
+
+async def _init_volume(client: RaopClient, audio: RaopAudio) -> None:
+    # If the user didn't change volume level prior to streaming, try to extract
+    # volume level from device (if supported). Otherwise set the default level
+    # in pyatv.
+    if not audio.has_changed_volume and "initialVolume" in client.info:
+        initial_volume = client.info["initialVolume"]
+        if not isinstance(initial_volume, float):
+            raise exceptions.ProtocolError(
+                f"initial volume {initial_volume} has "
+                "incorrect type {type(initial_volume)}",
+            )
+        client.context.volume = initial_volume
+    else:
+        await audio.set_volume(audio.volume)
+
+
+async def stream_file_to_many(
+    configs: Sequence[BaseConfig],
+    file: Union[str, io.BufferedReader, Sequence[Union[str, io.BufferedReader]]],
+    **kwargs,
+) -> None:
+    """Stream local file to several devices in sync.
+
+    The file is decoded and encoded once and the same audio is sent to all devices
+    using a shared timing reference. Each config must have a RAOP service. Supports
+    the same arguments as stream_file.
+
+    INCUBATING METHOD - MIGHT CHANGE IN THE FUTURE!
+    """
+    receivers: List[Tuple[RaopPlaybackManager, BaseService]] = []
+    for config in configs:
+        service = config.get_service(Protocol.RAOP)
+        if service is None:
+            raise exceptions.NoServiceError(f"no RAOP service for {config.address}")
+        receivers.append(
+            (RaopPlaybackManager(str(config.address), service.port), service)
+        )
+
+    session_manager = await create_session()
+    audio_file: Optional[AudioSource] = None
+    try:
+        clients = await asyncio.gather(
+            *[
+                _setup_client(manager, service, None, **kwargs)
+                for manager, service in receivers
+            ]
+        )
+        fanout = AudioFanout(list(clients))
+        cache = _audio_cache(**kwargs)
+        metadata = await _load_metadata(file, cache)
+
+        context = fanout.context
+        audio_file = await open_source(
+            file,
+            context.sample_rate,
+            context.channels,
+            context.bytes_per_channel,
+            cache,
+            session_manager.session,
+            *_buffer_times(**kwargs),
+        )
+
+        await asyncio.gather(
+            *[
+                _init_volume(client, RaopAudio(manager))
+                for client, (manager, _) in zip(clients, receivers)
+            ]
+        )
+        await fanout.send_audio(audio_file, metadata)
+    finally:
+        if audio_file:
+            await audio_file.close()
+        await asyncio.gather(*[manager.teardown() for manager, _ in receivers])
+        await session_manager.close()
 
 
 class RaopRemoteControl(RemoteControl):
@@ -485,7 +736,13 @@ def setup(  # pylint: disable=too-many-locals
 
     interfaces = {
         Stream: RaopStream(
-            config, service, raop_listener, raop_audio, playback_manager, takeover
+            config,
+            service,
+            raop_listener,
+            raop_audio,
+            playback_manager,
+            session_manager,
+            takeover,
         ),
         Features: RaopFeatures(playback_manager),
         PushUpdater: push_updater,
@@ -498,7 +755,7 @@ def setup(  # pylint: disable=too-many-locals
         return True
 
     def _close() -> Set[asyncio.Task]:
-        return set()
+        return playback_manager.close()
 
     def _device_info() -> Dict[str, Any]:
         devinfo: Dict[str, Any] = {}
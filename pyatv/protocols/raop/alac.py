@@ -0,0 +1,376 @@
+"""Encoding of raw PCM frames into ALAC frames sent by RAOP.
+
+Receivers only accept audio encoded with Apple Lossless (ALAC). The simplest form of
+an ALAC frame is an "uncompressed" frame, which is a small header followed by the
+samples in big endian byte order. The header is 23 bits long, so all samples end up
+shifted by one bit compared to byte boundaries.
+
+Compressed frames are also supported (see AlacEncoder), which are encoded in the
+same way as the reference encoder by Apple: https://github.com/macosforge/alac
+"""
+import struct
+
+from bitarray import bitarray
+
+# Bits making up the header of an uncompressed ALAC frame (channel count excluded)
+_UNCOMPRESSED_HEADER_PREFIX = "00"
+_UNCOMPRESSED_HEADER_SUFFIX = 19 * "0" + "1"
+
+
+class UncompressedAlacEncoder:
+    """Encode PCM frames into uncompressed ALAC frames.
+
+    All samples in a packet are byte swapped and bit shifted in one go and the buffers
+    used to do so are allocated once and re-used for every packet. The padding frame
+    (silence) is encoded once and cached.
+    """
+
+    def __init__(self, channels: int, packet_size: int) -> None:
+        """Initialize a new UncompressedAlacEncoder instance."""
+        self.packet_size = packet_size
+        self._header = bitarray(
+            _UNCOMPRESSED_HEADER_PREFIX
+            + str(channels - 1)
+            + _UNCOMPRESSED_HEADER_SUFFIX
+        )
+        self._header_length = len(self._header)
+        self._frame = self._header.copy()
+        self._swapped = bytearray(packet_size)
+        self._padding: bytes = b""
+
+    @property
+    def padding(self) -> bytes:
+        """Return an encoded frame containing only silence."""
+        if not self._padding:
+            self._padding = self.encode(b"")
+        return self._padding
+
+    def encode(self, frames: bytes) -> bytes:
+        """Encode PCM frames (16 bit little endian) into an ALAC frame.
+
+        If less than a full packet of frames is provided, the frame is padded with
+        silence.
+        """
+        size = len(frames)
+        if size > self.packet_size:
+            raise ValueError(f"{size} bytes exceeds packet size {self.packet_size}")
+
+        swapped = self._swapped
+        swapped[0:size:2] = frames[1::2]
+        swapped[1:size:2] = frames[0::2]
+        if size < self.packet_size:
+            swapped[size:] = bytes(self.packet_size - size)
+
+        frame = self._frame
+        del frame[self._header_length :]
+        frame.frombytes(swapped)
+        return frame.tobytes()
+
+
+# Parameters used by the adaptive Golomb (Rice) coder. These must match what is
+# announced to the receiver in the ANNOUNCE request (pb, mb and kb).
+PB0 = 40
+MB0 = 10
+KB0 = 14
+
+QBSHIFT = 9
+QB = 1 << QBSHIFT
+MMULSHIFT = 2
+MDENSHIFT = QBSHIFT - MMULSHIFT - 1
+MOFF = 1 << (MDENSHIFT - 2)
+BITOFF = 24
+N_MAX_MEAN_CLAMP = 0xFFFF
+N_MEAN_CLAMP_VAL = 0xFFFF
+MAX_PREFIX_16 = 9
+MAX_PREFIX_32 = 9
+MAX_DATATYPE_BITS_16 = 16
+MAX_RICE_BITS = 25
+
+# Dynamic predictor parameters
+DENSHIFT = 9
+PREDICTOR_ORDER = 4
+PB_FACTOR = 4
+INITIAL_COEFS = [
+    (38 << DENSHIFT) >> 4,
+    (-29 << DENSHIFT) >> 4,
+    (-2 << DENSHIFT) >> 4,
+] + (PREDICTOR_ORDER - 3) * [0]
+
+# Stereo channels are mixed into mid/side channels, i.e. (L+R)/2 and L-R
+MIX_BITS = 2
+MIX_RES = 2
+
+ID_SCE = 0
+ID_CPE = 1
+ID_END = 7
+
+
+class _BitWriter:
+    """Write bits in big endian order to a buffer."""
+
+    def __init__(self) -> None:
+        """Initialize a new _BitWriter instance."""
+        self.buffer = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    @property
+    def bit_count(self) -> int:
+        """Return number of written bits."""
+        return 8 * len(self.buffer) + self._bits
+
+    def write(self, value: int, nbits: int) -> None:
+        """Write value using nbits bits."""
+        acc = (self._acc << nbits) | value
+        bits = self._bits + nbits
+        if bits >= 8:
+            nbytes = bits >> 3
+            bits &= 7
+            self.buffer += (acc >> bits).to_bytes(nbytes, "big")
+            acc &= (1 << bits) - 1
+        self._acc = acc
+        self._bits = bits
+
+    def getvalue(self) -> bytes:
+        """Return written data, padded with zeros to byte boundary."""
+        if self._bits:
+            self.write(0, 8 - self._bits)
+        return bytes(self.buffer)
+
+
+def _predict(samples, coefs, chanbits):
+    """Run adaptive linear prediction over samples and return residuals.
+
+    Coefficients are updated in place (sign-sign LMS), so they must be written to the
+    stream before calling this function. The loop is unrolled for a predictor of order
+    four (PREDICTOR_ORDER), just like the reference encoder does.
+    """
+    # pylint: disable=too-many-locals,too-many-statements,invalid-name
+    num = len(samples)
+    half = 1 << (chanbits - 1)
+    mask = (1 << chanbits) - 1
+    denhalf = 1 << (DENSHIFT - 1)
+    coef0, coef1, coef2, coef3 = coefs
+
+    residuals = num * [0]
+    residuals[0] = samples[0]
+    for j in range(1, min(5, num)):
+        residuals[j] = ((samples[j] - samples[j - 1] + half) & mask) - half
+
+    for j in range(5, num):
+        top = samples[j - 5]
+        diff0 = top - samples[j - 1]
+        diff1 = top - samples[j - 2]
+        diff2 = top - samples[j - 3]
+        diff3 = top - samples[j - 4]
+
+        predicted = (
+            denhalf - coef0 * diff0 - coef1 * diff1 - coef2 * diff2 - coef3 * diff3
+        ) >> DENSHIFT
+        residual = ((samples[j] - top - predicted + half) & mask) - half
+        residuals[j] = residual
+
+        # Adapt coefficients, oldest sample first
+        if residual > 0:
+            sign = (diff3 > 0) - (diff3 < 0)
+            coef3 -= sign
+            residual -= (sign * diff3) >> DENSHIFT
+            if residual <= 0:
+                continue
+            sign = (diff2 > 0) - (diff2 < 0)
+            coef2 -= sign
+            residual -= 2 * ((sign * diff2) >> DENSHIFT)
+            if residual <= 0:
+                continue
+            sign = (diff1 > 0) - (diff1 < 0)
+            coef1 -= sign
+            residual -= 3 * ((sign * diff1) >> DENSHIFT)
+            if residual <= 0:
+                continue
+            coef0 -= (diff0 > 0) - (diff0 < 0)
+        elif residual < 0:
+            sign = (diff3 < 0) - (diff3 > 0)
+            coef3 -= sign
+            residual -= (sign * diff3) >> DENSHIFT
+            if residual >= 0:
+                continue
+            sign = (diff2 < 0) - (diff2 > 0)
+            coef2 -= sign
+            residual -= 2 * ((sign * diff2) >> DENSHIFT)
+            if residual >= 0:
+                continue
+            sign = (diff1 < 0) - (diff1 > 0)
+            coef1 -= sign
+            residual -= 3 * ((sign * diff1) >> DENSHIFT)
+            if residual >= 0:
+                continue
+            coef0 -= (diff0 < 0) - (diff0 > 0)
+
+    coefs[:] = [coef0, coef1, coef2, coef3]
+    return residuals
+
+
+def _rice_encode(writer: _BitWriter, residuals, bitsize: int) -> None:
+    """Encode residuals with adaptive Golomb (Rice) coding."""
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    # pylint: disable=invalid-name,consider-using-min-builtin
+    # All codes are collected here and written in one go at the end
+    acc = 0
+    total_bits = 0
+    num = len(residuals)
+    escape_prefix = (1 << MAX_PREFIX_32) - 1
+    wb = (1 << KB0) - 1
+    mb = MB0
+    zmode = 0
+    c = 0
+
+    while c < num:
+        k = ((mb >> QBSHIFT) + 3).bit_length() - 1
+        if k > KB0:
+            k = KB0
+        m = (1 << k) - 1
+
+        residual = residuals[c]
+        c += 1
+        if residual >= 0:
+            n = (residual << 1) - zmode
+        else:
+            n = (-residual << 1) - 1 - zmode
+
+        div = n // m
+        nbits = MAX_RICE_BITS + 1
+        if div < MAX_PREFIX_32:
+            mod = n - m * div
+            if mod:
+                nbits = div + k + 1
+                value = (((1 << div) - 1) << (k + 1)) + mod + 1
+            else:
+                nbits = div + k
+                value = ((1 << div) - 1) << k
+        if nbits > MAX_RICE_BITS:
+            acc = (((acc << MAX_PREFIX_32) | escape_prefix) << bitsize) | n
+            total_bits += MAX_PREFIX_32 + bitsize
+        else:
+            acc = (acc << nbits) | value
+            total_bits += nbits
+
+        mb = PB0 * (n + zmode) + mb - ((PB0 * mb) >> QBSHIFT)
+        if n > N_MAX_MEAN_CLAMP:
+            mb = N_MEAN_CLAMP_VAL
+        zmode = 0
+
+        # Long runs of zeros are coded as run length
+        if (mb << MMULSHIFT) < QB and c < num:
+            zmode = 1
+            zeros = 0
+            while c < num and residuals[c] == 0:
+                c += 1
+                zeros += 1
+                if zeros >= 65535:
+                    zmode = 0
+                    break
+
+            k = (32 - mb.bit_length()) - BITOFF + ((mb + MOFF) >> MDENSHIFT)
+            m = ((1 << k) - 1) & wb
+            div = zeros // m
+            nbits = MAX_RICE_BITS + 1
+            if div < MAX_PREFIX_16:
+                mod = zeros % m
+                if mod:
+                    nbits = div + k + 1
+                    value = (((1 << div) - 1) << (k + 1)) + mod + 1
+                else:
+                    nbits = div + k
+                    value = ((1 << div) - 1) << k
+            if nbits > MAX_RICE_BITS:
+                nbits = MAX_PREFIX_16 + MAX_DATATYPE_BITS_16
+                value = (((1 << MAX_PREFIX_16) - 1) << MAX_DATATYPE_BITS_16) + zeros
+            acc = (acc << nbits) | value
+            total_bits += nbits
+            mb = 0
+
+    writer.write(acc, total_bits)
+
+
+class AlacEncoder(UncompressedAlacEncoder):
+    """Encode PCM frames into compressed ALAC frames.
+
+    Samples are decorrelated with an adaptive linear predictor and residuals are
+    coded with adaptive Golomb (Rice) codes, like the reference encoder by Apple.
+    Stereo input is first mixed into mid/side channels. If a frame would not
+    compress, an uncompressed frame is returned instead.
+
+    Predictor coefficients are adapted continuously and carried over between frames,
+    but since they are included in each frame, every frame can be decoded on its own.
+    """
+
+    def __init__(self, channels: int, packet_size: int) -> None:
+        """Initialize a new AlacEncoder instance."""
+        if channels not in [1, 2]:
+            raise ValueError(f"unsupported number of channels: {channels}")
+        super().__init__(channels, packet_size)
+        self.channels = channels
+        self._num_samples = packet_size // 2
+        self._frames_per_packet = self._num_samples // channels
+        self._uncompressed_bits = self._header_length + 16 * self._num_samples
+        self._coefs = [list(INITIAL_COEFS) for _ in range(channels)]
+        self._unpack = struct.Struct(f"<{self._num_samples}h").unpack
+
+    def encode(self, frames: bytes) -> bytes:  # pylint: disable=too-many-locals
+        """Encode PCM frames (16 bit little endian) into an ALAC frame.
+
+        If less than a full packet of frames is provided, the frame is padded with
+        silence.
+        """
+        size = len(frames)
+        if size > self.packet_size:
+            raise ValueError(f"{size} bytes exceeds packet size {self.packet_size}")
+        if size < self.packet_size:
+            frames = bytes(frames) + bytes(self.packet_size - size)
+
+        samples = self._unpack(frames)
+        if self.channels == 2:
+            left = samples[0::2]
+            right = samples[1::2]
+            channels = [
+                [
+                    (MIX_RES * lsample + (4 - MIX_RES) * rsample) >> MIX_BITS
+                    for lsample, rsample in zip(left, right)
+                ],
+                [lsample - rsample for lsample, rsample in zip(left, right)],
+            ]
+            chanbits = 17
+            element = ID_CPE
+            mix_bits, mix_res = MIX_BITS, MIX_RES
+        else:
+            channels = [list(samples)]
+            chanbits = 16
+            element = ID_SCE
+            mix_bits, mix_res = 0, 0
+
+        # Reset predictor if coefficients risk overflowing 16 bits within this frame
+        limit = 0x7FFF - self._frames_per_packet
+        for index, coefs in enumerate(self._coefs):
+            if any(abs(coef) > limit for coef in coefs):
+                self._coefs[index] = list(INITIAL_COEFS)
+
+        writer = _BitWriter()
+        writer.write(element, 3)
+        writer.write(0, 4)  # Element instance tag
+        writer.write(0, 12)  # Unused
+        writer.write(0, 4)  # Not partial frame, no shift and not escaped
+        writer.write(mix_bits, 8)
+        writer.write(mix_res, 8)
+        for coefs in self._coefs:
+            writer.write(DENSHIFT, 8)  # Mode 0 in upper four bits
+            writer.write((PB_FACTOR << 5) | len(coefs), 8)
+            for coef in coefs:
+                writer.write(coef & 0xFFFF, 16)
+
+        for channel, coefs in zip(channels, self._coefs):
+            _rice_encode(writer, _predict(channel, coefs, chanbits), chanbits)
+            if writer.bit_count >= self._uncompressed_bits:
+                return super().encode(frames)
+
+        writer.write(ID_END, 3)
+        return writer.getvalue()
@@ -1,16 +1,25 @@
 """Audio sources that can provide raw PCM frames that pyatv can stream."""
 from abc import ABC, abstractmethod
+import array
 import asyncio
 from contextlib import suppress
 from functools import partial
+import hashlib
 import io
+import json
 import logging
-from typing import Optional, Union
+import mmap
+import os
+import threading
+from typing import BinaryIO, Generator, List, Optional, Sequence, Union, cast
 
+from aiohttp import ClientResponse, ClientSession, ClientTimeout
 import miniaudio
 from miniaudio import SampleFormat
 
-from pyatv.exceptions import NotSupportedError
+from pyatv.exceptions import HttpError, NotSupportedError
+from pyatv.support.directory_store import DirectoryStore
+from pyatv.support.metadata import AudioMetadata, get_metadata
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,6 +68,11 @@ class AudioSource(ABC):
     def duration(self) -> int:
         """Return duration in seconds."""
 
+    @property
+    def underruns(self) -> int:
+        """Return number of times source ran out of data during playback."""
+        return 0
+
 
 class ReaderWrapper(miniaudio.StreamableSource):
     """Wraps a reader into a StreamableSource that miniaudio can consume."""
@@ -81,45 +95,131 @@ class ReaderWrapper(miniaudio.StreamableSource):
         return True
 
 
+class AudioRingBuffer:
+    """Pre-allocated ring buffer for audio data.
+
+    Supports one writer and one reader (that may run in different threads) without
+    locking: the writer only updates the write position and the reader only updates
+    the read position.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize a new AudioRingBuffer instance."""
+        self._size: int = size
+        self._buffer: bytearray = bytearray(size)
+        self._view: memoryview = memoryview(self._buffer)
+        self._read_pos: int = 0
+        self._write_pos: int = 0
+
+    @property
+    def size(self) -> int:
+        """Return total size of buffer."""
+        return self._size
+
+    @property
+    def available(self) -> int:
+        """Return number of bytes available for reading."""
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self) -> int:
+        """Return number of bytes available for writing."""
+        return self._size - self.available
+
+    def write(self, data: Union[bytes, memoryview]) -> int:
+        """Write data to buffer and return number of written bytes."""
+        source = memoryview(data)
+        length = min(len(source), self.free)
+        pos = self._write_pos % self._size
+        first = min(length, self._size - pos)
+        self._view[pos : pos + first] = source[0:first]
+        self._view[0 : length - first] = source[first:length]
+        self._write_pos += length
+        return length
+
+    def read(self, length: int) -> bytes:
+        """Read at most length bytes from buffer."""
+        length = min(length, self.available)
+        pos = self._read_pos % self._size
+        first = min(length, self._size - pos)
+        if first == length:
+            data = bytes(self._view[pos : pos + length])
+        else:
+            data = b"".join((self._view[pos:], self._view[0 : length - first]))
+        self._read_pos += length
+        return data
+
+
 class BufferedReaderSource(AudioSource):
     """Audio source used to play a file from a buffer.
 
-    This audio source adds a small internal buffer (corresponding to 0,5s) to deal with
-    tiny hiccups. Proper buffering should be done by the source buffer.
+    Audio is decoded by a dedicated thread into an internal ring buffer to deal with
+    tiny hiccups. Playback starts when prebuffer_time seconds of audio is available and
+    the decoder thread starts filling up the buffer again when less than
+    low_watermark_time seconds of audio remains. If the buffer runs empty during
+    playback, playback stalls until the buffer has been pre-buffered again (counted as
+    an underrun). Proper buffering should be done by the source buffer.
     """
 
-    CHUNK_SIZE = FRAMES_PER_PACKET * 3
+    CHUNK_SIZE = FRAMES_PER_PACKET * 32
+    BUFFER_TIME = 2.0  # Seconds
+    PREBUFFER_TIME = 0.5  # Seconds
+    LOW_WATERMARK_TIME = 1.0  # Seconds
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         reader: miniaudio.WavFileReadStream,
         wrapper: ReaderWrapper,
         sample_rate: int,
         channels: int,
         sample_size: int,
+        buffer_time: float = BUFFER_TIME,
+        prebuffer_time: float = PREBUFFER_TIME,
+        low_watermark_time: float = LOW_WATERMARK_TIME,
     ) -> None:
         """Initialize a new MiniaudioWrapper instance."""
         self.loop = asyncio.get_event_loop()
         self.reader: miniaudio.WavFileReadStream = reader
         self.wrapper: ReaderWrapper = wrapper
-        self._buffer_task: Optional[asyncio.Task] = asyncio.ensure_future(
-            self._buffering_task()
-        )
-        self._audio_buffer: bytes = b""
-        self._buffer_needs_refilling: asyncio.Event = asyncio.Event()
-        self._data_was_added_to_buffer: asyncio.Event = asyncio.Event()
-        self._buffer_size: int = int(sample_rate / 2)
         self._sample_rate: int = sample_rate
         self._channels: int = channels
         self._sample_size: int = sample_size
 
+        frame_size = channels * sample_size
+        self._chunk_bytes: int = self.CHUNK_SIZE * frame_size
+        buffer_bytes = max(int(buffer_time * sample_rate), self.CHUNK_SIZE) * frame_size
+        self._audio_buffer: AudioRingBuffer = AudioRingBuffer(
+            buffer_bytes + self._chunk_bytes
+        )
+        self._prebuffer_bytes: int = min(
+            int(prebuffer_time * sample_rate) * frame_size, buffer_bytes
+        )
+        self._low_watermark_bytes: int = min(
+            int(low_watermark_time * sample_rate) * frame_size, buffer_bytes
+        )
+
+        self._underruns: int = 0
+        self._has_started: bool = False
+        self._end_of_stream: bool = False
+        self._is_stopped: bool = False
+        self._refill: threading.Event = threading.Event()
+        self._data_waiter: Optional[asyncio.Future] = None
+        self._wakeup_level: int = 0
+        self._decode_thread: threading.Thread = threading.Thread(
+            target=self._decode_loop, name="pyatv-audio-decoder", daemon=True
+        )
+        self._decode_thread.start()
+
     @classmethod
-    async def open(
+    async def open(  # pylint: disable=too-many-arguments
         cls,
         buffered_reader: io.BufferedReader,
         sample_rate: int,
         channels: int,
         sample_size: int,
+        buffer_time: float = BUFFER_TIME,
+        prebuffer_time: float = PREBUFFER_TIME,
+        low_watermark_time: float = LOW_WATERMARK_TIME,
     ) -> "BufferedReaderSource":
         """Return a new AudioSource instance playing from the provided buffer."""
         wrapper = ReaderWrapper(buffered_reader)
@@ -146,70 +246,104 @@ class BufferedReaderSource(AudioSource):
         await loop.run_in_executor(None, reader.read, 44)
 
         # The source stream is passed here and saved to not be garbage collected
-        instance = cls(reader, wrapper, sample_rate, channels, sample_size)
+        instance = cls(
+            reader,
+            wrapper,
+            sample_rate,
+            channels,
+            sample_size,
+            buffer_time,
+            prebuffer_time,
+            low_watermark_time,
+        )
         return instance
 
     async def close(self) -> None:
         """Close underlying resources."""
-        if self._buffer_task:
-            self._buffer_task.cancel()
-            with suppress(asyncio.CancelledError):
-                await self._buffer_task
-            self._buffer_task = None
+        # Decoder thread might be blocked reading from source, so don't wait for it
+        # to finish (it's a daemon thread)
+        self._is_stopped = True
+        self._refill.set()
+
+    @property
+    def underruns(self) -> int:
+        """Return number of times the buffer ran empty during playback."""
+        return self._underruns
+
+    @property
+    def buffered_frames(self) -> int:
+        """Return number of frames currently in buffer."""
+        return self._audio_buffer.available // (self._channels * self._sample_size)
 
     async def readframes(self, nframes: int) -> bytes:
         """Read number of frames and advance in stream."""
-        # If buffer is empty but the buffering task is still running, that means we are
-        # buffering and need to wait for more data to be added to buffer.
-        buffer_task_running = self._buffer_task and self._buffer_task.done()
-        if not self._audio_buffer and not buffer_task_running:
+        total_bytes = nframes * self._sample_size * self._channels
+
+        # Not enough data for a full packet, wait for buffer to fill up to pre-buffer
+        # level again
+        if self._audio_buffer.available < total_bytes and not self._end_of_stream:
             _LOGGER.debug("Audio source is buffering")
-            self._buffer_needs_refilling.set()
-            self._data_was_added_to_buffer.clear()
-            await self._data_was_added_to_buffer.wait()
+            await self._wait_for_data(max(self._prebuffer_bytes, total_bytes))
 
-        total_bytes = nframes * self._sample_size * self._channels
+            # Running out of data in the end of the stream is not an underrun
+            if self._has_started and self._audio_buffer.available > 0:
+                self._underruns += 1
+                _LOGGER.debug("Audio source buffer underrun (%d)", self._underruns)
 
-        # Return data corresponding to requested frame, or what is left
-        available_data = min(total_bytes, len(self._audio_buffer))
-        data = self._audio_buffer[0:available_data]
-        self._audio_buffer = self._audio_buffer[available_data:]
+        self._has_started = True
+        data = self._audio_buffer.read(total_bytes)
 
-        # Simple buffering scheme: fill up the buffer again when reaching <= 50%
-        if len(self._audio_buffer) < 0.5 * self._buffer_size:
-            self._buffer_needs_refilling.set()
+        if self._audio_buffer.available <= self._low_watermark_bytes:
+            self._refill.set()
 
         return data
 
-    async def _buffering_task(self) -> None:
-        _LOGGER.debug("Starting audio buffering task")
-        while True:
-            try:
-                # Read a chunk and add it to the internal buffer. If no data as read,
-                # just break out.
-                chunk = await self.loop.run_in_executor(
-                    None, self.reader.read, self.CHUNK_SIZE
-                )
-                if not chunk:
-                    break
+    async def _wait_for_data(self, level: int) -> None:
+        self._wakeup_level = level
+        self._data_waiter = self.loop.create_future()
+        try:
+            # Decoder thread might have filled the buffer before waiter was set
+            if self._audio_buffer.available < level and not self._end_of_stream:
+                self._refill.set()
+                await self._data_waiter
+        finally:
+            self._data_waiter = None
 
-                self._audio_buffer += chunk
+    def _notify_data_available(self) -> None:
+        waiter = self._data_waiter
+        if waiter is not None and (
+            self._end_of_stream or self._audio_buffer.available >= self._wakeup_level
+        ):
+            self.loop.call_soon_threadsafe(self._wake_up, waiter)
 
-                # Wait for an entire packet
-                if (
-                    len(self._audio_buffer)
-                    >= FRAMES_PER_PACKET * self._channels * self._sample_size
-                ):
-                    self._data_was_added_to_buffer.set()
+    @staticmethod
+    def _wake_up(waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_result(None)
 
-                if len(self._audio_buffer) >= self._buffer_size:
-                    await self._buffer_needs_refilling.wait()
-                    self._buffer_needs_refilling.clear()
+    def _decode_loop(self) -> None:
+        _LOGGER.debug("Starting audio decoder thread")
+        try:
+            while not self._is_stopped:
+                # Buffer is full: wait until it has been drained to low watermark level
+                if self._audio_buffer.free < self._chunk_bytes:
+                    self._refill.clear()
+                    if self._audio_buffer.free < self._chunk_bytes:
+                        self._refill.wait()
+                    continue
 
-            except Exception:
-                _LOGGER.exception("an error occurred during buffering")
+                chunk = self.reader.read(self._chunk_bytes)
+                if not chunk:
+                    break
 
-        self._data_was_added_to_buffer.set()
+                self._audio_buffer.write(chunk)
+                self._notify_data_available()
+        except Exception:
+            _LOGGER.exception("an error occurred during decoding")
+        finally:
+            _LOGGER.debug("Audio decoder thread stopped")
+            self._end_of_stream = True
+            self._notify_data_available()
 
     @property
     def sample_rate(self) -> int:
@@ -232,14 +366,214 @@ class BufferedReaderSource(AudioSource):
         return 0  # We don't know the duration
 
 
+class HttpReader:
+    """Blocking file-like reader of a HTTP response body downloaded in background.
+
+    The body is downloaded by a task in the event loop into a ring buffer holding at
+    most read_ahead bytes, pausing the download when the buffer is full. Data is read
+    from another thread (e.g. a decoder thread), blocking until data is available.
+    Reading from the event loop thread will dead lock.
+    """
+
+    CHUNK_SIZE = 16384
+
+    def __init__(self, response: ClientResponse, read_ahead: int) -> None:
+        """Initialize a new HttpReader instance."""
+        self.loop = asyncio.get_event_loop()
+        self._response: ClientResponse = response
+        self._buffer: AudioRingBuffer = AudioRingBuffer(read_ahead)
+        self._condition: threading.Condition = threading.Condition()
+        self._space_waiter: Optional[asyncio.Future] = None
+        self._end_of_stream: bool = False
+        self._task: asyncio.Future = asyncio.ensure_future(self._download())
+
+    def read(self, size: int = -1) -> bytes:
+        """Read at most size bytes, blocking until data is available."""
+        with self._condition:
+            while self._buffer.available == 0 and not self._end_of_stream:
+                self._condition.wait()
+            data = self._buffer.read(size if size >= 0 else self._buffer.available)
+            waiter = self._space_waiter
+
+        if waiter is not None and data:
+            self.loop.call_soon_threadsafe(self._wake_up, waiter)
+        return data
+
+    @staticmethod
+    def seekable() -> bool:
+        """Return if seeking is supported (it is not)."""
+        return False
+
+    def close(self) -> None:
+        """Stop downloading and wake up blocked readers."""
+        self._task.cancel()
+        with self._condition:
+            self._end_of_stream = True
+            self._condition.notify_all()
+
+    async def _download(self) -> None:
+        try:
+            async for chunk in self._response.content.iter_chunked(self.CHUNK_SIZE):
+                view = memoryview(chunk)
+                while view:
+                    with self._condition:
+                        written = self._buffer.write(view)
+                        self._condition.notify_all()
+                    view = view[written:]
+                    if view:
+                        await self._wait_for_space()
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            _LOGGER.exception("failed to download %s", self._response.url)
+        finally:
+            _LOGGER.debug("Finished downloading %s", self._response.url)
+            self._response.release()
+            with self._condition:
+                self._end_of_stream = True
+                self._condition.notify_all()
+
+    @staticmethod
+    def _wake_up(waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_result(None)
+
+    async def _wait_for_space(self) -> None:
+        with self._condition:
+            # Reader might have made room before waiter was set
+            if self._buffer.free > 0:
+                return
+            self._space_waiter = self.loop.create_future()
+
+        try:
+            await self._space_waiter
+        finally:
+            self._space_waiter = None
+
+
+class HttpSource(AudioSource):
+    """Audio source used to play audio from a HTTP(S) URL.
+
+    Audio is decoded progressively while it is being downloaded, with a read-ahead
+    window of read_ahead bytes of (not yet decoded) data. Playback starts once
+    prebuffer_time seconds of audio has been decoded.
+    """
+
+    READ_AHEAD = 256 * 1024  # Bytes
+    READ_TIMEOUT = 30.0  # Seconds
+
+    def __init__(self, source: BufferedReaderSource, reader: HttpReader) -> None:
+        """Initialize a new HttpSource instance."""
+        self._source: BufferedReaderSource = source
+        self._reader: HttpReader = reader
+
+    @classmethod
+    async def open(  # pylint: disable=too-many-arguments
+        cls,
+        url: str,
+        session: ClientSession,
+        sample_rate: int,
+        channels: int,
+        sample_size: int,
+        read_ahead: int = READ_AHEAD,
+        prebuffer_time: float = BufferedReaderSource.PREBUFFER_TIME,
+        low_watermark_time: float = BufferedReaderSource.LOW_WATERMARK_TIME,
+    ) -> "HttpSource":
+        """Return a new AudioSource instance playing audio from a URL."""
+        response = await session.get(
+            url, timeout=ClientTimeout(total=None, sock_read=cls.READ_TIMEOUT)
+        )
+        if response.status >= 400:
+            response.release()
+            raise HttpError(
+                f"failed to get {url}: {response.status} {response.reason}",
+                response.status,
+            )
+
+        reader = HttpReader(response, read_ahead)
+        try:
+            source = await BufferedReaderSource.open(
+                cast(io.BufferedReader, reader),
+                sample_rate,
+                channels,
+                sample_size,
+                prebuffer_time=prebuffer_time,
+                low_watermark_time=low_watermark_time,
+            )
+        except Exception:
+            reader.close()
+            raise
+        return cls(source, reader)
+
+    async def close(self) -> None:
+        """Close underlying resources."""
+        await self._source.close()
+        self._reader.close()
+
+    async def readframes(self, nframes: int) -> bytes:
+        """Read number of frames and advance in stream."""
+        return await self._source.readframes(nframes)
+
+    @property
+    def sample_rate(self) -> int:
+        """Return sample rate."""
+        return self._source.sample_rate
+
+    @property
+    def channels(self) -> int:
+        """Return number of audio channels."""
+        return self._source.channels
+
+    @property
+    def sample_size(self) -> int:
+        """Return number of bytes per sample."""
+        return self._source.sample_size
+
+    @property
+    def duration(self) -> int:
+        """Return duration in seconds."""
+        return 0  # We don't know the duration
+
+    @property
+    def underruns(self) -> int:
+        """Return number of times the buffer ran empty during playback."""
+        return self._source.underruns
+
+
 class FileSource(AudioSource):
-    """Audio source used to play a local audio file."""
+    """Audio source used to play a local audio file.
+
+    The file is decoded incrementally by a background task, keeping at most
+    READ_AHEAD_CHUNKS chunks of decoded audio in memory. Memory usage and time until
+    first frames are available are thus independent of file size.
+    """
+
+    CHUNK_SIZE = FRAMES_PER_PACKET * 8
+    READ_AHEAD_CHUNKS = 16  # Roughly 1s at 44100Hz
 
-    def __init__(self, src: miniaudio.DecodedSoundFile) -> None:
+    def __init__(
+        self,
+        stream: Generator[array.array, int, None],
+        info: miniaudio.SoundFileInfo,
+        initial_data: bytes,
+        sample_rate: int,
+        channels: int,
+        sample_size: int,
+    ) -> None:
         """Initialize a new FileSource instance."""
-        self.src: miniaudio.DecodedSoundFile = src
-        self.samples: bytes = self.src.samples.tobytes()
-        self.pos: int = 0
+        self.loop = asyncio.get_event_loop()
+        self.stream: Generator[array.array, int, None] = stream
+        self.info: miniaudio.SoundFileInfo = info
+        self._audio_buffer: bytearray = bytearray(initial_data)
+        self._chunks: asyncio.Queue = asyncio.Queue(maxsize=self.READ_AHEAD_CHUNKS)
+        self._end_of_stream: bool = False
+        self._decode_future: Optional[asyncio.Future] = None
+        self._sample_rate: int = sample_rate
+        self._channels: int = channels
+        self._sample_size: int = sample_size
+        self._decode_task: Optional[asyncio.Task] = asyncio.ensure_future(
+            self._decoding_task()
+        )
 
     @classmethod
     async def open(
@@ -247,56 +581,496 @@ class FileSource(AudioSource):
     ) -> "FileSource":
         """Return a new AudioSource instance playing from the provided file."""
         loop = asyncio.get_event_loop()
-        src = await loop.run_in_executor(
+        info = await loop.run_in_executor(None, miniaudio.get_file_info, filename)
+        stream = await loop.run_in_executor(
             None,
             partial(
-                miniaudio.decode_file,
+                miniaudio.stream_file,
                 filename,
                 output_format=_int2sf(sample_size),
                 nchannels=channels,
                 sample_rate=sample_rate,
+                frames_to_read=cls.CHUNK_SIZE,
             ),
         )
-        return cls(src)
+
+        # Decode first chunk up front so that audio is available immediately when
+        # playback starts
+        first_chunk = await loop.run_in_executor(None, next, stream, None)
+        initial_data = first_chunk.tobytes() if first_chunk is not None else b""
+        return cls(stream, info, initial_data, sample_rate, channels, sample_size)
+
+    async def close(self) -> None:
+        """Close underlying resources."""
+        if self._decode_task:
+            self._decode_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._decode_task
+            self._decode_task = None
+
+        # Decoder cannot be closed while a chunk is being decoded
+        if self._decode_future:
+            with suppress(Exception):
+                await self._decode_future
+        self.stream.close()
 
     async def readframes(self, nframes: int) -> bytes:
         """Read number of frames and advance in stream."""
-        if self.pos >= len(self.samples):
+        total_bytes = nframes * self._sample_size * self._channels
+
+        while len(self._audio_buffer) < total_bytes and not self._end_of_stream:
+            chunk = await self._chunks.get()
+            if chunk:
+                self._audio_buffer += chunk
+            else:
+                self._end_of_stream = True
+
+        data = bytes(self._audio_buffer[0:total_bytes])
+        del self._audio_buffer[0:total_bytes]
+        return data
+
+    async def _decoding_task(self) -> None:
+        _LOGGER.debug("Starting audio decoding task")
+        try:
+            while True:
+                # Decode next chunk and add it to the queue, waiting for space to
+                # become available if read-ahead limit has been reached
+                self._decode_future = self.loop.run_in_executor(
+                    None, next, self.stream, None
+                )
+                chunk = await asyncio.shield(self._decode_future)
+                if chunk is None:
+                    break
+                await self._chunks.put(chunk.tobytes())
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            # CancelledError is an Exception in python < 3.8 and must not be treated
+            # as a decoding error (nobody reads the end of stream marker when closed)
+            raise
+        except Exception:
+            _LOGGER.exception("an error occurred during decoding")
+
+        # Empty chunk marks end of stream
+        await self._chunks.put(b"")
+
+    @property
+    def sample_rate(self) -> int:
+        """Return sample rate."""
+        return self._sample_rate
+
+    @property
+    def channels(self) -> int:
+        """Return number of audio channels."""
+        return self._channels
+
+    @property
+    def sample_size(self) -> int:
+        """Return number of bytes per sample."""
+        return self._sample_size
+
+    @property
+    def duration(self) -> int:
+        """Return duration in seconds."""
+        return round(self.info.duration)
+
+
+class MmapSource(AudioSource):
+    """Audio source playing raw PCM frames from a file.
+
+    The file is memory mapped, so frames are read directly from the page cache
+    without any decoding or intermediate buffering.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        mapped: Optional[mmap.mmap],
+        sample_rate: int,
+        channels: int,
+        sample_size: int,
+    ) -> None:
+        """Initialize a new MmapSource instance."""
+        self.file: BinaryIO = file
+        self.mapped: Optional[mmap.mmap] = mapped
+        self._position: int = 0
+        self._sample_rate: int = sample_rate
+        self._channels: int = channels
+        self._sample_size: int = sample_size
+
+    @classmethod
+    async def open(
+        cls, filename: str, sample_rate: int, channels: int, sample_size: int
+    ) -> "MmapSource":
+        """Return a new AudioSource instance playing from the provided PCM file."""
+        loop = asyncio.get_event_loop()
+        file = await loop.run_in_executor(None, io.open, filename, "rb")
+        try:
+            mapped: Optional[mmap.mmap] = None
+            if os.fstat(file.fileno()).st_size > 0:  # Empty files cannot be mapped
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            file.close()
+            raise
+        return cls(file, mapped, sample_rate, channels, sample_size)
+
+    async def close(self) -> None:
+        """Close underlying resources."""
+        if self.mapped:
+            self.mapped.close()
+            self.mapped = None
+        self.file.close()
+
+    async def readframes(self, nframes: int) -> bytes:
+        """Read number of frames and advance in stream."""
+        if self.mapped is None:
             return b""
 
-        bytes_to_read = (self.sample_size * self.channels) * nframes
-        data = self.samples[self.pos : min(len(self.samples), self.pos + bytes_to_read)]
-        self.pos += bytes_to_read
+        total_bytes = nframes * self._sample_size * self._channels
+        data = self.mapped[self._position : self._position + total_bytes]
+        self._position += len(data)
         return data
 
     @property
     def sample_rate(self) -> int:
         """Return sample rate."""
-        return self.src.sample_rate
+        return self._sample_rate
 
     @property
     def channels(self) -> int:
         """Return number of audio channels."""
-        return self.src.nchannels
+        return self._channels
 
     @property
     def sample_size(self) -> int:
         """Return number of bytes per sample."""
-        return self.src.sample_width
+        return self._sample_size
 
     @property
     def duration(self) -> int:
         """Return duration in seconds."""
-        return round(self.src.duration)
+        if self.mapped is None:
+            return 0
+        frame_size = self._channels * self._sample_size
+        return round(len(self.mapped) / frame_size / self._sample_rate)
+
+
+class AudioFileCache:
+    """On-disk cache of decoded audio files and their metadata.
+
+    A file is decoded (and resampled) to raw PCM frames once and stored in the cache
+    directory, from where it is played by an MmapSource. Entries are keyed by path,
+    modification time and target audio format, so modified files are decoded again.
+    When the total size of the cache exceeds max_size bytes, least recently used
+    entries are removed. The directory can be shared between several instances.
+    """
+
+    DEFAULT_MAX_SIZE = 100 * 1024 * 1024  # Bytes
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialize a new AudioFileCache instance."""
+        self.hits: int = 0
+        self.misses: int = 0
+        self._store: DirectoryStore = DirectoryStore(
+            directory, max_size, (".pcm", ".json")
+        )
+
+    @property
+    def directory(self) -> str:
+        """Return path to cache directory."""
+        return self._store.directory
+
+    @property
+    def max_size(self) -> int:
+        """Return max total size of cached entries in bytes."""
+        return self._store.max_size
+
+    async def open(
+        self, filename: str, sample_rate: int, channels: int, sample_size: int
+    ) -> MmapSource:
+        """Return an AudioSource for a file, decoding it if not cached."""
+        loop = asyncio.get_event_loop()
+        key = self._key(filename, sample_rate, channels, sample_size)
+        path = self._store.path(key + ".pcm")
+        if await loop.run_in_executor(None, self._store.touch, path):
+            self.hits += 1
+        else:
+            self.misses += 1
+            _LOGGER.debug("Decoding %s to cache", filename)
+            await loop.run_in_executor(
+                None,
+                self._decode,
+                filename,
+                path,
+                sample_rate,
+                channels,
+                sample_size,
+            )
+        return await MmapSource.open(path, sample_rate, channels, sample_size)
+
+    async def get_metadata(self, filename: str) -> AudioMetadata:
+        """Return metadata for a file, extracting it if not cached."""
+        loop = asyncio.get_event_loop()
+        path = self._store.path(self._key(filename) + ".json")
+        data = await loop.run_in_executor(None, self._store.read, path)
+        if data is not None:
+            self.hits += 1
+            return AudioMetadata(*json.loads(data))
+
+        self.misses += 1
+        metadata = await get_metadata(filename)
+        await loop.run_in_executor(
+            None, self._store.write, path, [json.dumps(metadata).encode("utf-8")]
+        )
+        return metadata
+
+    @property
+    def size(self) -> int:
+        """Return total size of cached entries in bytes."""
+        return self._store.size
+
+    @staticmethod
+    def _key(filename: str, *target_format: int) -> str:
+        stat = os.stat(filename)
+        identifier = [os.path.abspath(filename), stat.st_mtime_ns, stat.st_size]
+        identifier += target_format
+        return hashlib.sha256(repr(identifier).encode("utf-8")).hexdigest()
+
+    def _decode(  # pylint: disable=too-many-arguments
+        self,
+        filename: str,
+        path: str,
+        sample_rate: int,
+        channels: int,
+        sample_size: int,
+    ) -> None:
+        stream = miniaudio.stream_file(
+            filename,
+            output_format=_int2sf(sample_size),
+            nchannels=channels,
+            sample_rate=sample_rate,
+            frames_to_read=FileSource.CHUNK_SIZE,
+        )
+        try:
+            self._store.write(path, stream)
+        finally:
+            stream.close()
+
+
+class PlaylistSource(AudioSource):
+    """Audio source playing several sources after each other without gaps.
+
+    The next source is opened (and thus starts to decode audio) in the background
+    while the current source is playing. When the current source runs out of frames,
+    the remaining frames are read from the next source, so audio continues seamlessly
+    without any silence in between.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        sources: Sequence[Union[str, io.BufferedReader]],
+        current: AudioSource,
+        durations: Sequence[float],
+        sample_rate: int,
+        channels: int,
+        sample_size: int,
+        cache: Optional[AudioFileCache] = None,
+        session: Optional[ClientSession] = None,
+        prebuffer_time: float = BufferedReaderSource.PREBUFFER_TIME,
+        low_watermark_time: float = BufferedReaderSource.LOW_WATERMARK_TIME,
+    ) -> None:
+        """Initialize a new PlaylistSource instance."""
+        self._pending: List[Union[str, io.BufferedReader]] = list(sources)
+        self._current: Optional[AudioSource] = current
+        self._next_source: Optional[asyncio.Future] = None
+        self._durations: Sequence[float] = durations
+        self._sample_rate: int = sample_rate
+        self._channels: int = channels
+        self._sample_size: int = sample_size
+        self._cache: Optional[AudioFileCache] = cache
+        self._session: Optional[ClientSession] = session
+        self._prebuffer_time: float = prebuffer_time
+        self._low_watermark_time: float = low_watermark_time
+        self._previous_underruns: int = 0
+        self._prefetch_next()
+
+    @classmethod
+    async def open(  # pylint: disable=too-many-arguments
+        cls,
+        sources: Sequence[Union[str, io.BufferedReader]],
+        sample_rate: int,
+        channels: int,
+        sample_size: int,
+        cache: Optional[AudioFileCache] = None,
+        session: Optional[ClientSession] = None,
+        prebuffer_time: float = BufferedReaderSource.PREBUFFER_TIME,
+        low_watermark_time: float = BufferedReaderSource.LOW_WATERMARK_TIME,
+    ) -> "PlaylistSource":
+        """Return a new AudioSource instance playing the provided sources in order."""
+        if not sources:
+            raise ValueError("no sources to play")
+
+        loop = asyncio.get_event_loop()
+        durations: List[float] = []
+        for source in sources:
+            if isinstance(source, str) and not is_url(source):
+                info = await loop.run_in_executor(None, miniaudio.get_file_info, source)
+                durations.append(info.duration)
+
+        current = await open_source(
+            sources[0],
+            sample_rate,
+            channels,
+            sample_size,
+            cache,
+            session,
+            prebuffer_time,
+            low_watermark_time,
+        )
+        return cls(
+            sources[1:],
+            current,
+            durations,
+            sample_rate,
+            channels,
+            sample_size,
+            cache,
+            session,
+            prebuffer_time,
+            low_watermark_time,
+        )
+
+    async def close(self) -> None:
+        """Close underlying resources."""
+        if self._current:
+            await self._current.close()
+            self._current = None
+
+        if self._next_source:
+            self._next_source.cancel()
+            with suppress(Exception, asyncio.CancelledError):
+                await (await self._next_source).close()
+            self._next_source = None
+
+    async def readframes(self, nframes: int) -> bytes:
+        """Read number of frames and advance in stream."""
+        frame_size = self._sample_size * self._channels
+        total_bytes = nframes * frame_size
+        data = b""
+
+        while self._current is not None:
+            data += await self._current.readframes(
+                (total_bytes - len(data)) // frame_size
+            )
+            if len(data) >= total_bytes:
+                break
 
+            # Current source has ended, continue with next one (if any)
+            self._previous_underruns += self._current.underruns
+            await self._current.close()
+            self._current = None
+            if self._next_source:
+                next_source, self._next_source = self._next_source, None
+                self._current = await next_source
+                self._prefetch_next()
 
-async def open_source(
-    source: Union[str, io.BufferedReader],
+        return data
+
+    def _prefetch_next(self) -> None:
+        if self._pending:
+            _LOGGER.debug("Opening next source in playlist")
+            self._next_source = asyncio.ensure_future(
+                open_source(
+                    self._pending.pop(0),
+                    self._sample_rate,
+                    self._channels,
+                    self._sample_size,
+                    self._cache,
+                    self._session,
+                    self._prebuffer_time,
+                    self._low_watermark_time,
+                )
+            )
+
+    @property
+    def sample_rate(self) -> int:
+        """Return sample rate."""
+        return self._sample_rate
+
+    @property
+    def channels(self) -> int:
+        """Return number of audio channels."""
+        return self._channels
+
+    @property
+    def sample_size(self) -> int:
+        """Return number of bytes per sample."""
+        return self._sample_size
+
+    @property
+    def duration(self) -> int:
+        """Return duration in seconds (of sources with known duration)."""
+        return round(sum(self._durations))
+
+    @property
+    def underruns(self) -> int:
+        """Return number of times source ran out of data during playback."""
+        current_underruns = self._current.underruns if self._current else 0
+        return self._previous_underruns + current_underruns
+
+
+def is_url(source: Union[str, io.BufferedReader]) -> bool:
+    """Return if a source is a HTTP(S) URL."""
+    return isinstance(source, str) and source.startswith(("http://", "https://"))
+
+
+async def open_source(  # pylint: disable=too-many-arguments
+    source: Union[str, io.BufferedReader, Sequence[Union[str, io.BufferedReader]]],
     sample_rate: int,
     channels: int,
     sample_size: int,
+    cache: Optional[AudioFileCache] = None,
+    session: Optional[ClientSession] = None,
+    prebuffer_time: float = BufferedReaderSource.PREBUFFER_TIME,
+    low_watermark_time: float = BufferedReaderSource.LOW_WATERMARK_TIME,
 ) -> AudioSource:
-    """Create an AudioSource from given input source."""
+    """Create an AudioSource from given input source.
+
+    If a list (or tuple) of input sources is given, they are played after each other.
+    Files are decoded via the cache, if provided. URLs are downloaded using session.
+    Buffering of streamed sources (URLs and buffers) is controlled by prebuffer_time
+    and low_watermark_time, see BufferedReaderSource.
+    """
+    if isinstance(source, (list, tuple)):
+        return await PlaylistSource.open(
+            source,
+            sample_rate,
+            channels,
+            sample_size,
+            cache,
+            session,
+            prebuffer_time,
+            low_watermark_time,
+        )
+    if isinstance(source, str) and is_url(source):
+        if session is None:
+            raise NotSupportedError("a client session is needed to stream from URL")
+        return await HttpSource.open(
+            source,
+            session,
+            sample_rate,
+            channels,
+            sample_size,
+            prebuffer_time=prebuffer_time,
+            low_watermark_time=low_watermark_time,
+        )
+    if isinstance(source, str) and cache:
+        return await cache.open(source, sample_rate, channels, sample_size)
     if isinstance(source, str):
         return await FileSource.open(source, sample_rate, channels, sample_size)
-    return await BufferedReaderSource.open(source, sample_rate, channels, sample_size)
+    return await BufferedReaderSource.open(
+        cast(io.BufferedReader, source),
+        sample_rate,
+        channels,
+        sample_size,
+        prebuffer_time=prebuffer_time,
+        low_watermark_time=low_watermark_time,
+    )
@@ -0,0 +1,122 @@
+"""Buffered (AirPlay 2 style) audio transport over TCP.
+
+Receivers supporting buffered audio accept audio packets over a TCP connection and
+buffer several seconds of audio. This allows audio to be sent ahead of time in
+bursts, instead of pacing every packet in real time. Each packet is prefixed with
+its length (two bytes, big endian, including the length itself) and the audio
+payload is encrypted with ChaCha20-Poly1305 using a key shared with the receiver
+during SETUP. The RTP header is left unencrypted (parts of it are used as
+additional authenticated data) and the authentication tag and nonce are appended
+to the packet.
+"""
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from pyatv.support.chacha20 import Chacha20Cipher
+
+_LOGGER = logging.getLogger(__name__)
+
+# Stream type used in SETUP for buffered audio
+BUFFERED_STREAM_TYPE = 103
+
+# Size of key used to encrypt audio
+SHARED_KEY_LENGTH = 32
+
+# Size of RTP header
+RTP_HEADER_SIZE = 12
+
+# Size of nonce appended to packets
+NONCE_SIZE = 8
+
+
+def generate_shared_key() -> bytes:
+    """Return a new random key used to encrypt audio."""
+    return os.urandom(SHARED_KEY_LENGTH)
+
+
+def encode_packet(cipher: Chacha20Cipher, packet: bytes, nonce: int) -> bytes:
+    """Encrypt and frame an audio packet for sending to a receiver."""
+    nonce_bytes = nonce.to_bytes(NONCE_SIZE, byteorder="little")
+    encrypted = cipher.encrypt(
+        packet[RTP_HEADER_SIZE:], nounce=nonce_bytes, aad=packet[4:RTP_HEADER_SIZE]
+    )
+    length = 2 + RTP_HEADER_SIZE + len(encrypted) + NONCE_SIZE
+    return b"".join(
+        [
+            length.to_bytes(2, byteorder="big"),
+            packet[0:RTP_HEADER_SIZE],
+            encrypted,
+            nonce_bytes,
+        ]
+    )
+
+
+def decode_packet(cipher: Chacha20Cipher, frame: bytes) -> bytes:
+    """Decrypt a framed audio packet (without length) and return RTP packet."""
+    header = frame[0:RTP_HEADER_SIZE]
+    return header + cipher.decrypt(
+        frame[RTP_HEADER_SIZE:-NONCE_SIZE],
+        nounce=frame[-NONCE_SIZE:],
+        aad=header[4:],
+    )
+
+
+class BufferedAudioProtocol(asyncio.Protocol):
+    """Send audio packets to a receiver buffering audio."""
+
+    def __init__(self, shared_key: bytes) -> None:
+        """Initialize a new BufferedAudioProtocol instance."""
+        self.transport: Optional[asyncio.Transport] = None
+        self._cipher: Chacha20Cipher = Chacha20Cipher(shared_key, shared_key)
+        self._nonce: int = 0
+        self._can_write: asyncio.Event = asyncio.Event()
+        self._can_write.set()
+
+    @property
+    def is_closing(self) -> bool:
+        """Return if connection is closed or being closed."""
+        return self.transport is None or self.transport.is_closing()
+
+    def send(self, packet: bytes) -> None:
+        """Encrypt and send an audio packet."""
+        if self.transport is None:
+            raise RuntimeError("not connected")
+
+        self.transport.write(encode_packet(self._cipher, packet, self._nonce))
+        self._nonce += 1
+
+    async def drain(self) -> None:
+        """Wait until receiver is ready to receive more data."""
+        await self._can_write.wait()
+
+    def close(self) -> None:
+        """Close connection to receiver."""
+        if self.transport:
+            self.transport.close()
+            self.transport = None
+
+    def connection_made(self, transport) -> None:
+        """Handle that connection succeeded."""
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        """Handle incoming data.
+
+        No data should ever be seen here.
+        """
+
+    def pause_writing(self) -> None:
+        """Handle that write buffer is full."""
+        self._can_write.clear()
+
+    def resume_writing(self) -> None:
+        """Handle that write buffer has been drained."""
+        self._can_write.set()
+
+    def connection_lost(self, exc) -> None:
+        """Handle that connection was lost."""
+        _LOGGER.debug("Buffered audio connection lost (%s)", exc)
+        self.transport = None
+        self._can_write.set()
@@ -1,10 +1,14 @@
-"""Simple FIFO for packets based on dict.
+"""Simple FIFO for packets based on a ring buffer.
 
-This FIFO holds a certain number of elements as defined by upper_limit. Each item maps a
-sequence number to a packet, allowing fast look up of a certain packet. The order is
-defined by insertion order and *not* sequence number order.
+This FIFO holds a certain number of elements as defined by upper_limit (rounded up to
+the nearest power of two). Each item maps a sequence number to a packet, allowing fast
+look up of a certain packet. Items are stored in pre-allocated slots indexed by the
+sequence number modulo the capacity. As capacity is a power of two, sequence numbers
+wrapping around at 2^16 map to consecutive slots as well.
 
-When upper limit is exceeded, the item that was *inserted* last, is removed.
+When upper limit is exceeded, the item stored in the slot of the new item is removed.
+For consecutive sequence numbers, that is the oldest item. Both insertion and removal
+are O(1).
 
 Example:
 fifo = PacketFifo(2)
@@ -13,41 +17,93 @@ fifo[2] = 456
 print(fifo[1], fifo[2])
 """
 
-from typing import Dict, Iterator, MutableMapping, TypeVar
+from typing import Iterator, List, MutableMapping, Optional, Tuple, TypeVar
 
 T = TypeVar("T")
 
+# Sequence numbers used by RTP are 16 bits
+SEQNO_MODULO = 2 ** 16
+
+_EMPTY_SLOT = -1
+
+
+def _capacity(upper_limit: int) -> int:
+    capacity = 1
+    while capacity < upper_limit:
+        capacity <<= 1
+    return capacity
+
 
 class PacketFifo(MutableMapping[int, T]):  # pylint: disable=too-many-ancestors
     """Implementation of simple packet FIFO."""
 
-    _items: Dict[int, T]
+    _indices: List[int]
+    _items: List[Optional[T]]
 
     def __init__(self, upper_limit: int) -> None:
         """Initialize a new PacketFifo instance."""
-        self._items = {}
-        self._upper_limit = upper_limit
+        self._capacity = _capacity(upper_limit)
+        self._mask = self._capacity - 1
+        self._indices = self._capacity * [_EMPTY_SLOT]
+        self._items = [None for _ in range(self._capacity)]
+        self._empty_indices = self._capacity * [_EMPTY_SLOT]
+        self._empty_items: List[Optional[T]] = list(self._items)
+        self._head = self._mask  # Slot of most recently inserted item
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        """Return maximum number of items in FIFO."""
+        return self._capacity
 
     def clear(self):
         """Remove all items in FIFO."""
-        self._items.clear()
+        self._indices[:] = self._empty_indices
+        self._items[:] = self._empty_items
+        self._head = self._mask
+        self._size = 0
+
+    def get_range(self, start: int, count: int) -> Iterator[Tuple[int, Optional[T]]]:
+        """Iterate over a range of consecutive sequence numbers.
+
+        Sequence numbers wrap around at 2^16. Each item is a tuple of sequence number
+        and value, where value is None if the item is not in the FIFO.
+        """
+        indices = self._indices
+        items = self._items
+        mask = self._mask
+        for i in range(count):
+            index = (start + i) % SEQNO_MODULO
+            slot = index & mask
+            if indices[slot] == index:
+                yield index, items[slot]
+            else:
+                yield index, None
 
     def __len__(self) -> int:
         """Return number of items in FIFO."""
-        return len(self._items)
+        return self._size
 
     def __setitem__(self, index: int, value: T):
         """Add an items to FIFO."""
         if isinstance(index, int):
+            if index < 0:
+                raise ValueError("negative index not supported")
+
+            slot = index & self._mask
+            existing = self._indices[slot]
+
             # Cannot add item with same index again
-            if index in self._items:
+            if existing == index:
                 raise ValueError(f"{index} already in FIFO")
 
-            # Remove oldest item if limit is exceeded
-            if len(self) + 1 > self._upper_limit:
-                del self._items[list(self._items.keys())[0]]
+            # Item in the same slot is replaced (removed) if there is one
+            if existing == _EMPTY_SLOT:
+                self._size += 1
 
-            self._items[index] = value
+            self._indices[slot] = index
+            self._items[slot] = value
+            self._head = slot
         else:
             raise TypeError("only int supported as key")
 
@@ -56,26 +112,34 @@ class PacketFifo(MutableMapping[int, T]):  # pylint: disable=too-many-ancestors
         raise NotImplementedError("removing items not supported")
 
     def __iter__(self) -> Iterator[int]:
-        """Iterate over indices in FIFO."""
-        return self._items.__iter__()
+        """Iterate over indices in FIFO (oldest slot first)."""
+        for i in range(1, self._capacity + 1):
+            index = self._indices[(self._head + i) & self._mask]
+            if index != _EMPTY_SLOT:
+                yield index
 
     def __getitem__(self, index: int) -> T:
         """Return value of an item."""
         if isinstance(index, int):
-            return self._items[index]
+            slot = index & self._mask
+            if index < 0 or self._indices[slot] != index:
+                raise KeyError(index)
+            return self._items[slot]  # type: ignore
         raise TypeError("only int supported as key")
 
     def __contains__(self, index: object) -> bool:
         """Return if an element exists in FIFO."""
-        return index in self._items
+        if not isinstance(index, int) or index < 0:
+            return False
+        return self._indices[index & self._mask] == index
 
     def __str__(self) -> str:
         """Return string representation of FIFO.
 
         Only index numbers are returned in the string.
         """
-        return str(list(self._items.keys()))
+        return str(list(self))
 
     def __repr__(self) -> str:
         """Return internal representation as string of FIFO."""
-        return repr(self._items)
+        return repr({index: self[index] for index in self})
@@ -0,0 +1,144 @@
+"""Adapt RAOP latency and catch-up behaviour to network conditions.
+
+A receiver buffers audio for as long as the announced latency before playing it,
+which gives time to request retransmission of lost packets. On a good link (e.g.
+wired) most of that time is wasted, while on a lossy link it might not be enough.
+The controller implemented here tracks how many packets the receiver asks to be
+retransmitted and how often the sender falls behind, and adjusts latency (for the
+next stream, as latency cannot change while streaming) and the number of packets
+sent in a burst to catch up when being late.
+"""
+import logging
+from typing import Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Latency used by default (seconds)
+DEFAULT_LATENCY = 1.5
+
+# Latency is changed by this many seconds at a time
+LATENCY_STEP = 0.25
+
+# Retransmit rate (retransmitted/sent packets) over which latency is increased
+HIGH_RETRANSMIT_RATE = 0.01
+
+# Retransmit rate under which latency is decreased
+LOW_RETRANSMIT_RATE = 0.001
+
+# Bounds for number of packets sent at once to catch up when being late
+MIN_PACKETS_COMPENSATE = 1
+MAX_PACKETS_COMPENSATE = 8
+
+# Number of packets sent to catch up when nothing is known about the link
+DEFAULT_PACKETS_COMPENSATE = 3
+
+
+class LatencyController:
+    """Adapt latency and catch-up behaviour for a receiver."""
+
+    def __init__(
+        self,
+        min_latency: Optional[float] = None,
+        max_latency: Optional[float] = None,
+    ) -> None:
+        """Initialize a new LatencyController instance."""
+        self.min_latency: float = DEFAULT_LATENCY
+        self.max_latency: float = DEFAULT_LATENCY
+        self.latency: float = DEFAULT_LATENCY
+        self.max_packets_compensate: int = DEFAULT_PACKETS_COMPENSATE
+        self.set_bounds(min_latency, max_latency)
+        self._sent: int = 0
+        self._retransmits: int = 0
+        self._late: int = 0
+        self._interval_sent: int = 0
+        self._interval_retransmits: int = 0
+        self._interval_late: int = 0
+
+    def set_bounds(
+        self, min_latency: Optional[float] = None, max_latency: Optional[float] = None
+    ) -> None:
+        """Change bounds (in seconds) that latency must stay within.
+
+        A bound that is not given defaults to DEFAULT_LATENCY, but is moved to the
+        other bound if the default is on the wrong side of it.
+        """
+        if min_latency is None:
+            min_latency = DEFAULT_LATENCY
+            if max_latency is not None:
+                min_latency = min(min_latency, max_latency)
+        if max_latency is None:
+            max_latency = max(DEFAULT_LATENCY, min_latency)
+
+        if min_latency <= 0.0 or min_latency > max_latency:
+            raise ValueError(f"invalid latency bounds: {min_latency}-{max_latency}")
+
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.latency = min(max(self.latency, min_latency), max_latency)
+
+    def packet_sent(self) -> None:
+        """Register that an audio packet was sent."""
+        self._interval_sent += 1
+
+    def retransmit_requested(self, packets: int) -> None:
+        """Register that receiver requested packets to be retransmitted."""
+        self._interval_retransmits += packets
+
+    def late(self, packets: int = 1) -> None:
+        """Register that sender fell behind and had to catch up."""
+        self._interval_late += packets
+
+    def interval_completed(self) -> None:
+        """Adjust catch-up behaviour based on what happened since last interval.
+
+        Sending a burst of packets on a lossy link is likely to make things worse, so
+        fewer packets are sent at once when receiver requests retransmissions. If
+        sender keeps falling behind on a good link, more packets are sent instead.
+        """
+        rate = self._retransmit_rate(self._interval_retransmits, self._interval_sent)
+        if rate > HIGH_RETRANSMIT_RATE:
+            self.max_packets_compensate = max(
+                self.max_packets_compensate - 1, MIN_PACKETS_COMPENSATE
+            )
+        elif self._interval_late > 0 and rate < LOW_RETRANSMIT_RATE:
+            self.max_packets_compensate = min(
+                self.max_packets_compensate + 1, MAX_PACKETS_COMPENSATE
+            )
+
+        self._sent += self._interval_sent
+        self._retransmits += self._interval_retransmits
+        self._late += self._interval_late
+        self._interval_sent = 0
+        self._interval_retransmits = 0
+        self._interval_late = 0
+
+    def stream_finished(self) -> None:
+        """Adjust latency used for next stream based on current stream."""
+        self.interval_completed()
+
+        rate = self._retransmit_rate(self._retransmits, self._sent)
+        if rate > HIGH_RETRANSMIT_RATE:
+            latency = min(self.latency + LATENCY_STEP, self.max_latency)
+        elif rate < LOW_RETRANSMIT_RATE and self._late == 0 and self._sent > 0:
+            latency = max(self.latency - LATENCY_STEP, self.min_latency)
+        else:
+            latency = self.latency
+
+        if latency != self.latency:
+            _LOGGER.debug(
+                "Changing latency from %fs to %fs (retransmit rate: %f)",
+                self.latency,
+                latency,
+                rate,
+            )
+            self.latency = latency
+
+        self._sent = 0
+        self._retransmits = 0
+        self._late = 0
+
+    @staticmethod
+    def _retransmit_rate(retransmits: int, sent: int) -> float:
+        if sent == 0:
+            return 0.0
+        return retransmits / sent
@@ -0,0 +1,109 @@
+"""Metrics for RAOP streams.
+
+Counters are plain integers updated while streaming, so they are cheap enough to
+always be enabled. A listener can subscribe to updates, which are delivered about
+once a second while streaming and when a stream has finished.
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import List, Sequence
+
+from pyatv.protocols.raop.pacer import LATE_THRESHOLD
+from pyatv.support.state_producer import StateProducer
+
+# Upper bounds (exclusive, in seconds) of slack histogram buckets. Negative slack
+# means that a packet was sent after its deadline.
+SLACK_BUCKETS = (-0.050, -0.020, -0.010, -0.005, -0.002, 0.0, 0.002, 0.005, 0.010)
+
+
+class SlackHistogram:
+    """Histogram of how long before its deadline a packet was sent.
+
+    Bucket i counts slack values in [buckets[i - 1], buckets[i]). The first bucket
+    counts everything below buckets[0] and the last bucket everything from
+    buckets[-1] and above, so there is one more count than there are buckets.
+    """
+
+    def __init__(self, buckets: Sequence[float] = SLACK_BUCKETS) -> None:
+        """Initialize a new SlackHistogram instance."""
+        self.buckets: Sequence[float] = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+
+    def add(self, slack: float) -> None:
+        """Add a slack value (in seconds)."""
+        self.counts[bisect_right(self.buckets, slack)] += 1
+
+    def reset(self) -> None:
+        """Reset all counts to zero."""
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def __repr__(self) -> str:
+        """Return string representation of histogram."""
+        bounds = [f"<{bound}" for bound in self.buckets] + [f">={self.buckets[-1]}"]
+        buckets = ", ".join(f"{b}: {c}" for b, c in zip(bounds, self.counts))
+        return f"SlackHistogram({buckets})"
+
+
+class RaopMetricsListener(ABC):
+    """Listener interface for RAOP stream metrics."""
+
+    @abstractmethod
+    def metrics_updated(self, metrics: "RaopMetrics") -> None:
+        """Inform about updated metrics."""
+
+
+class RaopMetrics(StateProducer[RaopMetricsListener]):
+    """Metrics for a RAOP stream.
+
+    Metrics are reset when a new stream starts.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a new RaopMetrics instance."""
+        super().__init__()
+        self.packets_sent: int = 0
+        self.frames_sent: int = 0
+        self.late_packets: int = 0
+        self.padding_packets: int = 0
+        self.retransmit_requests: int = 0
+        self.retransmitted_packets: int = 0
+        self.backlog_misses: int = 0
+        self.underruns: int = 0
+        self.slack: SlackHistogram = SlackHistogram()
+
+    def reset(self) -> None:
+        """Reset all metrics."""
+        self.packets_sent = 0
+        self.frames_sent = 0
+        self.late_packets = 0
+        self.padding_packets = 0
+        self.retransmit_requests = 0
+        self.retransmitted_packets = 0
+        self.backlog_misses = 0
+        self.underruns = 0
+        self.slack.reset()
+
+    def packet_sent(self, slack: float) -> None:
+        """Register that an audio packet was sent slack seconds before deadline."""
+        self.packets_sent += 1
+        self.slack.add(slack)
+        if slack < -LATE_THRESHOLD:
+            self.late_packets += 1
+
+    def notify(self) -> None:
+        """Inform listener about current metrics."""
+        self.listener.metrics_updated(self)
+
+    def __repr__(self) -> str:
+        """Return string representation of metrics."""
+        return (
+            f"RaopMetrics(packets_sent={self.packets_sent}, "
+            f"frames_sent={self.frames_sent}, "
+            f"late_packets={self.late_packets}, "
+            f"padding_packets={self.padding_packets}, "
+            f"retransmit_requests={self.retransmit_requests}, "
+            f"retransmitted_packets={self.retransmitted_packets}, "
+            f"backlog_misses={self.backlog_misses}, "
+            f"underruns={self.underruns}, "
+            f"slack={self.slack})"
+        )
@@ -0,0 +1,207 @@
+"""Send audio packets at precise points in time from a dedicated thread.
+
+Pacing audio packets from the event loop (sleeping between packets) makes timing
+accuracy depend on what else is running in the loop. The pacer implemented here runs
+in a separate thread and sends packets according to a fixed schedule based on a
+monotonic clock: packet n is due at start + n * packet duration. The thread sleeps
+until shortly before a packet is due and busy-waits the remaining time (yielding to
+other threads meanwhile). As the Python versions supported by pyatv lack timerfd
+support, sleeping is used instead.
+
+Packets are queued from asyncio code and the pacer holds at most max_queued entries,
+making it possible to keep sending audio even if the event loop stalls for a while.
+"""
+import asyncio
+import logging
+from queue import Queue
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sleep until this many seconds before a packet is due, then busy-wait
+BUSY_WAIT_THRESHOLD = 0.001
+
+# A packet sent later than this (in seconds) after it was due is considered late
+LATE_THRESHOLD = 0.002
+
+# Address (ip, port) and packet data
+Datagram = Tuple[Tuple[str, int], bytes]
+
+
+class PacingStatistics(NamedTuple):
+    """Statistics of how accurate packets have been sent (times in seconds)."""
+
+    packets_sent: int
+    late_packets: int
+    average_jitter: float
+    max_jitter: float
+
+
+class _QueueEntry(NamedTuple):
+    datagrams: Sequence[Datagram]
+    on_sent: Optional[Callable[[], None]]
+
+
+class PacketPacer:
+    """Send queued datagrams at a fixed rate from a dedicated thread."""
+
+    def __init__(self, packet_duration: float, max_queued: int = 16) -> None:
+        """Initialize a new PacketPacer instance."""
+        self.loop = asyncio.get_event_loop()
+        self.packet_duration = packet_duration
+        self.max_queued = max_queued
+        self._queue: "Queue[Optional[_QueueEntry]]" = Queue()
+        self._sockets: Dict[int, socket.socket] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: threading.Event = threading.Event()
+        self._space_waiter: Optional[asyncio.Future] = None
+        self._drained_waiter: Optional[asyncio.Future] = None
+        self._packets_sent: int = 0
+        self._late_packets: int = 0
+        self._total_jitter: float = 0.0
+        self._max_jitter: float = 0.0
+
+    @property
+    def statistics(self) -> PacingStatistics:
+        """Return current pacing statistics."""
+        packets_sent = self._packets_sent
+        return PacingStatistics(
+            packets_sent,
+            self._late_packets,
+            self._total_jitter / packets_sent if packets_sent else 0.0,
+            self._max_jitter,
+        )
+
+    @property
+    def queued(self) -> int:
+        """Return number of entries waiting to be sent."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start pacer thread."""
+        if self._thread:
+            raise RuntimeError("already running")
+
+        self._thread = threading.Thread(
+            target=self._pacing_loop, name="pyatv-packet-pacer", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop pacer thread, discarding packets not yet sent."""
+        if self._thread:
+            self._stopped.set()
+            self._queue.put(None)
+            await self.loop.run_in_executor(None, self._thread.join)
+            self._thread = None
+
+        for sock in self._sockets.values():
+            sock.close()
+        self._sockets.clear()
+
+    def put(
+        self,
+        datagrams: Sequence[Datagram],
+        on_sent: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Queue datagrams to be sent when the next packet is due.
+
+        If on_sent is provided, it is called from the pacer thread after the datagrams
+        have been sent.
+        """
+        self._queue.put(_QueueEntry(datagrams, on_sent))
+
+    async def wait_for_space(self) -> None:
+        """Wait until pacer is ready to accept more packets."""
+        self._space_waiter = self.loop.create_future()
+        try:
+            # Pacer thread might have sent packets before waiter was set
+            if self._queue.qsize() >= self.max_queued:
+                await self._space_waiter
+        finally:
+            self._space_waiter = None
+
+    async def drain(self) -> None:
+        """Wait until all queued packets have been sent."""
+        self._drained_waiter = self.loop.create_future()
+        try:
+            if self._queue.unfinished_tasks > 0:
+                await self._drained_waiter
+        finally:
+            self._drained_waiter = None
+
+    def _pacing_loop(self) -> None:
+        _LOGGER.debug("Starting packet pacer thread")
+        start_time: Optional[float] = None
+        index = 0
+
+        while True:
+            entry = self._queue.get()
+            if entry is None or self._stopped.is_set():
+                break
+
+            due_time = time.perf_counter()
+            if start_time is None:
+                start_time = due_time
+            else:
+                due_time = start_time + index * self.packet_duration
+                if not self._wait_until(due_time):
+                    break
+
+            self._send(entry.datagrams)
+            if entry.on_sent:
+                entry.on_sent()
+            self._update_statistics(time.perf_counter() - due_time)
+            index += 1
+
+            self._queue.task_done()
+            self._notify()
+
+        _LOGGER.debug("Packet pacer thread stopped")
+
+    def _wait_until(self, due_time: float) -> bool:
+        """Wait until due time and return False if pacer was stopped meanwhile."""
+        remaining = due_time - time.perf_counter()
+        if remaining > BUSY_WAIT_THRESHOLD:
+            if self._stopped.wait(remaining - BUSY_WAIT_THRESHOLD):
+                return False
+        while time.perf_counter() < due_time:
+            time.sleep(0)  # Release GIL while waiting
+        return True
+
+    def _send(self, datagrams: Sequence[Datagram]) -> None:
+        for address, data in datagrams:
+            family = socket.AF_INET6 if ":" in address[0] else socket.AF_INET
+            sock = self._sockets.get(family)
+            if sock is None:
+                sock = socket.socket(family, socket.SOCK_DGRAM)
+                self._sockets[family] = sock
+
+            try:
+                sock.sendto(data, address)
+            except OSError as ex:
+                _LOGGER.debug("Failed to send packet to %s: %s", address, ex)
+
+    def _update_statistics(self, jitter: float) -> None:
+        self._packets_sent += 1
+        self._total_jitter += jitter
+        self._max_jitter = max(self._max_jitter, jitter)
+        if jitter > LATE_THRESHOLD:
+            self._late_packets += 1
+
+    def _notify(self) -> None:
+        waiters: List[asyncio.Future] = []
+        if self._space_waiter and self._queue.qsize() < self.max_queued:
+            waiters.append(self._space_waiter)
+        if self._drained_waiter and self._queue.unfinished_tasks == 0:
+            waiters.append(self._drained_waiter)
+        for waiter in waiters:
+            self.loop.call_soon_threadsafe(self._wake_up, waiter)
+
+    @staticmethod
+    def _wake_up(waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            waiter.set_result(None)
@@ -1,20 +1,30 @@
 """Support for RAOP (AirPlay v1)."""
 from abc import ABC, abstractmethod
 import asyncio
+from functools import partial
 import logging
+import plistlib
 from random import randrange
 from time import perf_counter
 from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple, cast
 import weakref
 
-from bitarray import bitarray
-
 from pyatv import exceptions
 from pyatv.auth.hap_pairing import HapCredentials
 from pyatv.protocols.airplay.auth import pair_verify
+from pyatv.protocols.airplay.utils import AirPlayFlags, parse_features
 from pyatv.protocols.raop import timing
+from pyatv.protocols.raop.alac import AlacEncoder, UncompressedAlacEncoder
 from pyatv.protocols.raop.audio_source import AudioSource
+from pyatv.protocols.raop.buffered import (
+    BUFFERED_STREAM_TYPE,
+    BufferedAudioProtocol,
+    generate_shared_key,
+)
 from pyatv.protocols.raop.fifo import PacketFifo
+from pyatv.protocols.raop.latency import LatencyController
+from pyatv.protocols.raop.metrics import RaopMetrics
+from pyatv.protocols.raop.pacer import PacketPacer
 from pyatv.protocols.raop.packets import (
     AudioPacketHeader,
     RetransmitReqeust,
@@ -34,14 +44,23 @@ from pyatv.support.rtsp import FRAMES_PER_PACKET, RtspSession
 
 _LOGGER = logging.getLogger(__name__)
 
-# When being late, compensate by sending at most these many packets to catch up
-MAX_PACKETS_COMPENSATE = 3
-
 # We should store this many packets in case retransmission is requested
 PACKET_BACKLOG_SIZE = 1000
 
 KEEP_ALIVE_INTERVAL = 25  # Seconds
 
+# Interval between timing requests used to measure receiver clock
+TIMING_REQUEST_INTERVAL = 2.0  # Seconds
+
+# Clock drift larger than this is considered a measurement error and not compensated
+MAX_CLOCK_DRIFT = 0.0005  # 500 ppm
+
+# Receivers buffering audio are sent audio up to this far ahead of playback
+BUFFERED_AHEAD_TIME = 4.0  # Seconds
+
+# More audio is sent to receivers buffering audio when less than this is buffered
+BUFFERED_REFILL_TIME = 3.0  # Seconds
+
 # Metadata used when no metadata is present
 MISSING_METADATA = AudioMetadata(
     title="Streaming with pyatv", artist="pyatv", album="RAOP", duration=0.0
@@ -64,6 +83,9 @@ class RaopContext:
         self.start_ts = 0
         self.head_ts = 0
         self.padding_sent: int = 0
+        self.clock_rate: float = 1.0
+        self._rate_anchor_ts: int = 0
+        self._rate_anchor_time: float = 0.0
 
         self.server_port: int = 0
         self.control_port: int = 0
@@ -72,16 +94,57 @@ class RaopContext:
 
         self.volume: Optional[float] = None
 
-    def reset(self) -> None:
+    def reset(
+        self, start_ts: Optional[int] = None, latency: Optional[int] = None
+    ) -> None:
         """Reset seasion.
 
-        Must be done when sample rate changes.
+        Must be done when sample rate changes. A start timestamp can be provided to
+        share timing reference with other sessions, otherwise current time is used.
+        Latency is specified in number of frames.
         """
         self.rtpseq = randrange(2 ** 16)
-        self.start_ts = timing.ntp2ts(timing.ntp_now(), self.sample_rate)
+        self.start_ts = (
+            start_ts
+            if start_ts is not None
+            else timing.ntp2ts(timing.ntp_now(), self.sample_rate)
+        )
         self.head_ts = self.start_ts
-        self.latency = 22050 + self.sample_rate
+        self.latency = latency if latency is not None else 22050 + self.sample_rate
         self.padding_sent = 0
+        self.clock_rate = 1.0
+        self._rate_anchor_ts = self.start_ts
+        self._rate_anchor_time = 0.0
+
+    def set_clock_rate(self, rate: float) -> None:
+        """Change rate at which receiver plays audio relative to local clock.
+
+        A rate of 1.001 means that receiver plays 1.001 seconds of audio per second
+        (local clock). New rate applies from current head position.
+        """
+        self._rate_anchor_time = self.stream_time(self.head_ts)
+        self._rate_anchor_ts = self.head_ts
+        self.clock_rate = rate
+
+    def stream_time(self, timestamp: int) -> float:
+        """Return time (seconds since start, local clock) when timestamp is played."""
+        return self._rate_anchor_time + (timestamp - self._rate_anchor_ts) / (
+            self.sample_rate * self.clock_rate
+        )
+
+    def timestamp_at(self, stream_time: float) -> int:
+        """Return timestamp played at a time (seconds since start, local clock)."""
+        return self._rate_anchor_ts + int(
+            (stream_time - self._rate_anchor_time) * self.sample_rate * self.clock_rate
+        )
+
+    @property
+    def head_ntp(self) -> int:
+        """Local time (NTP) when audio at current position is played."""
+        return timing.ts2ntp(
+            self.start_ts + round(self.stream_time(self.head_ts) * self.sample_rate),
+            self.sample_rate,
+        )
 
     @property
     def rtptime(self) -> int:
@@ -115,11 +178,19 @@ class PlaybackInfo(NamedTuple):
 class ControlClient(asyncio.Protocol):
     """Control client responsible for e.g. sync packets."""
 
-    def __init__(self, context: RaopContext, packet_backlog: PacketFifo):
+    def __init__(
+        self,
+        context: RaopContext,
+        packet_backlog: PacketFifo,
+        latency_controller: LatencyController,
+        metrics: RaopMetrics,
+    ):
         """Initialize a new ControlClient."""
         self.transport = None
         self.context = context
         self.packet_backlog = packet_backlog
+        self.latency_controller = latency_controller
+        self.metrics = metrics
         self.task: Optional[asyncio.Future] = None
 
     def close(self):
@@ -156,7 +227,7 @@ class ControlClient(asyncio.Protocol):
             raise RuntimeError("socket not connected")
 
         first_packet = True
-        current_time = timing.ts2ntp(self.context.head_ts, self.context.sample_rate)
+        current_time = self.context.head_ntp
         while True:
             current_sec, current_frac = timing.ntp2parts(current_time)
             packet = SyncPacket.encode(
@@ -182,7 +253,7 @@ class ControlClient(asyncio.Protocol):
             self.transport.sendto(packet, dest)
 
             await asyncio.sleep(1.0)  # Very low granularity here
-            current_time = timing.ts2ntp(self.context.head_ts, self.context.sample_rate)
+            current_time = self.context.head_ntp
 
     def stop(self):
         """Stop control client."""
@@ -205,11 +276,13 @@ class ControlClient(asyncio.Protocol):
 
     def _retransmit_lost_packets(self, request, addr):
         _LOGGER.debug("%s from %s", request, addr)
+        self.latency_controller.retransmit_requested(request.lost_packets)
+        self.metrics.retransmit_requests += 1
 
-        for i in range(request.lost_packets):
-            if request.lost_seqno + i in self.packet_backlog:
-                packet = self.packet_backlog[request.lost_seqno + i]
-
+        for seqno, packet in self.packet_backlog.get_range(
+            request.lost_seqno, request.lost_packets
+        ):
+            if packet is not None:
                 # Very "low level" here just because it's simple and avoids
                 # unnecessary conversions
                 original_seqno = packet[2:4]
@@ -217,8 +290,10 @@ class ControlClient(asyncio.Protocol):
 
                 if self.transport:
                     self.transport.sendto(resp, addr)
+                    self.metrics.retransmitted_packets += 1
             else:
-                _LOGGER.debug("Packet %d not in backlog", request.lost_seqno + 1)
+                _LOGGER.debug("Packet %d not in backlog", seqno)
+                self.metrics.backlog_misses += 1
 
     @staticmethod
     def error_received(exc):
@@ -234,18 +309,56 @@ class ControlClient(asyncio.Protocol):
 
 
 class TimingClient(asyncio.Protocol):
-    """Basic timing client responding to timing requests."""
+    """Timing client responding to timing requests and measuring receiver clock.
 
-    def __init__(self):
+    While started, timing requests are sent periodically to the receiver and the
+    responses are used to estimate offset and drift of the receiver clock.
+    """
+
+    def __init__(self, estimator: timing.ClockEstimator):
         """Initialize a new TimingClient."""
         self.transport = None
+        self.estimator = estimator
+        self.task: Optional[asyncio.Future] = None
 
     def close(self):
         """Close timing client."""
+        self.stop()
         if self.transport:
             self.transport.close()
             self.transport = None
 
+    def start(self, addr: str, port: int) -> None:
+        """Start sending periodic timing requests to receiver."""
+
+        async def _timing_handler():
+            try:
+                await self._timing_task((addr, port))
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                _LOGGER.exception("timing task failure")
+
+        if self.task:
+            raise RuntimeError("already running")
+
+        self.task = asyncio.ensure_future(_timing_handler())
+
+    def stop(self) -> None:
+        """Stop sending timing requests."""
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def _timing_task(self, dest: Tuple[str, int]) -> None:
+        while self.transport:
+            sendtime_sec, sendtime_frac = timing.ntp2parts(timing.ntp_now())
+            request = TimingPacket.encode(
+                0x80, 0x52 | 0x80, 7, 0, 0, 0, 0, 0, sendtime_sec, sendtime_frac
+            )
+            self.transport.sendto(request, dest)
+            await asyncio.sleep(TIMING_REQUEST_INTERVAL)
+
     @property
     def port(self):
         """Port this client listens to."""
@@ -256,9 +369,15 @@ class TimingClient(asyncio.Protocol):
         self.transport = transport
 
     def datagram_received(self, data, addr):
-        """Handle incoming timing requests."""
+        """Handle incoming timing requests and responses."""
+        now = timing.ntp_now()
+        actual_type = data[1] & 0x7F  # Remove marker bit
+        if actual_type == 0x53:
+            self._handle_response(TimingPacket.decode(data), now)
+            return
+
         req = TimingPacket.decode(data)
-        recvtime_sec, recvtime_frac = timing.ntp2parts(timing.ntp_now())
+        recvtime_sec, recvtime_frac = timing.ntp2parts(now)
         resp = TimingPacket.encode(
             req.proto,
             0x53 | 0x80,
@@ -273,6 +392,16 @@ class TimingClient(asyncio.Protocol):
         )
         self.transport.sendto(resp, addr)
 
+    def _handle_response(self, resp, recvtime: int) -> None:
+        # Reference time is sendtime of our request (echoed by receiver)
+        self.estimator.add_sample(
+            resp.reftime_sec << 32 | resp.reftime_frac,
+            resp.recvtime_sec << 32 | resp.recvtime_frac,
+            resp.sendtime_sec << 32 | resp.sendtime_frac,
+            recvtime,
+        )
+        _LOGGER.debug("Receiver clock: %s", self.estimator.statistics)
+
     @staticmethod
     def error_received(exc) -> None:
         """Handle a connection error."""
@@ -338,15 +467,26 @@ class RaopClient:
         self,
         rtsp: RtspSession,
         context: RaopContext,
+        latency_controller: Optional[LatencyController] = None,
+        metrics: Optional[RaopMetrics] = None,
     ):
         """Initialize a new RaopClient instance."""
         self.loop = asyncio.get_event_loop()
         self.rtsp: RtspSession = rtsp
         self.context: RaopContext = context
+        self.latency_controller: LatencyController = (
+            latency_controller or LatencyController()
+        )
+        self.metrics: RaopMetrics = metrics or RaopMetrics()
         self.credentials: Optional[HapCredentials] = None
         self.password: Optional[str] = None
+        self.compress: bool = False
+        self.threaded_pacing: bool = False
+        self.buffered: bool = False
+        self.pacer: Optional[PacketPacer] = None
         self.control_client: Optional[ControlClient] = None
         self.timing_client: Optional[TimingClient] = None
+        self.clock: timing.ClockEstimator = timing.ClockEstimator()
         self._packet_backlog: PacketFifo = PacketFifo(PACKET_BACKLOG_SIZE)
         self._encryption_types: EncryptionType = EncryptionType.Unknown
         self._metadata_types: MetadataType = MetadataType.NotSupported
@@ -355,7 +495,11 @@ class RaopClient:
         self._listener: Optional[weakref.ReferenceType[Any]] = None
         self._info: Dict[str, object] = {}
         self._properties: Mapping[str, str] = {}
+        self._is_initialized: bool = False
         self._is_playing: bool = False
+        self._shared_key: Optional[bytes] = None
+        self._transport: Optional[asyncio.BaseTransport] = None
+        self._buffered_audio: Optional[BufferedAudioProtocol] = None
 
     @property
     def listener(self):
@@ -380,11 +524,26 @@ class RaopClient:
         )
         return PlaybackInfo(metadata, self.context.position)
 
+    @property
+    def is_initialized(self) -> bool:
+        """Return if session has been set up and can be used for streaming."""
+        return self._is_initialized
+
     @property
     def info(self) -> Dict[str, object]:
         """Return value mappings for server /info values."""
         return self._info
 
+    @property
+    def is_buffered(self) -> bool:
+        """Return if receiver buffers audio sent over TCP (set up during initialize)."""
+        return self._shared_key is not None
+
+    @property
+    def clock_statistics(self) -> timing.ClockStatistics:
+        """Return measured offset, drift and round-trip time of receiver clock."""
+        return self.clock.statistics
+
     def close(self):
         """Close session and free up resources."""
         if self.control_client:
@@ -393,6 +552,8 @@ class RaopClient:
             self.timing_client.close()
         if self._keep_alive_task:
             self._keep_alive_task.cancel()
+            self._keep_alive_task = None
+        self._is_initialized = False
 
     async def _send_keep_alive(self):
         _LOGGER.debug("Starting keep-alive task")
@@ -431,11 +592,16 @@ class RaopClient:
 
         local_addr = (self.rtsp.connection.local_ip, 0)
         (_, control_client) = await self.loop.create_datagram_endpoint(
-            lambda: ControlClient(self.context, self._packet_backlog),
+            lambda: ControlClient(
+                self.context,
+                self._packet_backlog,
+                self.latency_controller,
+                self.metrics,
+            ),
             local_addr=local_addr,
         )
         (_, timing_client) = await self.loop.create_datagram_endpoint(
-            TimingClient, local_addr=local_addr
+            lambda: TimingClient(self.clock), local_addr=local_addr
         )
 
         self.control_client = cast(ControlClient, control_client)
@@ -452,6 +618,7 @@ class RaopClient:
 
         # Set up the streaming session
         await self._setup_session()
+        self._is_initialized = True
 
     def _update_output_properties(self, properties: Mapping[str, str]) -> None:
         (
@@ -480,6 +647,11 @@ class RaopClient:
             self.password,
         )
 
+        if self.buffered and self._supports_buffered_audio:
+            await self._setup_buffered_stream()
+            return
+
+        self._shared_key = None
         resp = await self.rtsp.setup(
             headers={
                 "Transport": (
@@ -502,6 +674,47 @@ class RaopClient:
             self.context.server_port,
         )
 
+    async def _setup_buffered_stream(self):
+        self._shared_key = generate_shared_key()
+        resp = await self.rtsp.setup(
+            headers={"Content-Type": "application/x-apple-binary-plist"},
+            body=plistlib.dumps(
+                {
+                    "streams": [
+                        {
+                            "type": BUFFERED_STREAM_TYPE,
+                            "ct": 2,  # Apple Lossless
+                            "spf": FRAMES_PER_PACKET,
+                            "sr": self.context.sample_rate,
+                            "shk": self._shared_key,
+                            "controlPort": self.control_client.port,
+                        }
+                    ]
+                },
+                fmt=plistlib.FMT_BINARY,  # pylint: disable=no-member
+            ),
+        )
+        body = resp.body if isinstance(resp.body, bytes) else resp.body.encode("utf-8")
+        stream = plistlib.loads(body)["streams"][0]
+        self.context.timing_port = 0
+        self.context.control_port = int(stream["controlPort"])
+        self.context.server_port = int(stream["dataPort"])
+        self.context.rtsp_session = resp.headers.get("Session", 0)
+
+        _LOGGER.debug(
+            "Remote ports (buffered audio): control=%d, data=%d",
+            self.context.control_port,
+            self.context.server_port,
+        )
+
+    @property
+    def _supports_buffered_audio(self) -> bool:
+        try:
+            features = parse_features(self._properties.get("ft", "0x0"))
+        except ValueError:
+            return False
+        return AirPlayFlags.SupportsBufferedAudio in features
+
     @property
     def _requires_auth_setup(self):
         # Do auth-setup if MFiSAP encryption is supported by receiver. Also,
@@ -524,67 +737,274 @@ class RaopClient:
         await self.rtsp.set_parameter("volume", str(volume))
         self.context.volume = volume
 
-    async def send_audio(  # pylint: disable=too-many-branches
+    async def send_audio(
         self, wave_file: AudioSource, metadata: AudioMetadata = EMPTY_METADATA
     ):
         """Send an audio stream to the device."""
+        await AudioFanout([self]).send_audio(wave_file, metadata)
+
+    async def start_streaming(
+        self,
+        source: AudioSource,
+        metadata: AudioMetadata,
+        start_ts: int,
+        latency: Optional[int] = None,
+    ) -> None:
+        """Prepare receiver for streaming and start playback.
+
+        The provided start timestamp (and latency) is used as timing reference,
+        allowing several receivers to use the same reference. If no latency is
+        provided, latency from latency controller is used.
+        """
         if self.control_client is None or self.timing_client is None:
             raise Exception("not initialized")  # TODO: better exception
 
-        self.context.reset()
-
-        transport = None
-        try:
-            # Create a socket used for writing audio packets (ugly)
-            transport, _ = await self.loop.create_datagram_endpoint(
+        if latency is None:
+            latency = round(self.latency_controller.latency * self.context.sample_rate)
+        self.context.reset(start_ts, latency)
+        self.metrics.reset()
+
+        # Create a socket used for writing audio packets (ugly)
+        if self._shared_key is not None:
+            shared_key = self._shared_key
+            self._transport, protocol = await self.loop.create_connection(
+                lambda: BufferedAudioProtocol(shared_key),
+                self.rtsp.connection.remote_ip,
+                self.context.server_port,
+            )
+            self._buffered_audio = cast(BufferedAudioProtocol, protocol)
+        else:
+            self._transport, _ = await self.loop.create_datagram_endpoint(
                 AudioProtocol,
                 remote_addr=(self.rtsp.connection.remote_ip, self.context.server_port),
             )
 
-            # Start sending sync packets
-            self.control_client.start(self.rtsp.connection.remote_ip)
-
-            # Send progress if supported by receiver
-            if MetadataType.Progress in self._metadata_types:
-                start = self.context.rtptime
-                now = self.context.rtptime
-                end = start + wave_file.duration * self.context.sample_rate
-                await self.rtsp.set_parameter("progress", f"{start}/{now}/{end}")
-
-            # Apply text metadata if it is supported
-            self._metadata = metadata
-            if MetadataType.Text in self._metadata_types:
-                _LOGGER.debug("Playing with metadata: %s", self.playback_info.metadata)
-                await self.rtsp.set_metadata(
-                    self.context.rtsp_session,
-                    self.context.rtpseq,
-                    self.context.rtptime,
-                    self.playback_info.metadata,
-                )
+        # Start sending sync packets
+        self.control_client.start(self.rtsp.connection.remote_ip)
+
+        # Measure receiver clock (if receiver has a timing port)
+        if self.context.timing_port:
+            self.timing_client.start(
+                self.rtsp.connection.remote_ip, self.context.timing_port
+            )
 
-            # Start keep-alive task to ensure connection is not closed by remote device
+        # Send progress if supported by receiver
+        if MetadataType.Progress in self._metadata_types:
+            start = self.context.rtptime
+            now = self.context.rtptime
+            end = start + source.duration * self.context.sample_rate
+            await self.rtsp.set_parameter("progress", f"{start}/{now}/{end}")
+
+        # Apply text metadata if it is supported
+        self._metadata = metadata
+        if MetadataType.Text in self._metadata_types:
+            _LOGGER.debug("Playing with metadata: %s", self.playback_info.metadata)
+            await self.rtsp.set_metadata(
+                self.context.rtsp_session,
+                self.context.rtpseq,
+                self.context.rtptime,
+                self.playback_info.metadata,
+            )
+
+        # Start keep-alive task to ensure connection is not closed by remote device.
+        # It keeps running after playback has finished to keep the session alive.
+        if self._keep_alive_task is None:
             feedback = await self.rtsp.feedback(allow_error=True)
             if feedback.code == 200:
                 self._keep_alive_task = asyncio.ensure_future(self._send_keep_alive())
             else:
                 _LOGGER.debug("Keep-alive not supported, not starting task")
 
+        listener = self.listener
+        if listener:
+            listener.playing(self.playback_info)
+
+        # Start playback
+        await self.rtsp.record(
+            headers={
+                "Range": "npt=0-",
+                "Session": self.context.rtsp_session,
+                "RTP-Info": (
+                    f"seq={self.context.rtpseq};rtptime={self.context.rtptime}"
+                ),
+            }
+        )
+        self._is_playing = True
+
+    @property
+    def audio_address(self) -> Tuple[str, int]:
+        """Return address audio packets are sent to."""
+        return self.rtsp.connection.remote_ip, self.context.server_port
+
+    def build_packet(
+        self, audio: bytes, first_packet: bool, head_ts: int
+    ) -> Optional[bytes]:
+        """Create audio packet for audio at a given position and add it to backlog.
+
+        Returns None if the receiver is no longer accepting audio, i.e. playback was
+        stopped or the connection was closed.
+        """
+        if not self._is_playing:
+            return None
+
+        if self._transport is None or self._transport.is_closing():
+            _LOGGER.warning("Connection closed while streaming audio")
+            return None
+
+        packet = (
+            AudioPacketHeader.encode(
+                0x80,
+                0xE0 if first_packet else 0x60,
+                self.context.rtpseq,
+                head_ts - (self.context.start_ts - self.context.latency),
+                self.rtsp.session_id,
+            )
+            + audio
+        )
+
+        # Add packet to backlog before sending
+        self._packet_backlog[self.context.rtpseq] = packet
+        self.latency_controller.packet_sent()
+        self.context.rtpseq = (self.context.rtpseq + 1) % (2 ** 16)
+        return packet
+
+    def send_packet(self, audio: bytes, first_packet: bool) -> bool:
+        """Send an encoded audio packet to receiver.
+
+        Returns False if the receiver is no longer accepting audio, i.e. playback was
+        stopped or the connection was closed.
+        """
+        packet = self.build_packet(audio, first_packet, self.context.head_ts)
+        if packet is None or self._transport is None:
+            return False
+
+        if self._buffered_audio:
+            self._buffered_audio.send(packet)
+        else:
+            cast(asyncio.DatagramTransport, self._transport).sendto(packet)
+        self.context.head_ts += FRAMES_PER_PACKET
+        return True
+
+    def send_buffered_packet(
+        self, audio: bytes, first_packet: bool, head_ts: int
+    ) -> bool:
+        """Send an encoded audio packet for audio at a given position ahead of time.
+
+        Only supported by receivers buffering audio. Returns False if the receiver is
+        no longer accepting audio.
+        """
+        packet = self.build_packet(audio, first_packet, head_ts)
+        if packet is None or self._buffered_audio is None:
+            return False
+
+        self._buffered_audio.send(packet)
+        return True
+
+    async def drain(self) -> None:
+        """Wait until receiver buffering audio is ready to receive more audio."""
+        if self._buffered_audio:
+            await self._buffered_audio.drain()
+
+    async def stop_streaming(self) -> None:
+        """Stop streaming and release resources used while streaming.
+
+        The session is not torn down, so it can be re-used to stream more audio.
+        """
+        self._is_playing = False
+        self._packet_backlog.clear()  # Don't keep old packets around (big!)
+        self.latency_controller.stream_finished()
+        try:
+            if self._transport:
+                # Make receiver discard buffered audio, a new RECORD is sent before
+                # streaming again
+                await self.rtsp.flush(
+                    self.context.rtsp_session, self.context.rtpseq, self.context.rtptime
+                )
+        finally:
+            if self._transport:
+                self._transport.close()
+                self._transport = None
+            self._buffered_audio = None
+            if self.control_client:
+                self.control_client.stop()
+            if self.timing_client:
+                self.timing_client.stop()
+
             listener = self.listener
             if listener:
-                listener.playing(self.playback_info)
-
-            # Start playback
-            await self.rtsp.record(
-                headers={
-                    "Range": "npt=0-",
-                    "Session": self.context.rtsp_session,
-                    "RTP-Info": (
-                        f"seq={self.context.rtpseq};rtptime={self.context.rtptime}"
-                    ),
-                }
-            )
+                listener.stopped()
+
+    async def teardown(self) -> None:
+        """Tear down session on receiver."""
+        if self._is_initialized:
+            self._is_initialized = False
+            await self.rtsp.teardown(self.context.rtsp_session)
+
+
+class AudioFanout:
+    """Stream audio from one source to one or more receivers.
+
+    Audio is decoded, encoded and paced once and the same encoded audio is sent to all
+    receivers. Each receiver has its own RTP sequence number, SSRC and control/timing
+    ports, but all receivers share the same timing reference (start timestamp) so that
+    playback starts and stays in sync. If all receivers buffer audio, audio is sent
+    ahead of time in bursts instead of being paced.
+    """
+
+    def __init__(self, clients: List[RaopClient]) -> None:
+        """Initialize a new AudioFanout instance."""
+        if not clients:
+            raise exceptions.InvalidStateError("no receivers to stream to")
+
+        self.clients = clients
+        self.context = clients[0].context
+        self.threaded_pacing = clients[0].threaded_pacing
+        self._active: List[RaopClient] = []
+        self._frames_sent: int = 0
+        self._start_time: Optional[float] = None
+
+        # Audio is encoded once, so all receivers must agree on audio format
+        for client in clients[1:]:
+            if (
+                client.context.sample_rate,
+                client.context.channels,
+                client.context.bytes_per_channel,
+            ) != (
+                self.context.sample_rate,
+                self.context.channels,
+                self.context.bytes_per_channel,
+            ):
+                raise exceptions.NotSupportedError(
+                    "all receivers must use the same audio format"
+                )
+
+        encoder = AlacEncoder if clients[0].compress else UncompressedAlacEncoder
+        self._encoder = encoder(self.context.channels, self.context.packet_size)
+
+    async def send_audio(
+        self, source: AudioSource, metadata: AudioMetadata = EMPTY_METADATA
+    ) -> None:
+        """Send an audio stream to all receivers."""
+        start_ts = timing.ntp2ts(timing.ntp_now(), self.context.sample_rate)
 
-            await self._stream_data(wave_file, transport)
+        # Receivers play audio in sync if same latency is used, so use largest one
+        latency = max(
+            round(client.latency_controller.latency * self.context.sample_rate)
+            for client in self.clients
+        )
+
+        try:
+            for client in self.clients:
+                await client.start_streaming(source, metadata, start_ts, latency)
+            self._active = list(self.clients)
+            self._frames_sent = 0
+            self._start_time = None
+            if all(client.is_buffered for client in self.clients):
+                await self._stream_data_buffered(source)
+            elif self.threaded_pacing:
+                await self._stream_data_paced(source)
+            else:
+                await self._stream_data(source)
         except (  # pylint: disable=try-except-raise
             exceptions.ProtocolError,
             exceptions.AuthenticationError,
@@ -593,41 +1013,36 @@ class RaopClient:
         except Exception as ex:
             raise exceptions.ProtocolError("an error occurred during streaming") from ex
         finally:
-            self._packet_backlog.clear()  # Don't keep old packets around (big!)
-            if transport:
-                # TODO: Teardown should not be done here. In fact, nothing should be
-                # closed here since the connection should be re-usable for streaming
-                # more audio files. Refactor when support for that is added.
-                await self.rtsp.teardown(self.context.rtsp_session)
-                transport.close()
-            if self._keep_alive_task:
-                self._keep_alive_task.cancel()
-                self._keep_alive_task = None
-            self.control_client.stop()
-
-            listener = self.listener
-            if listener:
-                listener.stopped()
+            self._active = []
+            self._publish_metrics(source)
+            await asyncio.gather(
+                *[client.stop_streaming() for client in self.clients],
+                return_exceptions=True,
+            )
 
-    async def _stream_data(self, source: AudioSource, transport):
+    async def _stream_data(self, source: AudioSource):
         stats = Statistics(self.context.sample_rate)
+        self._update_clock_rate()
 
         initial_time = perf_counter()
-        self._is_playing = True
-        while self._is_playing:
-            num_sent = await self._send_packet(
-                source, stats.total_frames == 0, transport
-            )
+        while self._active:
+            num_sent = await self._send_packet(source, stats.total_frames == 0)
             if num_sent == 0:
                 break
 
             stats.tick(num_sent)
-            frames_behind = stats.frames_behind
+            frames_behind = int(
+                (perf_counter() - initial_time - self._stream_time(stats.total_frames))
+                * self.context.sample_rate
+            )
 
             # If we are late, send some additional frames with hopes of catching up
             if frames_behind >= FRAMES_PER_PACKET:
+                for client in self._active:
+                    client.latency_controller.late()
                 max_packets = min(
-                    int(frames_behind / FRAMES_PER_PACKET), MAX_PACKETS_COMPENSATE
+                    int(frames_behind / FRAMES_PER_PACKET),
+                    self._max_packets_compensate(),
                 )
                 _LOGGER.debug(
                     "Compensating with %d packets (%d frames behind)",
@@ -635,7 +1050,7 @@ class RaopClient:
                     frames_behind,
                 )
                 num_sent, has_more_packets = await self._send_number_of_packets(
-                    source, transport, max_packets
+                    source, max_packets
                 )
                 stats.tick(num_sent)
                 if not has_more_packets:
@@ -652,11 +1067,15 @@ class RaopClient:
                     stats.total_frames,
                     stats.expected_frame_count,
                 )
+                self._update_clock_rate()
+                for client in self.clients:
+                    client.latency_controller.interval_completed()
+                self._publish_metrics(source)
 
             # Calculate the actual absolute position in stream and where we actually
             # are (from when we initially stared to stream). The diff is the time we
             # need to sleep until next lap.
-            abs_time_stream = stats.total_frames / self.context.sample_rate
+            abs_time_stream = self._stream_time(stats.total_frames)
             rel_to_start = perf_counter() - initial_time
             diff = abs_time_stream - rel_to_start
             if diff > 0:
@@ -675,58 +1094,226 @@ class RaopClient:
             (timing.perf_counter_ns() - stats.start_time_ns) / 10 ** 9,
         )
 
-    async def _send_packet(
-        self, source: AudioSource, first_packet: bool, transport
-    ) -> int:
+    async def _stream_data_paced(self, source: AudioSource):
+        # Packets are sent according to a fixed schedule, so clock rate is only
+        # updated once when streaming starts
+        self._update_clock_rate()
+        pacer = PacketPacer(
+            FRAMES_PER_PACKET / (self.context.sample_rate * self.context.clock_rate)
+        )
+        for client in self._active:
+            client.pacer = pacer
+
+        head_ts = self.context.start_ts
+        pacer.start()
+        try:
+            while self._active:
+                await pacer.wait_for_space()
+
+                # Publish metrics about once a second
+                if head_ts > self.context.start_ts and (
+                    (head_ts - self.context.start_ts) % self.context.sample_rate
+                    < FRAMES_PER_PACKET
+                ):
+                    self._publish_metrics(source)
+
+                audio = await self._next_audio(source)
+                if audio is None:
+                    break
+
+                first_packet = head_ts == self.context.start_ts
+                datagrams = []
+                for client in list(self._active):
+                    # Receivers buffering audio do not need pacing
+                    if client.is_buffered:
+                        if not client.send_buffered_packet(
+                            audio, first_packet, head_ts
+                        ):
+                            self._active.remove(client)
+                        continue
+
+                    packet = client.build_packet(audio, first_packet, head_ts)
+                    if packet is None:
+                        self._active.remove(client)
+                    else:
+                        datagrams.append((client.audio_address, packet))
+
+                # Receiver position (used by e.g. sync packets) is updated when audio
+                # has actually been sent
+                head_ts += FRAMES_PER_PACKET
+                pacer.put(datagrams, partial(self._packet_paced, pacer.loop, head_ts))
+
+            await pacer.drain()
+        finally:
+            await pacer.stop()
+
+        stats = pacer.statistics
+        for client in self.clients:
+            client.latency_controller.late(stats.late_packets)
+        _LOGGER.debug(
+            "Sent %d packets (%d late), jitter: avg=%fs, max=%fs",
+            stats.packets_sent,
+            stats.late_packets,
+            stats.average_jitter,
+            stats.max_jitter,
+        )
+
+    async def _stream_data_buffered(self, source: AudioSource):
+        # Receivers buffer audio, so audio is sent up to BUFFERED_AHEAD_TIME seconds
+        # ahead of playback and more audio is sent once less than BUFFERED_REFILL_TIME
+        # seconds remain. This means waking up about once a second instead of once
+        # per packet. Sync packets are based on head position, which is updated to
+        # what is currently being played.
+        self._update_clock_rate()
+
+        initial_time = perf_counter()
+        wakeups = 0
+        while self._active:
+            elapsed = perf_counter() - initial_time
+            ahead = self._stream_time(self._frames_sent) - elapsed
+            if ahead < BUFFERED_AHEAD_TIME:
+                if not await self._send_buffered_packet(source):
+                    break
+                continue
+
+            self._update_head(elapsed)
+            self._publish_metrics(source)
+            await asyncio.gather(*[client.drain() for client in self._active])
+            await asyncio.sleep(ahead - BUFFERED_REFILL_TIME)
+            wakeups += 1
+
+        # Wait for receivers to play what has been sent before stopping
+        remaining = self._stream_time(self._frames_sent) - (
+            perf_counter() - initial_time
+        )
+        if self._active and remaining > 0:
+            await asyncio.sleep(remaining)
+        self._update_head(perf_counter() - initial_time)
+
+        _LOGGER.debug("Sent %d frames with %d wake-ups", self._frames_sent, wakeups)
+
+    async def _send_buffered_packet(self, source: AudioSource) -> bool:
+        audio = await self._next_audio(source)
+        if audio is None:
+            return False
+
+        first_packet = self._frames_sent == 0
+        head_ts = self.context.start_ts + self._frames_sent
+        self._active = [
+            client
+            for client in self._active
+            if client.send_buffered_packet(audio, first_packet, head_ts)
+        ]
+        if not self._active:
+            return False
+
+        self._packet_sent(self._frames_sent)
+        self._frames_sent += FRAMES_PER_PACKET
+        return True
+
+    def _update_head(self, elapsed: float) -> None:
+        # Head position follows what receivers are playing, not what has been sent
+        head_ts = min(
+            self.context.timestamp_at(elapsed),
+            self.context.start_ts + self._frames_sent,
+        )
+        for client in self.clients:
+            client.context.head_ts = head_ts
+
+    def _max_packets_compensate(self) -> int:
+        # Same packets are sent to all receivers, so be nice to the worst link
+        return min(
+            client.latency_controller.max_packets_compensate for client in self._active
+        )
+
+    def _stream_time(self, frames: int) -> float:
+        return self.context.stream_time(self.context.start_ts + frames)
+
+    def _update_clock_rate(self) -> None:
+        # Audio is sent to all receivers at the same rate, so use average rate of
+        # receivers with a known clock drift
+        rates = [
+            client.clock.rate
+            for client in self.clients
+            if client.clock.drift is not None
+        ]
+        rate = sum(rates) / len(rates) if rates else 1.0
+        rate = min(max(rate, 1.0 - MAX_CLOCK_DRIFT), 1.0 + MAX_CLOCK_DRIFT)
+        for client in self.clients:
+            if client.context.clock_rate != rate:
+                _LOGGER.debug("Changing clock rate to %f", rate)
+                client.context.set_clock_rate(rate)
+
+    def _packet_paced(self, loop: asyncio.AbstractEventLoop, head_ts: int) -> None:
+        # Called from pacer thread when a packet has been sent. State is only updated
+        # from the event loop, but slack is based on when the packet was sent.
+        loop.call_soon_threadsafe(self._update_paced, head_ts, perf_counter())
+
+    def _update_paced(self, head_ts: int, sent_time: float) -> None:
+        for client in self.clients:
+            client.context.head_ts = head_ts
+        self._packet_sent(
+            head_ts - self.context.start_ts - FRAMES_PER_PACKET, sent_time
+        )
+
+    def _packet_sent(self, position: int, now: Optional[float] = None) -> None:
+        # Deadline for a packet is when audio at its position is to be played
+        # (relative to when first packet was sent)
+        if now is None:
+            now = perf_counter()
+        if self._start_time is None:
+            self._start_time = now
+        slack = self._start_time + self._stream_time(position) - now
+        for client in list(self._active):
+            client.metrics.packet_sent(slack)
+
+    def _publish_metrics(self, source: AudioSource) -> None:
+        for client in self.clients:
+            client.metrics.underruns = source.underruns
+            client.metrics.notify()
+
+    async def _next_audio(self, source: AudioSource) -> Optional[bytes]:
         # Once all frames in the audio stream have been sent, we are still "latency"
         # behind and will start sending padding (empty audio) until we catch up. This
         # is needed to keep the sync packets in line with real time.
         if self.context.padding_sent >= self.context.latency:
-            return 0
+            return None
 
         frames = await source.readframes(FRAMES_PER_PACKET)
-        if not frames:
-            # No more frames to send means we send padding packets (just zeros) to keep
-            # sync packets accurate
-            # TODO: Cache empty packet as this is unnecessarily expensive
-            frames = self.context.packet_size * b"\x00"
-            self.context.padding_sent += int(len(frames) / self.context.frame_size)
-        elif len(frames) != self.context.packet_size:
-            # The audio stream length seldom aligns with number of frames per packet,
-            # so pad the last packet with zeros
-            frames += (self.context.packet_size - len(frames)) * b"\x00"
-
-        header = AudioPacketHeader.encode(
-            0x80,
-            0xE0 if first_packet else 0x60,
-            self.context.rtpseq,
-            self.context.rtptime,
-            self.rtsp.session_id,
-        )
-
-        # ALAC frame with raw data. Not so pretty but will work for now until a
-        # proper ALAC encoder is added.
-        audio = bitarray("00" + str(self.context.channels - 1) + 19 * "0" + "1")
-        for i in range(0, len(frames), 2):
-            audio.frombytes(bytes([frames[i + 1], frames[i]]))
+        if frames:
+            for client in self._active:
+                client.metrics.frames_sent += len(frames) // self.context.frame_size
 
-        if transport.is_closing():
-            _LOGGER.warning("Connection closed while streaming audio")
+            # The audio stream length seldom aligns with number of frames per packet,
+            # so the encoder pads the last packet with zeros
+            return self._encoder.encode(frames)
+
+        # No more frames to send means we send padding packets (just zeros) to keep
+        # sync packets accurate
+        self.context.padding_sent += FRAMES_PER_PACKET
+        for client in self._active:
+            client.metrics.padding_packets += 1
+        return self._encoder.padding
+
+    async def _send_packet(self, source: AudioSource, first_packet: bool) -> int:
+        audio = await self._next_audio(source)
+        if audio is None:
             return 0
 
-        packet = header + audio.tobytes()
-
-        # Add packet to backlog before sending
-        self._packet_backlog[self.context.rtpseq] = packet
-        transport.sendto(packet)
-
-        self.context.rtpseq = (self.context.rtpseq + 1) % (2 ** 16)
-        self.context.head_ts += int(len(frames) / self.context.frame_size)
+        # Same audio is sent to all receivers, receivers no longer accepting audio
+        # are dropped
+        self._active = [
+            client for client in self._active if client.send_packet(audio, first_packet)
+        ]
+        if not self._active:
+            return 0
 
-        return int(len(frames) / self.context.frame_size)
+        self._packet_sent(self._frames_sent)
+        self._frames_sent += FRAMES_PER_PACKET
+        return FRAMES_PER_PACKET
 
     async def _send_number_of_packets(
-        self, source: AudioSource, transport, count: int
+        self, source: AudioSource, count: int
     ) -> Tuple[int, bool]:
         """Send a specific number of packets.
 
@@ -734,7 +1321,7 @@ class RaopClient:
         """
         total_frames = 0
         for _ in range(count):
-            sent = await self._send_packet(source, False, transport)
+            sent = await self._send_packet(source, False)
             total_frames += sent
             if sent == 0:
                 return total_frames, False
@@ -4,8 +4,18 @@ The timing routines in this module is based on the excellent work of RAOP-Player
 https://github.com/philippe44/RAOP-Player
 """
 
+from collections import deque
 from time import perf_counter
-from typing import Tuple
+from typing import Deque, NamedTuple, Optional, Tuple
+
+# Number of recent samples considered when estimating offset (NTP clock filter)
+CLOCK_FILTER_SIZE = 8
+
+# Number of samples used to estimate drift
+CLOCK_HISTORY_SIZE = 64
+
+# Drift is not estimated until samples span at least this many seconds
+MIN_DRIFT_SPAN = 10.0
 
 
 # TODO: Replace with time.perf_counter_ns when python 3.6 is dropped
@@ -45,3 +55,110 @@ def ntp2ms(ntp: int) -> int:
 def ts2ms(timestamp: int, rate: int) -> int:
     """Convert timestamp to milliseconds."""
     return ntp2ms(ts2ntp(timestamp, rate))
+
+
+def ntp2sec(ntp: int) -> float:
+    """Convert NTP time (or difference of NTP times) to seconds."""
+    return ntp / 2 ** 32
+
+
+class ClockStatistics(NamedTuple):
+    """Measured relation between local clock and a receiver clock.
+
+    Offset and round-trip time are in seconds and drift in parts per million. A
+    positive offset means that receiver clock is ahead of local clock and a positive
+    drift that receiver clock runs faster than local clock.
+    """
+
+    samples: int
+    round_trip_time: float
+    offset: float
+    drift: float
+
+
+class _ClockSample(NamedTuple):
+    local_time: float
+    offset: float
+    round_trip_time: float
+
+
+class ClockEstimator:
+    """Estimate offset and drift of a receiver clock in the same way as NTP.
+
+    Each sample consists of four timestamps: when a request was sent (originate,
+    local clock), received (receive, receiver clock), when the response was sent
+    (transmit, receiver clock) and received (destination, local clock). Offset is
+    taken from the sample with lowest round-trip time among recent samples, as it is
+    least affected by network delays. Drift is estimated with linear regression of
+    offset over time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a new ClockEstimator instance."""
+        self._samples: Deque[_ClockSample] = deque(maxlen=CLOCK_HISTORY_SIZE)
+        self._total_samples: int = 0
+
+    def add_sample(
+        self, originate: int, receive: int, transmit: int, destination: int
+    ) -> None:
+        """Add timestamps (NTP format) from a timing request/response exchange."""
+        round_trip_time = ntp2sec((destination - originate) - (transmit - receive))
+        if round_trip_time < 0:
+            return  # Invalid sample, e.g. a response to an old request
+
+        offset = ntp2sec((receive - originate) + (transmit - destination)) / 2
+        self._samples.append(
+            _ClockSample(ntp2sec(destination), offset, round_trip_time)
+        )
+        self._total_samples += 1
+
+    @property
+    def offset(self) -> Optional[float]:
+        """Return estimated offset in seconds or None if unknown."""
+        best = self._best_sample()
+        return best.offset if best else None
+
+    @property
+    def drift(self) -> Optional[float]:
+        """Return estimated drift as a fraction (not ppm) or None if unknown."""
+        samples = self._samples
+        if len(samples) < 2:
+            return None
+
+        start_time = samples[0].local_time
+        if samples[-1].local_time - start_time < MIN_DRIFT_SPAN:
+            return None
+
+        # Least squares fit of offset over time
+        mean_time = sum(s.local_time - start_time for s in samples) / len(samples)
+        mean_offset = sum(s.offset for s in samples) / len(samples)
+        numerator = sum(
+            (s.local_time - start_time - mean_time) * (s.offset - mean_offset)
+            for s in samples
+        )
+        denominator = sum((s.local_time - start_time - mean_time) ** 2 for s in samples)
+        return numerator / denominator
+
+    @property
+    def rate(self) -> float:
+        """Return number of receiver clock seconds per local clock second."""
+        drift = self.drift
+        return 1.0 + drift if drift is not None else 1.0
+
+    @property
+    def statistics(self) -> ClockStatistics:
+        """Return current estimates."""
+        best = self._best_sample()
+        drift = self.drift
+        return ClockStatistics(
+            self._total_samples,
+            best.round_trip_time if best else 0.0,
+            best.offset if best else 0.0,
+            drift * 10 ** 6 if drift is not None else 0.0,
+        )
+
+    def _best_sample(self) -> Optional[_ClockSample]:
+        recent = list(self._samples)[-CLOCK_FILTER_SIZE:]
+        if not recent:
+            return None
+        return min(recent, key=lambda sample: sample.round_trip_time)
@@ -57,8 +57,15 @@ def log_binary(logger, message, level=logging.DEBUG, **kwargs):
 
 
 def log_protobuf(logger, text, message):
-    """Log protobuf message and shorten line length."""
+    """Log protobuf message and shorten line length.
+
+    Objects that are not protobuf messages, but can be converted to one with a
+    to_protobuf method (e.g. pre-serialized messages), are also supported.
+    """
     if logger.isEnabledFor(logging.DEBUG):
+        if hasattr(message, "to_protobuf"):
+            message = message.to_protobuf()
+
         override_length = int(environ.get("PYATV_PROTOBUF_MAX_LINE", 0))
         line_length = override_length or _PROTOBUF_LINE_LENGTH
 
@@ -1,6 +1,19 @@
 """Simple LRU cache for data based on an identifier."""
 
+import asyncio
 from collections import OrderedDict
+import hashlib
+import json
+import logging
+from typing import Optional, Tuple, cast
+
+from pyatv.interface import ArtworkInfo
+from pyatv.support.directory_store import DirectoryStore
+
+_LOGGER = logging.getLogger(__name__)
+
+# Artwork identifier, requested width and requested height
+ArtworkKey = Tuple[str, Optional[int], Optional[int]]
 
 
 class Cache:
@@ -44,3 +57,118 @@ class Cache:
     def __len__(self):
         """Return number of elements in cache."""
         return len(self.data)
+
+
+class ArtworkCache:
+    """LRU cache of artwork bounded by total size in bytes.
+
+    Artwork is keyed by identifier and requested size, so that artwork requested
+    with different sizes is cached separately. If a directory is given, artwork is
+    also stored there so that it survives reconnects and restarts. The directory
+    is bounded separately (by disk_size) and can be shared between instances.
+    """
+
+    DEFAULT_MAX_SIZE = 4 * 1024 * 1024  # Bytes
+    DEFAULT_DISK_SIZE = 50 * 1024 * 1024  # Bytes
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        directory: Optional[str] = None,
+        disk_size: int = DEFAULT_DISK_SIZE,
+    ) -> None:
+        """Initialize a new ArtworkCache instance."""
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: "OrderedDict[ArtworkKey, ArtworkInfo]" = OrderedDict()
+        self._size: int = 0
+        self._store: Optional[DirectoryStore] = (
+            DirectoryStore(directory, disk_size, (".artwork",)) if directory else None
+        )
+
+    @property
+    def size(self) -> int:
+        """Return total size of artwork kept in memory in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Return number of artwork kept in memory."""
+        return len(self._data)
+
+    async def get(
+        self, identifier: str, width: Optional[int], height: Optional[int]
+    ) -> Optional[ArtworkInfo]:
+        """Return cached artwork or None if not in cache."""
+        key = (identifier, width, height)
+        artwork = self._data.get(key)
+        if artwork is not None:
+            self._data.move_to_end(key)
+        elif self._store:
+            artwork = await asyncio.get_event_loop().run_in_executor(
+                None, self._load, self._store, self._path(key)
+            )
+            if artwork is not None:
+                self._add(key, artwork)
+
+        if artwork is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return artwork
+
+    async def put(
+        self,
+        identifier: str,
+        width: Optional[int],
+        height: Optional[int],
+        artwork: ArtworkInfo,
+    ) -> None:
+        """Put artwork in the cache."""
+        key = (identifier, width, height)
+        self._add(key, artwork)
+        if self._store:
+            await asyncio.get_event_loop().run_in_executor(
+                None, self._save, self._store, self._path(key), artwork
+            )
+
+    def _add(self, key: ArtworkKey, artwork: ArtworkInfo) -> None:
+        previous = self._data.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous.bytes)
+
+        # Artwork larger than the entire cache is never kept in memory
+        if len(artwork.bytes) > self.max_size:
+            return
+
+        self._data[key] = artwork
+        self._size += len(artwork.bytes)
+        while self._size > self.max_size:
+            _, evicted = self._data.popitem(last=False)
+            self._size -= len(evicted.bytes)
+
+    def _path(self, key: ArtworkKey) -> str:
+        name = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return cast(DirectoryStore, self._store).path(name + ".artwork")
+
+    @staticmethod
+    def _load(store: DirectoryStore, path: str) -> Optional[ArtworkInfo]:
+        data = store.read(path)
+        if data is None:
+            return None
+
+        header, _, artwork = data.partition(b"\n")
+        try:
+            mimetype, width, height = json.loads(header)
+        except (TypeError, ValueError):
+            _LOGGER.debug("Ignoring corrupt artwork in %s", path)
+            return None
+        return ArtworkInfo(bytes=artwork, mimetype=mimetype, width=width, height=height)
+
+    @staticmethod
+    def _save(store: DirectoryStore, path: str, artwork: ArtworkInfo) -> None:
+        header = json.dumps([artwork.mimetype, artwork.width, artwork.height])
+        try:
+            store.write(path, [header.encode("utf-8") + b"\n", artwork.bytes])
+        except OSError:
+            _LOGGER.debug("Failed to store artwork in %s", path, exc_info=True)
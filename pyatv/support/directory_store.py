@@ -0,0 +1,104 @@
+"""Files stored in a directory bounded by total size.
+
+Files are written to a temporary file and moved in place, so that partially written
+files are never read. The modification time of a file is used to keep track of when
+it was last used and least recently used files are removed when the total size
+exceeds a limit. A directory can be shared between several instances (and
+processes), so files might be removed by someone else at any time.
+"""
+from contextlib import suppress
+import io
+import logging
+import os
+import tempfile
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DirectoryStore:
+    """Store files in a directory and remove least recently used ones."""
+
+    def __init__(self, directory: str, max_size: int, suffixes: Sequence[str]) -> None:
+        """Initialize a new DirectoryStore instance.
+
+        Only files ending with any of the suffixes are managed by the store.
+        """
+        self.directory: str = directory
+        self.max_size: int = max_size
+        self._suffixes: Tuple[str, ...] = tuple(suffixes)
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def size(self) -> int:
+        """Return total size of stored files in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def path(self, name: str) -> str:
+        """Return path to a file in the store."""
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def touch(path: str) -> bool:
+        """Mark a file as used and return if it exists."""
+        # Explicit time as file system timestamps might have coarse resolution
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            return False
+        return True
+
+    def read(self, path: str) -> Optional[bytes]:
+        """Return content of a file and mark it as used or None if it does not exist."""
+        try:
+            with io.open(path, "rb") as stored_file:
+                data = stored_file.read()
+        except OSError:
+            return None
+        self.touch(path)
+        return data
+
+    def write(self, path: str, chunks: Iterable[bytes]) -> None:
+        """Write chunks of data to a file and remove least recently used files.
+
+        If writing fails, e.g. when producing a chunk raises an exception, nothing is
+        stored and the exception is re-raised.
+        """
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                for chunk in chunks:
+                    temp_file.write(chunk)
+            os.replace(temp_path, path)
+        except Exception:
+            with suppress(OSError):
+                os.remove(temp_path)
+            raise
+        self.touch(path)
+        self._evict(keep=path)
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        with os.scandir(self.directory) as scanned:
+            for entry in scanned:
+                with suppress(OSError):
+                    if entry.name.endswith(self._suffixes) and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self, keep: str) -> None:
+        entries = self._entries()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+
+            _LOGGER.debug("Removing %s from %s", path, self.directory)
+            with suppress(OSError):
+                os.remove(path)
+                total_size -= size
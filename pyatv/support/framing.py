@@ -0,0 +1,112 @@
+"""Receive buffer for length-prefixed frames.
+
+Connections receive data in arbitrary chunks and must split it into frames (messages)
+prefixed by their length. Appending to a bytes object and slicing off each consumed
+frame copies all remaining data for every frame, which gets quadratic for large
+messages (e.g. artwork) arriving in many chunks or many messages arriving at once.
+
+FrameBuffer appends data to a bytearray and hands out frames as memoryviews into it,
+only advancing a read position. Consumed data is removed once it makes up most of the
+buffer, so data is only moved occasionally.
+"""
+from typing import Callable, Optional, Union
+
+from pyatv.support.variant import decode_variant
+
+# Consumed data is not removed from the buffer until there is at least this much
+COMPACT_THRESHOLD = 65536  # Bytes
+
+
+class FrameBuffer:
+    """Buffer received data and extract length-prefixed frames without copying.
+
+    Frames are returned as memoryviews that are valid until more data is appended.
+    Use bytes() to keep a copy for longer than that.
+    """
+
+    def __init__(self, compact_threshold: int = COMPACT_THRESHOLD) -> None:
+        """Initialize a new FrameBuffer instance."""
+        self._buffer: bytearray = bytearray()
+        self._position: int = 0
+        self._compact_threshold: int = compact_threshold
+
+    def __len__(self) -> int:
+        """Return number of buffered bytes not yet consumed."""
+        return len(self._buffer) - self._position
+
+    def append(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """Add received data to buffer."""
+        self._compact()
+        try:
+            self._buffer += data
+        except BufferError:
+            # A frame handed out earlier is still referenced, which prevents resizing
+            # the buffer, so continue with a new buffer instead
+            self._buffer = self._buffer[self._position :] + data
+            self._position = 0
+
+    def peek(self, length: Optional[int] = None) -> memoryview:
+        """Return (at most) length bytes from buffer without consuming them."""
+        end = len(self._buffer) if length is None else self._position + length
+        return memoryview(self._buffer)[self._position : end]
+
+    def find(self, sub: bytes) -> int:
+        """Return offset of sub in data not yet consumed or -1 if not found."""
+        index = self._buffer.find(sub, self._position)
+        return -1 if index == -1 else index - self._position
+
+    def read(self, length: int) -> Optional[memoryview]:
+        """Consume and return length bytes or None if not enough data is buffered."""
+        if len(self) < length:
+            return None
+
+        start = self._position
+        self._position += length
+        return memoryview(self._buffer)[start : self._position]
+
+    def read_variant_frame(self) -> Optional[memoryview]:
+        """Consume and return a frame prefixed by a protobuf variant (its length).
+
+        The variant is not included in the returned frame. None is returned if the
+        frame has not been fully received yet.
+        """
+        try:
+            length, offset = decode_variant(self._buffer, self._position)
+        except ValueError:
+            return None  # Variant is not complete
+
+        if len(self._buffer) - offset < length:
+            return None
+
+        self._position = offset
+        return self.read(length)
+
+    def read_frame(
+        self, header_length: int, frame_length: Callable[[memoryview], int]
+    ) -> Optional[memoryview]:
+        """Consume and return a frame starting with a fixed size header.
+
+        The frame_length function is called with the header and shall return the total
+        length of the frame (including header). None is returned if the frame has not
+        been fully received yet.
+        """
+        if len(self) < header_length:
+            return None
+
+        # A (bogus) length shorter than the header would never consume anything
+        length = max(header_length, frame_length(self.peek(header_length)))
+        return self.read(length)
+
+    def _compact(self) -> None:
+        if self._position == 0:
+            return
+
+        if self._position == len(self._buffer) or (
+            self._position >= self._compact_threshold
+            and 2 * self._position >= len(self._buffer)
+        ):
+            try:
+                del self._buffer[: self._position]
+            except BufferError:
+                self._buffer = self._buffer[self._position :]
+            self._position = 0
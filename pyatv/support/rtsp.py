@@ -182,6 +182,16 @@ class RtspSession:
         """Send RECORD message."""
         return await self.exchange("RECORD", headers=headers, body=body)
 
+    async def flush(self, rtsp_session: int, rtpseq: int, rtptime: int) -> HttpResponse:
+        """Send FLUSH message."""
+        return await self.exchange(
+            "FLUSH",
+            headers={
+                "Session": rtsp_session,
+                "RTP-Info": f"seq={rtpseq};rtptime={rtptime}",
+            },
+        )
+
     async def set_parameter(self, parameter: str, value: str) -> HttpResponse:
         """Send SET_PARAMETER message."""
         return await self.exchange(
@@ -1,15 +1,30 @@
 """Module to read and write Google protobuf variants."""
+from typing import Tuple
 
 
 def read_variant(variant):
-    """Read and parse a binary protobuf variant value."""
+    """Read and parse a binary protobuf variant value.
+
+    Returns the value and remaining data. Remaining data is a copy unless variant is a
+    memoryview, use decode_variant to avoid that.
+    """
+    result, end = decode_variant(variant)
+    return result, variant[end:]
+
+
+def decode_variant(data, offset: int = 0) -> Tuple[int, int]:
+    """Decode a binary protobuf variant value starting at offset in data.
+
+    Returns the value and offset of first byte after the variant.
+    """
     result = 0
-    cnt = 0
-    for data in variant:
-        result |= (data & 0x7F) << (7 * cnt)
-        cnt += 1
-        if not data & 0x80:
-            return result, variant[cnt:]
+    shift = 0
+    for index in range(offset, len(data)):
+        byte = data[index]
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, index + 1
+        shift += 7
     raise ValueError("invalid variant")
 
 
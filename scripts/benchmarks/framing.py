@@ -0,0 +1,90 @@
+"""Benchmark splitting received data into length-prefixed frames.
+
+Compares the original approach (appending to and slicing a bytes buffer) with
+FrameBuffer for two multi-megabyte streams received in chunks: many small messages
+(e.g. a burst of MRP updates) and one large message (e.g. artwork).
+"""
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+import os
+from time import perf_counter
+from typing import Callable, List
+
+from pyatv.support.framing import FrameBuffer
+from pyatv.support.variant import read_variant, write_variant
+
+
+def legacy_split(chunks: List[bytes]) -> int:
+    """Split frames like the original implementation did and return count."""
+    count = 0
+    buffer = b""
+    for chunk in chunks:
+        buffer += chunk
+        while buffer:
+            length, raw = read_variant(buffer)
+            if len(raw) < length:
+                break
+
+            _ = raw[:length]
+            buffer = raw[length:]
+            count += 1
+    return count
+
+
+def framebuffer_split(chunks: List[bytes]) -> int:
+    """Split frames with FrameBuffer and return count."""
+    count = 0
+    buffer = FrameBuffer()
+    for chunk in chunks:
+        buffer.append(chunk)
+        while buffer:
+            frame = buffer.read_variant_frame()
+            if frame is None:
+                break
+
+            count += 1
+    return count
+
+
+def make_chunks(frame_size: int, total_size: int, chunk_size: int) -> List[bytes]:
+    """Return a stream of frames split into chunks."""
+    frame = write_variant(frame_size) + os.urandom(frame_size)
+    stream = frame * max(1, total_size // len(frame))
+    return [stream[i : i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+
+def measure(split: Callable[[List[bytes]], int], chunks: List[bytes]) -> float:
+    """Return number of megabytes processed per second."""
+    start = perf_counter()
+    split(chunks)
+    return sum(len(chunk) for chunk in chunks) / (perf_counter() - start) / 2 ** 20
+
+
+def main():
+    """Script starts here."""
+    parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "-s", "--size", type=int, default=4, help="stream size in megabytes"
+    )
+    parser.add_argument(
+        "-c", "--chunk-size", type=int, default=65536, help="size of received chunks"
+    )
+    args = parser.parse_args()
+
+    size = args.size * 2 ** 20
+    scenarios = [
+        ("small", make_chunks(200, size, args.chunk_size)),
+        ("large", make_chunks(size, size, args.chunk_size)),
+    ]
+
+    print(f"{'':<8}{'before MB/s':>14}{'after MB/s':>14}{'speedup':>10}")
+    for name, chunks in scenarios:
+        if legacy_split(chunks) != framebuffer_split(chunks):
+            raise Exception("different number of frames")
+
+        before = measure(legacy_split, chunks)
+        after = measure(framebuffer_split, chunks)
+        print(f"{name:<8}{before:>14.1f}{after:>14.1f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Benchmark cold start time of pyatv scripts.
+
+Generated protobuf modules for MRP are imported when first used. This compares time
+to import atvremote and atvscript with all protobuf modules imported directly (as
+before) and with them imported lazily. Each import is made in a new interpreter.
+"""
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+import subprocess
+import sys
+from time import perf_counter
+from typing import List
+
+SCRIPTS = ["pyatv.scripts.atvremote", "pyatv.scripts.atvscript"]
+
+# Accessing ProtocolMessage imports all modules with inner messages
+EAGER = "from pyatv.protocols.mrp import protobuf; protobuf.ProtocolMessage"
+
+
+def measure(statements: List[str], runs: int) -> float:
+    """Return fastest time (in milliseconds) to run statements in a new interpreter."""
+    code = "; ".join(statements)
+    fastest = float("inf")
+    for _ in range(runs):
+        start = perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        fastest = min(fastest, perf_counter() - start)
+    return 1000 * fastest
+
+
+def main():
+    """Script starts here."""
+    parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "-n", "--runs", type=int, default=20, help="runs per measurement"
+    )
+    args = parser.parse_args()
+
+    print(f"{'':<12}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for script in SCRIPTS:
+        before = measure([f"import {script}", EAGER], args.runs)
+        after = measure([f"import {script}"], args.runs)
+        name = script.rsplit(".", maxsplit=1)[-1]
+        print(f"{name:<12}{before:>12.1f}{after:>12.1f}{before / after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
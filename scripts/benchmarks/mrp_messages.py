@@ -0,0 +1,59 @@
+"""Benchmark creating and serializing frequently sent MRP messages.
+
+Compares building protobuf messages for every key press, command and heartbeat with
+rendering pre-serialized templates (which produces identical bytes).
+"""
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from time import perf_counter
+from typing import Callable
+
+from pyatv.protocols.mrp import messages, protobuf
+
+# Usage page and usage for "select"
+SELECT = (1, 0x89)
+
+
+def measure(create: Callable[[], bytes], count: int) -> float:
+    """Return number of serialized messages per second."""
+    start = perf_counter()
+    for _ in range(count):
+        create()
+    return count / (perf_counter() - start)
+
+
+def main():
+    """Script starts here."""
+    parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "-n", "--messages", type=int, default=5000, help="messages to create"
+    )
+    args = parser.parse_args()
+
+    play = protobuf.CommandInfo_pb2.Play
+    scenarios = [
+        (
+            "hid_event",
+            lambda: messages.send_hid_event(*SELECT, True).SerializeToString(),
+            lambda: messages.prepared_hid_event(*SELECT, True).SerializeToString(),
+        ),
+        (
+            "command",
+            lambda: messages.command(play).SerializeToString(),
+            lambda: messages.prepared_command(play).SerializeToString(),
+        ),
+        (
+            "heartbeat",
+            lambda: messages.create(protobuf.GENERIC_MESSAGE).SerializeToString(),
+            lambda: messages.prepared_generic().SerializeToString(),
+        ),
+    ]
+
+    print(f"{'':<12}{'before msg/s':>14}{'after msg/s':>14}{'speedup':>10}")
+    for name, before_func, after_func in scenarios:
+        before = measure(before_func, args.messages)
+        after = measure(after_func, args.messages)
+        print(f"{name:<12}{before:>14.0f}{after:>14.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
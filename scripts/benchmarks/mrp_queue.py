@@ -0,0 +1,102 @@
+"""Benchmark applying MRP content item updates to a large playback queue.
+
+Replays UPDATE_CONTENT_ITEM_MESSAGE updates against a queue (e.g. a long Music
+playlist) and compares the original approach (comparing every updated item with
+every item in the queue) with the indexed queue used by PlayerState.
+"""
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from functools import partial
+from time import perf_counter
+from typing import Callable, List
+
+from pyatv.protocols.mrp import messages
+from pyatv.protocols.mrp import protobuf as pb
+from pyatv.protocols.mrp.player_state import PlayerState
+
+
+def legacy_update(
+    items: List[pb.ContentItem], item_update: pb.UpdateContentItemMessage
+) -> None:
+    """Apply an update like the original implementation did."""
+    for updated_item in item_update.contentItems:
+        for existing in items:
+            if updated_item.identifier == existing.identifier:
+                existing.metadata.MergeFrom(updated_item.metadata)
+
+
+def make_set_state(queue_size: int) -> pb.SetStateMessage:
+    """Return a SetStateMessage with a playback queue."""
+    message = messages.create(pb.SET_STATE_MESSAGE)
+    queue = message.inner().playbackQueue
+    for index in range(queue_size):
+        item = queue.contentItems.add()
+        item.identifier = f"item{index}"
+        item.metadata.title = f"title{index}"
+    return message.inner()
+
+
+def make_updates(
+    queue_size: int, items_per_update: int
+) -> List[pb.UpdateContentItemMessage]:
+    """Return content item updates covering the entire queue."""
+    updates = []
+    for start in range(0, queue_size, items_per_update):
+        message = messages.create(pb.UPDATE_CONTENT_ITEM_MESSAGE)
+        for index in range(start, min(start + items_per_update, queue_size)):
+            item = message.inner().contentItems.add()
+            item.identifier = f"item{index}"
+            item.metadata.playCount = index
+            item.metadata.alternativeFormats.add().bitrate = 256
+        updates.append(message.inner())
+    return updates
+
+
+def measure(
+    apply: Callable[[pb.UpdateContentItemMessage], None],
+    updates: List[pb.UpdateContentItemMessage],
+    rounds: int,
+) -> float:
+    """Return number of applied updates per second."""
+    start = perf_counter()
+    for _ in range(rounds):
+        for update in updates:
+            apply(update)
+    return rounds * len(updates) / (perf_counter() - start)
+
+
+def main():
+    """Script starts here."""
+    parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "-q", "--queue-size", type=int, default=500, help="items in playback queue"
+    )
+    parser.add_argument(
+        "-r", "--rounds", type=int, default=5, help="times to replay updates"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'items/update':<14}{'before upd/s':>14}{'after upd/s':>14}"
+        f"{'speedup':>10}{'formats before/after':>24}"
+    )
+    for items_per_update in [1, 10, args.queue_size]:
+        updates = make_updates(args.queue_size, items_per_update)
+
+        legacy_items = list(make_set_state(args.queue_size).playbackQueue.contentItems)
+        player = PlayerState(None, pb.NowPlayingPlayer())
+        player.handle_set_state(make_set_state(args.queue_size))
+
+        before = measure(partial(legacy_update, legacy_items), updates, args.rounds)
+        after = measure(player.handle_content_item_update, updates, args.rounds)
+        formats = (
+            f"{len(legacy_items[0].metadata.alternativeFormats)}/"
+            f"{len(player.items[0].metadata.alternativeFormats)}"
+        )
+        print(
+            f"{items_per_update:<14}{before:>14.0f}{after:>14.0f}"
+            f"{after / before:>9.1f}x{formats:>24}"
+        )
+
+
+if __name__ == "__main__":
+    main()
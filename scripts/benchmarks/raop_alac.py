@@ -0,0 +1,91 @@
+"""Benchmark compressed versus uncompressed ALAC encoding for RAOP.
+
+Encodes audio with both encoders and reports CPU time needed per stream together with
+the amount of data sent on the wire. By default a generated test signal is used, but
+any audio file supported by pyatv can be passed as argument instead.
+"""
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+import math
+import struct
+from time import process_time
+from typing import List
+
+import miniaudio
+
+from pyatv.protocols.raop.alac import AlacEncoder, UncompressedAlacEncoder
+
+FRAMES_PER_PACKET = 352
+CHANNELS = 2
+SAMPLE_SIZE = 2
+SAMPLE_RATE = 44100
+PACKET_SIZE = FRAMES_PER_PACKET * CHANNELS * SAMPLE_SIZE
+PACKETS_PER_SECOND = SAMPLE_RATE / FRAMES_PER_PACKET
+RTP_HEADER_SIZE = 12
+
+
+def generate_packets(count: int) -> List[bytes]:
+    """Generate a test signal consisting of a few mixed tones."""
+    packets = []
+    for packet in range(count):
+        samples = []
+        for i in range(packet * FRAMES_PER_PACKET, (packet + 1) * FRAMES_PER_PACKET):
+            time = i / SAMPLE_RATE
+            left = 6000 * math.sin(2 * math.pi * 440 * time)
+            right = 4000 * math.sin(2 * math.pi * 660 * time)
+            samples += [int(left + right / 2), int(right + left / 3)]
+        packets.append(struct.pack(f"<{len(samples)}h", *samples))
+    return packets
+
+
+def load_packets(filename: str, count: int) -> List[bytes]:
+    """Decode an audio file and split it into packets."""
+    decoded = miniaudio.decode_file(
+        filename,
+        output_format=miniaudio.SampleFormat.SIGNED16,
+        nchannels=CHANNELS,
+        sample_rate=SAMPLE_RATE,
+    )
+    samples = decoded.samples.tobytes()
+    return [
+        samples[i : i + PACKET_SIZE]
+        for i in range(0, min(len(samples), count * PACKET_SIZE), PACKET_SIZE)
+    ]
+
+
+def main():
+    """Script starts here."""
+    parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument("filename", nargs="?", help="audio file to encode")
+    parser.add_argument(
+        "-n", "--packets", type=int, default=1000, help="packets to encode"
+    )
+    args = parser.parse_args()
+
+    if args.filename:
+        packets = load_packets(args.filename, args.packets)
+    else:
+        packets = generate_packets(args.packets)
+
+    print(
+        f"{'':<14}{'us/packet':>10}{'cpu/stream':>12}"
+        f"{'bytes/packet':>14}{'kbit/s':>10}"
+    )
+    for name, encoder in [
+        ("uncompressed", UncompressedAlacEncoder(CHANNELS, PACKET_SIZE)),
+        ("compressed", AlacEncoder(CHANNELS, PACKET_SIZE)),
+    ]:
+        start = process_time()
+        sizes = [len(encoder.encode(packet)) + RTP_HEADER_SIZE for packet in packets]
+        per_packet = (process_time() - start) / len(packets)
+
+        average_size = sum(sizes) / len(sizes)
+        print(
+            f"{name:<14}{per_packet * 10 ** 6:>10.1f}"
+            f"{100 * per_packet * PACKETS_PER_SECOND:>11.1f}%"
+            f"{average_size:>14.0f}"
+            f"{8 * average_size * PACKETS_PER_SECOND / 1000:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
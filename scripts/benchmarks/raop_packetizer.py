@@ -0,0 +1,62 @@
+"""Benchmark encoding of RAOP audio packets.
+
+Compares the original sample-by-sample ALAC packet builder with the encoder used by
+pyatv and reports how many packets per second a single core can produce. A RAOP
+stream requires about 125 packets per second (44100 Hz, 352 frames per packet).
+"""
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+import os
+from time import perf_counter
+from typing import Callable
+
+from bitarray import bitarray
+
+from pyatv.protocols.raop.alac import UncompressedAlacEncoder
+
+FRAMES_PER_PACKET = 352
+CHANNELS = 2
+SAMPLE_SIZE = 2
+PACKET_SIZE = FRAMES_PER_PACKET * CHANNELS * SAMPLE_SIZE
+PACKETS_PER_SECOND = 44100 / FRAMES_PER_PACKET
+
+
+def legacy_encode(frames: bytes) -> bytes:
+    """Encode frames like the original implementation did."""
+    audio = bitarray("00" + str(CHANNELS - 1) + 19 * "0" + "1")
+    for i in range(0, len(frames), 2):
+        audio.frombytes(bytes([frames[i + 1], frames[i]]))
+    return audio.tobytes()
+
+
+def measure(encode: Callable[[bytes], bytes], frames: bytes, count: int) -> float:
+    """Return number of encoded packets per second."""
+    start = perf_counter()
+    for _ in range(count):
+        encode(frames)
+    return count / (perf_counter() - start)
+
+
+def main():
+    """Script starts here."""
+    parser = ArgumentParser(formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "-n", "--packets", type=int, default=5000, help="packets to encode"
+    )
+    args = parser.parse_args()
+
+    frames = os.urandom(PACKET_SIZE)
+    encoder = UncompressedAlacEncoder(CHANNELS, PACKET_SIZE)
+    if encoder.encode(frames) != legacy_encode(frames):
+        raise Exception("encoders produce different output")
+
+    before = measure(legacy_encode, frames, args.packets)
+    after = measure(encoder.encode, frames, args.packets)
+
+    print(f"{'':<8}{'packets/s':>14}{'streams/core':>14}")
+    for name, rate in [("before", before), ("after", after)]:
+        print(f"{name:<8}{rate:>14.0f}{rate / PACKETS_PER_SECOND:>14.1f}")
+    print(f"Speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
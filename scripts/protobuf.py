@@ -27,15 +27,35 @@ BASE_PATH = os.path.join("pyatv", "protocols", "mrp", "protobuf")
 OUTPUT_TEMPLATE = """\"\"\"Simplified extension handling for protobuf messages.
 
 THIS CODE IS AUTO-GENERATED - DO NOT EDIT!!!
+
+Generated modules are imported when first used to not slow down importing pyatv. All
+modules with extensions (inner messages) are imported when ProtocolMessage is first
+used, so that extensions are registered before any message is parsed. Everything is
+imported directly in python 3.6 as lazy module attributes (PEP 562) are not supported.
 \"\"\"
 
-from .ProtocolMessage_pb2 import ProtocolMessage
+from importlib import import_module
+import sys
+from typing import TYPE_CHECKING
+
+from .ProtocolMessage_pb2 import ProtocolMessage as _ProtocolMessage
+
+if TYPE_CHECKING:
+    from .ProtocolMessage_pb2 import ProtocolMessage
 
+    {packages}
 
-{packages}
+    {messages}
 
 
-{messages}
+_EXTENSION_MODULES = [
+    {extension_modules}
+]
+
+
+_MESSAGE_MODULES = {{
+    {message_modules}
+}}
 
 
 _EXTENSION_LOOKUP = {{
@@ -46,15 +66,40 @@ _EXTENSION_LOOKUP = {{
 {constants}
 
 
+def _import(module_name):
+    return import_module("." + module_name, __name__)
+
+
 def _inner_message(self):
     extension = _EXTENSION_LOOKUP.get(self.type, None)
     if extension:
-        return self.Extensions[extension]
+        module_name, accessor = extension
+        return self.Extensions[getattr(_import(module_name), accessor)]
 
     raise Exception('unknown type: ' + str(self.type))
 
 
-ProtocolMessage.inner = _inner_message  # type: ignore
+def __getattr__(name):
+    if name == "ProtocolMessage":
+        for module_name in _EXTENSION_MODULES:
+            _import(module_name)
+        value = _ProtocolMessage
+    elif name in _MESSAGE_MODULES:
+        value = getattr(_import(_MESSAGE_MODULES[name]), name)
+    elif name.endswith("_pb2"):
+        value = _import(name)
+    else:
+        raise AttributeError(f"module {{__name__}} has no attribute {{name}}")
+
+    globals()[name] = value
+    return value
+
+
+_ProtocolMessage.inner = _inner_message  # type: ignore
+
+if sys.version_info < (3, 7):
+    for _name in ["ProtocolMessage", *_MESSAGE_MODULES]:
+        __getattr__(_name)
 """
 
 MessageInfo = namedtuple("MessageInfo", ["module", "title", "accessor", "const"])
@@ -183,6 +228,8 @@ def generate_module_code():
     message_names = set()
     packages = []
     messages = []
+    extension_modules = []
+    message_modules = []
     extensions = []
     constants = []
 
@@ -191,27 +238,29 @@ def generate_module_code():
         message_names.add(info.title)
         packages.append("from . import " + info.module)
         messages.append(f"from .{info.module} import {info.title}")
-        extensions.append(
-            f"ProtocolMessage.{info.const}: {info.module}.{info.accessor},"
-        )
-        constants.append(f"{info.const} = ProtocolMessage.{info.const}")
+        extension_modules.append(f'"{info.module}",')
+        message_modules.append(f'"{info.title}": "{info.module}",')
+        extension = f'("{info.module}", "{info.accessor}")'
+        extensions.append(f"_ProtocolMessage.{info.const}: {extension},")
+        constants.append(f"{info.const} = _ProtocolMessage.{info.const}")
 
         reused = REUSED_MESSAGES.get(info.const)
         if reused:
-            extensions.append(
-                f"ProtocolMessage.{reused}: {info.module}.{info.accessor},"
-            )
-            constants.append(f"{reused} = ProtocolMessage.{reused}")
+            extensions.append(f"_ProtocolMessage.{reused}: {extension},")
+            constants.append(f"{reused} = _ProtocolMessage.{reused}")
 
     # Look for remaining messages
     for module_name, message_name in extract_unreferenced_messages():
         if message_name not in message_names:
             message_names.add(message_name)
             messages.append(f"from .{module_name} import {message_name}")
+            message_modules.append(f'"{message_name}": "{module_name}",')
 
     return OUTPUT_TEMPLATE.format(
-        packages="\n".join(sorted(packages)),
-        messages="\n".join(sorted(messages)),
+        packages="\n    ".join(sorted(packages)),
+        messages="\n    ".join(sorted(messages)),
+        extension_modules="\n    ".join(sorted(extension_modules)),
+        message_modules="\n    ".join(sorted(message_modules)),
         extensions="\n    ".join(sorted(extensions)),
         constants="\n".join(sorted(constants)),
     )
@@ -20,6 +20,7 @@ from pyatv.interface import (
     FeatureInfo,
     Features,
     FeatureState,
+    FieldChange,
     Playing,
     Power,
     PushListener,
@@ -165,6 +166,7 @@ class SavingPushListener(PushListener):
     def __init__(self):
         self.last_update = None
         self.no_of_updates = 0
+        self.last_delta = None
 
     def playstatus_update(self, updater, playstatus: Playing) -> None:
         self.last_update = playstatus
@@ -173,6 +175,9 @@ class SavingPushListener(PushListener):
     def playstatus_error(self, updater, exception: Exception) -> None:
         pass
 
+    def playstatus_delta(self, updater, changes) -> None:
+        self.last_delta = changes
+
 
 @pytest.fixture(name="register_interface")
 def register_interface_fixture(facade_dummy):
@@ -579,6 +584,26 @@ async def test_takeover_push_updates(facade_dummy, register_interface, event_loo
     await _perform_update(3, "mrp")
 
 
+async def test_push_updates_delta(facade_dummy, register_interface, event_loop):
+    listener = SavingPushListener()
+    mrp_pusher = DummyPushUpdater(event_loop)
+    register_interface(FeatureName.PushUpdates, mrp_pusher, Protocol.MRP)
+
+    await facade_dummy.connect()
+    push_updater = facade_dummy.push_updater
+    push_updater.listener = listener
+    push_updater.start()
+
+    mrp_pusher.post_update(Playing(MediaType.Music, DeviceState.Idle, title="first"))
+    mrp_pusher.post_update(Playing(MediaType.Music, DeviceState.Paused, title="first"))
+
+    await until(lambda: listener.no_of_updates == 2)
+    await until(lambda: listener.last_delta.keys() == {"device_state"})
+    assert listener.last_delta["device_state"] == FieldChange(
+        DeviceState.Idle, DeviceState.Paused
+    )
+
+
 # All push updaters must be started and stopped in parallel, otherwise updates will
 # not be pushed when performing a takeover (as the protocol taken over was never
 # started)
@@ -203,6 +203,7 @@ class FakeMrpState:
         self.has_authenticated = False
         self.heartbeat_count = 0
         self.volume: float = 0.5
+        self.updates_config = None
 
     def _send(self, msg):
         for client in self.clients:
@@ -409,6 +410,7 @@ class FakeMrpService(MrpServerAuth, asyncio.Protocol):
         self.state.connection_state = inner.state
 
     def handle_client_updates_config(self, message, inner):
+        self.state.updates_config = inner
         for identifier, metadata in self.state.states.items():
             self.send_to_client(_set_state_message(metadata, identifier))
 
@@ -6,15 +6,22 @@ import logging
 import plistlib
 import random
 import string
+import struct
 from types import SimpleNamespace
-from typing import Dict, Optional, cast
-
-from bitarray import bitarray
+from typing import Dict, List, Optional, cast
 
 from pyatv.protocols.dmap import parser
 from pyatv.protocols.dmap.tag_definitions import lookup_tag
-from pyatv.protocols.raop.packets import RetransmitReqeust, RtpHeader, SyncPacket
+from pyatv.protocols.raop import timing
+from pyatv.protocols.raop.buffered import BUFFERED_STREAM_TYPE, decode_packet
+from pyatv.protocols.raop.packets import (
+    RetransmitReqeust,
+    RtpHeader,
+    SyncPacket,
+    TimingPacket,
+)
 from pyatv.protocols.raop.raop import parse_transport
+from pyatv.support.chacha20 import Chacha20Cipher
 from pyatv.support.http import (
     BasicHttpServer,
     HttpRequest,
@@ -33,6 +40,8 @@ DIGEST_PAYLOAD = (
 
 REALM = "raop"
 
+FRAMES_PER_PACKET = 352
+
 
 def requires_auth(method):
     @wraps(method)
@@ -93,14 +102,157 @@ def verify_password(method):
     return _impl
 
 
-def alac_decode(data: bytes) -> bytes:
-    """Decode an ALAC frame and return raw audio data."""
-    buffer = bitarray()
-    buffer.frombytes(data)
+class BitReader:
+    """Read bits in big endian order from a buffer."""
 
-    # Audio starts 23 bits in and last bit must be removed to keep byte alignment,
-    # otherwise an additional \x00 will be present at the end
-    return buffer[23:-1].tobytes()
+    def __init__(self, data: bytes) -> None:
+        self.value = int.from_bytes(data, "big")
+        self.length = 8 * len(data)
+        self.position = 0
+
+    def read(self, nbits: int) -> int:
+        self.position += nbits
+        return (self.value >> (self.length - self.position)) & ((1 << nbits) - 1)
+
+    def peek_ones(self, max_ones: int) -> int:
+        """Count number of leading ones (at most max_ones) without consuming."""
+        ones = 0
+        while ones < max_ones and self.position + ones < self.length:
+            if not (self.value >> (self.length - self.position - ones - 1)) & 1:
+                break
+            ones += 1
+        return ones
+
+
+def _rice_decode(reader: BitReader, num: int, bitsize: int, pb: int) -> List[int]:
+    """Decode adaptive Golomb coded residuals (dyn_decomp in reference decoder)."""
+
+    def _get(m: int, k: int, max_prefix: int, escape_bits: int) -> int:
+        prefix = reader.peek_ones(max_prefix)
+        if prefix >= max_prefix:
+            reader.read(max_prefix)
+            return reader.read(escape_bits)
+
+        reader.read(prefix + 1)
+        if k == 1:
+            return prefix
+        value = reader.read(k - 1)
+        result = prefix * m
+        if value > 0:
+            value = (value << 1) | reader.read(1)
+            result += value - 1
+        return result
+
+    residuals: List[int] = []
+    mb = 10
+    zmode = 0
+    while len(residuals) < num:
+        k = min(((mb >> 9) + 3).bit_length() - 1, 14)
+        n = _get((1 << k) - 1, k, 9, bitsize)
+        ndecode = n + zmode
+        residuals.append(-((ndecode + 1) >> 1) if ndecode & 1 else ndecode >> 1)
+        mb = pb * (n + zmode) + mb - ((pb * mb) >> 9)
+        if n > 0xFFFF:
+            mb = 0xFFFF
+        zmode = 0
+
+        if (mb << 2) < 512 and len(residuals) < num:
+            zmode = 1
+            k = (32 - mb.bit_length()) - 24 + ((mb + 16) >> 6)
+            zeros = _get(((1 << k) - 1) & 0x3FFF, k, 9, 16)
+            residuals += zeros * [0]
+            if zeros >= 65535:
+                zmode = 0
+            mb = 0
+
+    return residuals
+
+
+def _unpredict(residuals: List[int], coefs: List[int], chanbits: int) -> List[int]:
+    """Reverse adaptive prediction (unpc_block in reference decoder)."""
+    order = len(coefs)
+    half = 1 << (chanbits - 1)
+    mask = (1 << chanbits) - 1
+
+    def _extend(value):
+        return ((value + half) & mask) - half
+
+    out = [residuals[0]]
+    for j in range(1, order + 1):
+        out.append(_extend(residuals[j] + out[j - 1]))
+
+    for j in range(order + 1, len(residuals)):
+        top = out[j - order - 1]
+        total = sum(coefs[k] * (out[j - 1 - k] - top) for k in range(order))
+        residual = residuals[j]
+        out.append(_extend(residual + top + ((total + 256) >> 9)))
+
+        error = residual
+        for k in range(order - 1, -1, -1):
+            if error == 0:
+                break
+            diff = top - out[j - 1 - k]
+            sign = (diff > 0) - (diff < 0)
+            if residual > 0:
+                coefs[k] -= sign
+                error -= (order - k) * ((sign * diff) >> 9)
+                if error <= 0:
+                    break
+            else:
+                coefs[k] += sign
+                error -= (order - k) * ((-sign * diff) >> 9)
+                if error >= 0:
+                    break
+    return out
+
+
+def alac_decode(data: bytes) -> bytes:
+    """Decode an ALAC frame and return raw audio data.
+
+    Only the subset of ALAC produced by pyatv is supported, i.e. 16 bit samples with
+    uncompressed or compressed (mode 0) frames.
+    """
+    reader = BitReader(data)
+    element = reader.read(3)
+    reader.read(4 + 12)  # Element instance tag and unused
+    partial = reader.read(1)
+    reader.read(2)  # Shift
+    escaped = reader.read(1)
+    channels = element + 1
+    num = reader.read(32) if partial else FRAMES_PER_PACKET
+
+    if escaped:
+        samples = [reader.read(16) for _ in range(channels * num)]
+        return struct.pack(f"<{len(samples)}H", *samples)
+
+    mix_bits = reader.read(8)
+    mix_res = reader.read(8)
+    headers = []
+    for _ in range(channels):
+        reader.read(8)  # Mode and denshift
+        order = reader.read(8) & 0x1F
+        coefs = [reader.read(16) for _ in range(order)]
+        headers.append([coef - 0x10000 if coef & 0x8000 else coef for coef in coefs])
+
+    chanbits = 16 + channels - 1
+    decoded = [
+        _unpredict(_rice_decode(reader, num, chanbits, 40), coefs, chanbits)
+        for coefs in headers
+    ]
+    if reader.read(3) != 7:
+        raise Exception("missing end tag")
+
+    if channels == 1:
+        return struct.pack(f"<{num}h", *decoded[0])
+
+    samples = []
+    for mid, side in zip(*decoded):
+        if mix_res:
+            left = mid + side - ((mix_res * side) >> mix_bits)
+            samples += [left, left - side]
+        else:
+            samples += [mid, side]
+    return struct.pack(f"<{len(samples)}h", *samples)
 
 
 class FakeRaopState:
@@ -124,6 +276,10 @@ class FakeRaopState:
         self.initial_audio_level_supported: bool = False
         self.info_supported: bool = True
         self.teardown_called: bool = False
+        self.setup_count: int = 0
+        self.flush_count: int = 0
+        self.shared_key: Optional[bytes] = None
+        self.buffered_packets_received: int = 0
 
     @property
     def raw_audio(self) -> bytes:
@@ -211,6 +367,40 @@ class AudioReceiver(asyncio.Protocol):
         _LOGGER.debug("Audio receiver lost connection (%s)", exc)
 
 
+class BufferedAudioReceiver(asyncio.Protocol):
+    """Protocol used to receive buffered audio packets over TCP."""
+
+    def __init__(self, state: FakeRaopState):
+        """Initialize a new BufferedAudioReceiver instance."""
+        self.transport = None
+        self.state: FakeRaopState = state
+        self.buffer: bytes = b""
+        self.cipher = Chacha20Cipher(state.shared_key, state.shared_key)
+
+    def connection_made(self, transport):
+        """Handle that connection succeeded."""
+        self.transport = transport
+
+    def data_received(self, data: bytes):
+        """Handle incoming data."""
+        self.buffer += data
+        while len(self.buffer) >= 2:
+            length = int.from_bytes(self.buffer[0:2], byteorder="big")
+            if len(self.buffer) < length:
+                break
+
+            packet = decode_packet(self.cipher, self.buffer[2:length])
+            self.buffer = self.buffer[length:]
+
+            header = RtpHeader.decode(packet, allow_excessive=True)
+            self.state.audio_packets[header.seqno] = alac_decode(packet[12:])
+            self.state.buffered_packets_received += 1
+
+    def connection_lost(self, exc):
+        """Handle that connection was lost."""
+        _LOGGER.debug("Buffered audio receiver lost connection (%s)", exc)
+
+
 class TimingServer(asyncio.Protocol):
     """Protocol used for time synchronization."""
 
@@ -237,6 +427,24 @@ class TimingServer(asyncio.Protocol):
         """Handle incoming data."""
         _LOGGER.debug("Received timing packet: %s", data)
 
+        # Respond to timing requests
+        if data[1] & 0x7F == 0x52:
+            req = TimingPacket.decode(data)
+            now_sec, now_frac = timing.ntp2parts(timing.ntp_now())
+            resp = TimingPacket.encode(
+                req.proto,
+                0x53 | 0x80,
+                7,
+                0,
+                req.sendtime_sec,
+                req.sendtime_frac,
+                now_sec,
+                now_frac,
+                now_sec,
+                now_frac,
+            )
+            self.transport.sendto(resp, addr)
+
     def error_received(self, exc) -> None:
         """Handle a connection error."""
         self.transport.close()
@@ -300,6 +508,7 @@ class FakeRaopService(HttpSimpleRouter):
         self._audio_receiver: Optional[AudioReceiver] = None
         self._timing_server: Optional[TimingServer] = None
         self._control_server: Optional[ControlServer] = None
+        self._buffered_server: Optional[asyncio.AbstractServer] = None
         self.add_route("ANNOUNCE", "rtsp://.*", self.handle_announce)
         self.add_route("SETUP", "rtsp://*", self.handle_setup)
         self.add_route("SET_PARAMETER", "rtsp://*", self.handle_set_parameter)
@@ -308,6 +517,7 @@ class FakeRaopService(HttpSimpleRouter):
         self.add_route("POST", "/auth-setup", self.handle_auth_setup)
         self.add_route("GET", "/info", self.handle_info)
         self.add_route("TEARDOWN", "rtsp://*", self.handle_teardown)
+        self.add_route("FLUSH", "rtsp://*", self.handle_flush)
 
     async def start(self, start_web_server: bool):
         """Start the fake RAOP service."""
@@ -329,6 +539,10 @@ class FakeRaopService(HttpSimpleRouter):
             local_addr=local_addr,
         )
 
+        self._buffered_server = await self.loop.create_server(
+            lambda: BufferedAudioReceiver(self.state), "0.0.0.0", 0
+        )
+
         self._audio_receiver = cast(AudioReceiver, audio_receiver)
         self._timing_server = cast(TimingServer, timing_server)
         self._control_server = cast(TimingServer, control_server)
@@ -350,6 +564,8 @@ class FakeRaopService(HttpSimpleRouter):
             self._timing_server.close()
         if self._control_server:
             self._control_server.close()
+        if self._buffered_server:
+            self._buffered_server.close()
 
     @requires_auth
     @verify_password
@@ -370,6 +586,10 @@ class FakeRaopService(HttpSimpleRouter):
     def handle_setup(self, request: HttpRequest) -> Optional[HttpResponse]:
         """Handle incoming SETUP request."""
         _LOGGER.debug("Received SETUP: %s", request)
+        self.state.setup_count += 1
+        if request.headers.get("Content-Type") == "application/x-apple-binary-plist":
+            return self._setup_buffered_stream(request)
+
         _, options = parse_transport(request.headers["Transport"])
         self.state.control_port = int(options["control_port"])
         headers = {
@@ -384,6 +604,36 @@ class FakeRaopService(HttpSimpleRouter):
         }
         return HttpResponse("RTSP", "1.0", 200, "OK", headers, b"")
 
+    def _setup_buffered_stream(self, request: HttpRequest) -> HttpResponse:
+        stream = plistlib.loads(request.body)["streams"][0]
+        if stream["type"] != BUFFERED_STREAM_TYPE:
+            return HttpResponse(
+                "RTSP",
+                "1.0",
+                400,
+                "Bad Request",
+                {"CSeq": request.headers["CSeq"]},
+                b"",
+            )
+
+        self.state.shared_key = stream["shk"]
+        self.state.control_port = int(stream["controlPort"])
+        body = {
+            "streams": [
+                {
+                    "type": BUFFERED_STREAM_TYPE,
+                    "dataPort": self._buffered_server.sockets[0].getsockname()[1],
+                    "controlPort": self._control_server.port,
+                }
+            ]
+        }
+        headers = {
+            "Session": "1",
+            "CSeq": request.headers["CSeq"],
+            "Content-Type": "application/x-apple-binary-plist",
+        }
+        return HttpResponse("RTSP", "1.0", 200, "OK", headers, plistlib.dumps(body))
+
     @requires_auth
     @verify_password
     def handle_set_parameter(self, request: HttpRequest) -> Optional[HttpResponse]:
@@ -480,6 +730,16 @@ class FakeRaopService(HttpSimpleRouter):
             plistlib.dumps(info),
         )
 
+    @requires_auth
+    @verify_password
+    def handle_flush(self, request: HttpRequest) -> Optional[HttpResponse]:
+        """Handle incoming FLUSH request."""
+        _LOGGER.debug("Received FLUSH: %s", request)
+        self.state.flush_count += 1
+        return HttpResponse(
+            "RTSP", "1.0", 200, "OK", {"CSeq": request.headers["CSeq"]}, b""
+        )
+
     def handle_teardown(self, request: HttpRequest) -> Optional[HttpResponse]:
         """Handle incoming TEARDOWN request."""
         self.state.teardown_called = True
@@ -0,0 +1,50 @@
+"""Unit tests for pyatv.protocols.airplay.channels."""
+from unittest.mock import MagicMock
+
+from pyatv.protocols.airplay.channels import EventChannel
+
+REQUEST = b"POST /command RTSP/1.0\r\nCSeq: {seqno}\r\nContent-Length: 4\r\n\r\nbody"
+
+
+def event_channel() -> EventChannel:
+    channel = EventChannel(32 * b"\x00", 32 * b"\x00")
+    channel.send = MagicMock()
+    return channel
+
+
+def test_event_channel_handles_several_requests():
+    channel = event_channel()
+    channel.buffer.append(
+        REQUEST.replace(b"{seqno}", b"1") + REQUEST.replace(b"{seqno}", b"2")
+    )
+    channel.handle_received()
+
+    assert channel.send.call_count == 2
+    assert b"CSeq: 2" in channel.send.call_args[0][0]
+    assert len(channel.buffer) == 0
+
+
+def test_event_channel_waits_for_body():
+    channel = event_channel()
+    request = REQUEST.replace(b"{seqno}", b"1")
+    channel.buffer.append(request[:-2])
+    channel.handle_received()
+    channel.send.assert_not_called()
+
+    channel.buffer.append(request[-2:])
+    channel.handle_received()
+    channel.send.assert_called_once()
+    assert len(channel.buffer) == 0
+
+
+def test_event_channel_discards_malformed_request():
+    channel = event_channel()
+    channel.buffer.append(
+        b"POST /command RTSP/1.0\r\nContent-Length: abc\r\n\r\n"
+        + REQUEST.replace(b"{seqno}", b"2")
+    )
+    channel.handle_received()
+
+    channel.send.assert_called_once()
+    assert b"CSeq: 2" in channel.send.call_args[0][0]
+    assert len(channel.buffer) == 0
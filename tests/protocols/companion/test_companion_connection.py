@@ -0,0 +1,51 @@
+"""Unit tests for pyatv.protocols.companion.connection."""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from pyatv.protocols.companion.connection import CompanionConnection, FrameType
+
+pytestmark = pytest.mark.asyncio
+
+
+def frame(frame_type: FrameType, payload: bytes) -> bytes:
+    return bytes([frame_type.value]) + len(payload).to_bytes(3, "big") + payload
+
+
+@pytest.fixture(name="connection")
+def connection_fixture(event_loop):
+    connection = CompanionConnection(event_loop, "127.0.0.1", 1234)
+    connection.connection_made(MagicMock())
+    yield connection
+
+
+async def test_exchange_several_frames_in_one_chunk(connection):
+    first = asyncio.ensure_future(
+        connection.exchange(FrameType.E_OPACK, b"req1", timeout=5)
+    )
+    second = asyncio.ensure_future(
+        connection.exchange(FrameType.E_OPACK, b"req2", timeout=5)
+    )
+    await asyncio.sleep(0)
+
+    connection.data_received(
+        frame(FrameType.E_OPACK, b"rsp1") + frame(FrameType.E_OPACK, b"rsp2")
+    )
+
+    assert (await first)[1] == b"rsp1"
+    assert (await second)[1] == b"rsp2"
+
+
+async def test_drop_frame_without_receiver(connection):
+    exchange = asyncio.ensure_future(
+        connection.exchange(FrameType.E_OPACK, b"req", timeout=5)
+    )
+    await asyncio.sleep(0)
+
+    connection.data_received(
+        frame(FrameType.E_OPACK, b"rsp") + frame(FrameType.E_OPACK, b"extra")
+    )
+
+    assert (await exchange)[1] == b"rsp"
+    assert not connection._queue
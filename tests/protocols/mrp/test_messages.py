@@ -0,0 +1,53 @@
+"""Unit tests for pyatv.protocols.mrp.messages."""
+import pytest
+
+from pyatv.protocols.mrp import messages, protobuf
+
+IDENTIFIER = "0B1F8A6E-3E63-4C4B-9B9B-8D4E5A6C7D8E"
+
+
+def _with_identifiers(message, prepared):
+    message.uniqueIdentifier = prepared.uniqueIdentifier
+    if prepared.identifier:
+        message.identifier = prepared.identifier
+    return message
+
+
+@pytest.mark.parametrize("identifier", [None, IDENTIFIER])
+def test_prepared_hid_event_identical_to_protobuf(identifier):
+    prepared = messages.prepared_hid_event(1, 0x8C, True)
+    prepared.identifier = identifier
+
+    expected = _with_identifiers(messages.send_hid_event(1, 0x8C, True), prepared)
+    assert prepared.SerializeToString() == expected.SerializeToString()
+    assert prepared.to_protobuf() == expected
+
+
+@pytest.mark.parametrize("identifier", [None, IDENTIFIER])
+def test_prepared_command_identical_to_protobuf(identifier):
+    prepared = messages.prepared_command(protobuf.CommandInfo_pb2.Play)
+    prepared.identifier = identifier
+
+    expected = _with_identifiers(
+        messages.command(protobuf.CommandInfo_pb2.Play), prepared
+    )
+    assert prepared.type == protobuf.SEND_COMMAND_MESSAGE
+    assert prepared.SerializeToString() == expected.SerializeToString()
+
+
+def test_prepared_messages_have_unique_identifiers():
+    first = messages.prepared_generic()
+    second = messages.prepared_generic()
+    assert first.uniqueIdentifier != second.uniqueIdentifier
+    assert first.SerializeToString() != second.SerializeToString()
+
+
+def test_prepared_message_with_arbitrary_identifier():
+    prepared = messages.prepared_generic()
+    prepared.identifier = "type_5"
+
+    parsed = protobuf.ProtocolMessage()
+    parsed.ParseFromString(prepared.SerializeToString())
+    assert parsed.type == protobuf.GENERIC_MESSAGE
+    assert parsed.identifier == "type_5"
+    assert parsed.uniqueIdentifier == prepared.uniqueIdentifier
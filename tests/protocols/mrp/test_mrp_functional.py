@@ -20,6 +20,7 @@ from pyatv.const import (
     PowerState,
     Protocol,
     ShuffleState,
+    UpdateSubscription,
 )
 from pyatv.protocols.mrp.protobuf import CommandInfo_pb2
 
@@ -226,6 +227,25 @@ class MRPFunctionalTest(common_functional_tests.CommonFunctionalTests):
         self.assertEqual(artwork.width, 111)
         self.assertEqual(artwork.height, 222)
 
+    @unittest_run_loop
+    async def test_metadata_artwork_cache_by_size(self):
+        self.usecase.example_video()
+        self.usecase.change_artwork(ARTWORK_BYTES, ARTWORK_MIMETYPE, ARTWORK_ID)
+
+        await self.playing(title="dummy")
+
+        artwork = await self.atv.metadata.artwork(width=64)
+        self.assertEqual(artwork.bytes, ARTWORK_BYTES)
+
+        # Simulate that device returns other data for another size
+        self.usecase.change_artwork(b"large", ARTWORK_MIMETYPE, ARTWORK_ID)
+
+        artwork = await self.atv.metadata.artwork(width=1024)
+        self.assertEqual(artwork.bytes, b"large")
+
+        artwork = await self.atv.metadata.artwork(width=64)
+        self.assertEqual(artwork.bytes, ARTWORK_BYTES)
+
     @unittest_run_loop
     async def test_item_updates(self):
         self.usecase.video_playing(
@@ -348,6 +368,47 @@ class MRPFunctionalTest(common_functional_tests.CommonFunctionalTests):
 
         self.assertFeatures(FeatureState.Available, FeatureName.Artwork)
 
+    @unittest_run_loop
+    async def test_update_subscriptions_all_by_default(self):
+        config = self.state.updates_config
+        self.assertTrue(config.artworkUpdates)
+        self.assertTrue(config.volumeUpdates)
+        self.assertTrue(config.keyboardUpdates)
+        self.assertTrue(config.outputDeviceUpdates)
+
+    @unittest_run_loop
+    async def test_update_subscriptions_play_state_only(self):
+        self.atv.close()
+        service = self.conf.get_service(Protocol.MRP)
+        service.update_subscriptions = UpdateSubscription.PlayState
+        self.atv = await self.get_connected_device()
+
+        config = self.state.updates_config
+        self.assertFalse(config.artworkUpdates)
+        self.assertFalse(config.volumeUpdates)
+        self.assertFalse(config.keyboardUpdates)
+        self.assertFalse(config.outputDeviceUpdates)
+
+        self.usecase.example_video()
+        self.usecase.change_artwork(ARTWORK_BYTES, ARTWORK_MIMETYPE, ARTWORK_ID)
+        await self.playing(title="dummy")
+
+        self.assertFeatures(FeatureState.Unavailable, FeatureName.Artwork)
+        self.assertIsNone(await self.atv.metadata.artwork())
+
+    @unittest_run_loop
+    async def test_update_subscriptions_volume_unavailable(self):
+        self.atv.close()
+        service = self.conf.get_service(Protocol.MRP)
+        service.update_subscriptions = UpdateSubscription.PlayState
+        self.atv = await self.get_connected_device()
+
+        self.usecase.change_volume_control(available=True)
+        self.usecase.example_video()
+        await self.playing(title="dummy")
+
+        self.assertFeatures(FeatureState.Unavailable, *self.supported_volume_controls())
+
     @unittest_run_loop
     async def test_features_with_supported_commands(self):
         feature_map = {
@@ -1,10 +1,24 @@
 """Unit tests for interface implementations in pyatv.protocols.mrp."""
+import asyncio
 import math
 
 import pytest
 
 from pyatv import exceptions
-from pyatv.protocols.mrp import MrpAudio, messages, protobuf
+from pyatv.const import FeatureName, FeatureState, UpdateSubscription
+from pyatv.interface import Playing
+from pyatv.protocols.mrp import (
+    MrpAudio,
+    MrpFeatures,
+    MrpPushUpdater,
+    messages,
+    protobuf,
+)
+from pyatv.protocols.mrp.player_state import DEFAULT_PLAYER_ID, PlayerStateManager
+
+from tests.utils import until
+
+pytestmark = pytest.mark.asyncio
 
 DEVICE_UID = "F2204E63-BCAB-4941-80A0-06C46CB71391"
 
@@ -15,6 +29,7 @@ class MrpProtocolMock:
     def __init__(self):
         self._listeners = {}
         self.sent_messages = []
+        self.subscriptions = UpdateSubscription.All
 
     def add_listener(self, listener, message_type, data=None):
         self._listeners[message_type] = listener
@@ -34,6 +49,31 @@ class MrpProtocolMock:
         await self.inject(message)
 
 
+class MetadataMock:
+    def __init__(self):
+        self.playing_count = 0
+
+    async def playing(self):
+        self.playing_count += 1
+        return Playing(position=self.playing_count)
+
+
+class PlayerStateManagerMock:
+    def __init__(self):
+        self.listener = None
+
+
+class PushListenerMock:
+    def __init__(self):
+        self.updates = []
+
+    def playstatus_update(self, updater, playstatus):
+        self.updates.append(playstatus.position)
+
+    def playstatus_error(self, updater, exception):
+        pass
+
+
 @pytest.fixture(name="protocol")
 def protocol_fixture(event_loop):
     yield MrpProtocolMock()
@@ -57,6 +97,12 @@ async def test_audio_volume_control_availability(protocol, audio):
     assert not audio.is_available
 
 
+async def test_audio_no_listeners_without_volume_subscription(protocol):
+    protocol.subscriptions = UpdateSubscription.PlayState
+    MrpAudio(protocol)
+    assert not protocol._listeners
+
+
 @pytest.mark.parametrize(
     "device_uid,controls_available,controls_expected",
     [
@@ -108,3 +154,140 @@ async def test_audio_set_volume(protocol, audio):
 async def test_audio_set_volume_no_output_device(audio):
     with pytest.raises(exceptions.ProtocolError):
         await audio.set_volume(10)
+
+
+# MrpPushUpdater
+
+
+@pytest.fixture(name="push_listener")
+def push_listener_fixture():
+    yield PushListenerMock()
+
+
+@pytest.fixture(name="create_push_updater")
+def create_push_updater_fixture(event_loop, push_listener):
+    updaters = []
+
+    def _create(**kwargs):
+        updater = MrpPushUpdater(
+            event_loop, MetadataMock(), PlayerStateManagerMock(), **kwargs
+        )
+        updater.listener = push_listener
+        updaters.append(updater)
+        return updater
+
+    yield _create
+
+    for updater in updaters:
+        updater.stop()
+
+
+async def test_push_updater_posts_every_change_by_default(
+    create_push_updater, push_listener
+):
+    updater = create_push_updater()
+
+    for _ in range(3):
+        await updater.state_updated()
+    await asyncio.sleep(0)
+
+    assert push_listener.updates == [1, 2, 3]
+
+
+async def test_push_updater_coalesces_burst(create_push_updater, push_listener):
+    updater = create_push_updater(coalesce_window=0.05, max_latency=10.0)
+
+    for _ in range(5):
+        await updater.state_updated()
+    assert push_listener.updates == []
+
+    await until(lambda: push_listener.updates)
+    assert push_listener.updates == [1]
+    assert updater.metadata.playing_count == 1
+
+
+async def test_push_updater_max_latency(create_push_updater, push_listener):
+    updater = create_push_updater(coalesce_window=10.0, max_latency=0.05)
+
+    await updater.state_updated()
+    await updater.state_updated()
+
+    await until(lambda: push_listener.updates, timeout=1.0)
+    assert push_listener.updates == [1]
+
+
+async def test_push_updater_stop_cancels_pending_update(
+    create_push_updater, push_listener
+):
+    updater = create_push_updater(coalesce_window=0.01)
+
+    await updater.state_updated()
+    updater.stop()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await until(lambda: push_listener.updates, timeout=0.1)
+
+
+async def test_push_updater_stop_resets_max_latency(create_push_updater):
+    updater = create_push_updater(coalesce_window=0.01)
+
+    await updater.state_updated()
+    updater.stop()
+    assert updater._first_change is None
+
+
+# MrpFeatures
+
+
+@pytest.fixture(name="features")
+def features_fixture(protocol, audio):
+    yield MrpFeatures(None, PlayerStateManager(protocol), audio)
+
+
+async def set_state_with_commands(protocol, *commands):
+    message = messages.create(protobuf.SET_NOW_PLAYING_CLIENT_MESSAGE)
+    message.inner().client.bundleIdentifier = "client"
+    await protocol.inject(message)
+
+    message = messages.create(protobuf.SET_STATE_MESSAGE)
+    message.inner().playerPath.client.bundleIdentifier = "client"
+    message.inner().playerPath.player.identifier = DEFAULT_PLAYER_ID
+    for command in commands:
+        info = message.inner().supportedCommands.supportedCommands.add()
+        info.command = command
+        info.enabled = True
+    await protocol.inject(message)
+
+
+async def test_features_snapshot_updated_by_state(protocol, features):
+    assert features.in_state(FeatureState.Unavailable, FeatureName.Play)
+
+    await set_state_with_commands(protocol, protobuf.CommandInfo_pb2.Play)
+    assert features.in_state(FeatureState.Available, FeatureName.Play)
+    assert features.in_state(FeatureState.Unavailable, FeatureName.Pause)
+
+    await set_state_with_commands(protocol, protobuf.CommandInfo_pb2.Pause)
+    assert features.in_state(FeatureState.Unavailable, FeatureName.Play)
+    assert features.in_state(FeatureState.Available, FeatureName.Pause)
+
+
+async def test_features_snapshot_updated_by_volume(protocol, features):
+    assert features.in_state(FeatureState.Unavailable, FeatureName.SetVolume)
+
+    await protocol.volume_controls_changed(DEVICE_UID, True)
+    assert features.in_state(FeatureState.Available, FeatureName.SetVolume)
+
+
+async def test_features_all_features(protocol, features):
+    await set_state_with_commands(protocol, protobuf.CommandInfo_pb2.Play)
+
+    all_features = features.all_features(include_unsupported=True)
+    assert set(all_features) == set(FeatureName)
+
+    supported = features.all_features()
+    assert supported[FeatureName.Play].state == FeatureState.Available
+    assert all(info.state != FeatureState.Unsupported for info in supported.values())
+
+    # Returned dictionaries are copies
+    supported.clear()
+    assert features.all_features()
@@ -176,6 +176,49 @@ async def test_content_item_update(psm, protocol):
     assert player.metadata_field("playCount") == 1111
 
 
+async def test_content_item_update_replaces_repeated_fields(psm, protocol):
+    msg = set_path(messages.create(pb.SET_STATE_MESSAGE))
+    msg = add_metadata_item(msg, identifier="id", title="item")
+    await protocol.inject(msg)
+
+    for bitrate in [128, 256, 256]:
+        msg = set_path(messages.create(pb.UPDATE_CONTENT_ITEM_MESSAGE))
+        item = msg.inner().contentItems.add()
+        item.identifier = "id"
+        item.metadata.alternativeFormats.add().bitrate = bitrate
+        await protocol.inject(msg)
+
+    player = psm.get_player(msg.inner().playerPath)
+    formats = player.metadata.alternativeFormats
+    assert [audio_format.bitrate for audio_format in formats] == [256]
+    assert player.metadata_field("title") == "item"
+
+
+async def test_content_item_update_item_in_queue(psm, protocol):
+    msg = set_path(messages.create(pb.SET_STATE_MESSAGE))
+    for index in range(3):
+        msg = add_metadata_item(msg, identifier=f"id{index}", title=f"item{index}")
+    await protocol.inject(msg)
+
+    msg = set_path(messages.create(pb.UPDATE_CONTENT_ITEM_MESSAGE))
+    item = msg.inner().contentItems.add()
+    item.identifier = "id2"
+    item.metadata.title = "new title"
+    item = msg.inner().contentItems.add()
+    item.identifier = "unknown"
+    item.metadata.title = "unknown"
+    await protocol.inject(msg)
+
+    player = psm.get_player(msg.inner().playerPath)
+    assert [item.metadata.title for item in player.items] == [
+        "item0",
+        "item1",
+        "new title",
+    ]
+    assert player.items.get("id2").metadata.title == "new title"
+    assert player.items.get("unknown") is None
+
+
 async def test_get_command_info(psm, protocol):
     msg = set_path(messages.create(pb.SET_STATE_MESSAGE))
     info = msg.inner().supportedCommands.supportedCommands.add()
@@ -187,6 +230,34 @@ async def test_get_command_info(psm, protocol):
     assert player.command_info(pb.CommandInfo_pb2.Pause) is not None
 
 
+async def test_get_command_info_player_before_client(psm, protocol):
+    msg = messages.create(pb.SET_DEFAULT_SUPPORTED_COMMANDS_MESSAGE)
+    msg.inner().playerPath.client.bundleIdentifier = CLIENT_ID_1
+    for command in [pb.CommandInfo_pb2.Play, pb.CommandInfo_pb2.Pause]:
+        info = msg.inner().supportedCommands.supportedCommands.add()
+        info.command = command
+        info.enabled = True
+    await protocol.inject(msg)
+
+    msg = set_path(messages.create(pb.SET_STATE_MESSAGE))
+    info = msg.inner().supportedCommands.supportedCommands.add()
+    info.command = pb.CommandInfo_pb2.Pause
+    info.enabled = False
+    await protocol.inject(msg)
+
+    player = psm.get_player(msg.inner().playerPath)
+    assert player.command_info(pb.CommandInfo_pb2.Play).enabled
+    assert not player.command_info(pb.CommandInfo_pb2.Pause).enabled
+    assert player.command_info(pb.CommandInfo_pb2.Stop) is None
+
+
+async def test_generation_changes_with_state(psm, protocol):
+    generation = psm.generation
+
+    await protocol.inject(set_path(messages.create(pb.SET_STATE_MESSAGE)))
+    assert psm.generation > generation
+
+
 async def test_playback_state_without_rate(psm, protocol):
     msg = set_path(messages.create(pb.SET_STATE_MESSAGE))
     msg.inner().playbackState = pb.PlaybackState.Paused
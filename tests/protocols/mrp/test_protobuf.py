@@ -0,0 +1,41 @@
+"""Unit tests for pyatv.protocols.mrp.protobuf."""
+import subprocess
+import sys
+
+import pytest
+
+from pyatv.protocols.mrp import messages, protobuf
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, check=True
+    ).stdout.decode("utf-8")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires python 3.7")
+def test_message_modules_not_imported_by_pyatv():
+    output = _run(
+        "import sys, pyatv.protocols.mrp;"
+        "print('SetArtworkMessage_pb2' in str(list(sys.modules)))"
+    )
+    assert output.strip() == "False"
+
+
+def test_extensions_registered_when_parsing():
+    data = messages.create(protobuf.SET_STATE_MESSAGE)
+    data.inner().playbackState = protobuf.PlaybackState.Paused
+
+    output = _run(
+        "from pyatv.protocols.mrp import protobuf;"
+        "message = protobuf.ProtocolMessage();"
+        f"message.ParseFromString({data.SerializeToString()!r});"
+        "print(message.inner().playbackState)"
+    )
+    assert int(output) == protobuf.PlaybackState.Paused
+
+
+def test_access_message_and_module():
+    assert (
+        protobuf.SetArtworkMessage is protobuf.SetArtworkMessage_pb2.SetArtworkMessage
+    )
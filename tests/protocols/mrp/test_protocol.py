@@ -6,13 +6,15 @@ import pytest
 from pyatv.auth.hap_srp import SRPAuthHandler
 from pyatv.conf import ManualService
 from pyatv.const import Protocol
-from pyatv.protocols.mrp.connection import MrpConnection
+from pyatv.protocols.mrp import messages, protobuf
+from pyatv.protocols.mrp.connection import MrpConnection, decode_header
 from pyatv.protocols.mrp.protocol import (
     HEARTBEAT_INTERVAL,
     HEARTBEAT_RETRIES,
     MrpProtocol,
     heartbeat_loop,
 )
+from pyatv.support.variant import write_variant
 
 from tests.fake_device import FakeAppleTV
 from tests.utils import total_sleep_time, until
@@ -57,3 +59,80 @@ async def test_heartbeat_fail_closes_connection(stub_sleep):
     assert total_sleep_time() == HEARTBEAT_INTERVAL
 
     protocol.connection.close.assert_called_once()
+
+
+def _serialize(message):
+    data = message.SerializeToString()
+    return write_variant(len(data)) + data
+
+
+def test_decode_header():
+    message = messages.create(protobuf.SET_STATE_MESSAGE, identifier="abc")
+    message.inner().playbackState = protobuf.PlaybackState.Playing
+    message.timestamp = 2 ** 40
+
+    assert decode_header(message.SerializeToString()) == (
+        protobuf.SET_STATE_MESSAGE,
+        "abc",
+    )
+
+
+def test_decode_header_without_identifier():
+    message = messages.create(protobuf.GENERIC_MESSAGE)
+    assert decode_header(message.SerializeToString()) == (
+        protobuf.GENERIC_MESSAGE,
+        None,
+    )
+
+
+def test_decode_truncated_header():
+    data = messages.create(protobuf.GENERIC_MESSAGE, identifier="abc")
+    with pytest.raises(ValueError):
+        decode_header(data.SerializeToString()[0:4])
+
+
+@pytest.mark.asyncio
+async def test_skip_messages_without_listener(event_loop):
+    connection = MrpConnection("127.0.0.1", 1234, event_loop)
+    protocol = MrpProtocol(connection, SRPAuthHandler(), MagicMock())
+
+    received = []
+
+    async def _listener(message, _):
+        received.append(message)
+
+    protocol.add_listener(_listener, protobuf.SET_STATE_MESSAGE)
+
+    connection.data_received(
+        _serialize(messages.create(protobuf.UPDATE_OUTPUT_DEVICE_MESSAGE))
+        + _serialize(messages.create(protobuf.SET_STATE_MESSAGE))
+    )
+
+    await until(lambda: received)
+    assert received[0].type == protobuf.SET_STATE_MESSAGE
+    assert connection.skipped_messages == 1
+
+
+@pytest.mark.asyncio
+async def test_listener_without_skip_support_gets_all_messages(event_loop):
+    class _Listener:
+        def __init__(self):
+            self.received = []
+
+        def message_received(self, message, _):
+            self.received.append(message)
+
+    listener = _Listener()
+    connection = MrpConnection("127.0.0.1", 1234, event_loop)
+    connection.listener = listener
+
+    connection.data_received(
+        _serialize(messages.create(protobuf.UPDATE_OUTPUT_DEVICE_MESSAGE))
+        + _serialize(messages.create(protobuf.SET_STATE_MESSAGE))
+    )
+
+    assert [message.type for message in listener.received] == [
+        protobuf.UPDATE_OUTPUT_DEVICE_MESSAGE,
+        protobuf.SET_STATE_MESSAGE,
+    ]
+    assert connection.skipped_messages == 0
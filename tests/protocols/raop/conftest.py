@@ -1,15 +1,19 @@
 """Shared test code for RAOP test cases."""
 import asyncio
+import os
 from typing import cast
 
+from aiohttp import web
 import pytest
 
 from pyatv import connect
 from pyatv.conf import AppleTV, ManualService
 from pyatv.const import Protocol
+from pyatv.support.net import unused_port
 
 from tests.fake_device import FakeAppleTV, raop
 from tests.fake_device.raop import FakeRaopUseCases
+from tests.utils import data_path
 
 
 @pytest.fixture(name="raop_device")
@@ -46,3 +50,17 @@ async def raop_client_fixture(raop_conf, event_loop):
     client = await connect(raop_conf, loop=event_loop)
     yield client
     await asyncio.gather(*client.close())
+
+
+@pytest.fixture(name="data_url")
+async def data_url_fixture():
+    """Serve files in test data directory over HTTP and return base URL."""
+    app = web.Application()
+    app.router.add_static("/", os.path.dirname(data_path("README")))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    port = unused_port()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    yield f"http://127.0.0.1:{port}"
+    await runner.cleanup()
@@ -0,0 +1,109 @@
+"""Unit tests for pyatv.protocols.raop.alac."""
+import math
+import os
+import struct
+
+from bitarray import bitarray
+import pytest
+
+from pyatv.protocols.raop.alac import AlacEncoder, UncompressedAlacEncoder
+
+from tests.fake_device.raop import alac_decode
+
+FRAMES_PER_PACKET = 352
+PACKET_SIZE = FRAMES_PER_PACKET * 2 * 2
+
+
+def encode_reference(frames: bytes, channels: int = 2) -> bytes:
+    """Encode frames sample by sample (reference implementation)."""
+    frames += (PACKET_SIZE - len(frames)) * b"\x00"
+    audio = bitarray("00" + str(channels - 1) + 19 * "0" + "1")
+    for i in range(0, len(frames), 2):
+        audio.frombytes(bytes([frames[i + 1], frames[i]]))
+    return audio.tobytes()
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_encode_full_packet(channels):
+    encoder = UncompressedAlacEncoder(channels, PACKET_SIZE)
+    frames = os.urandom(PACKET_SIZE)
+    assert encoder.encode(frames) == encode_reference(frames, channels)
+
+
+def test_encode_partial_packet_is_padded():
+    encoder = UncompressedAlacEncoder(2, PACKET_SIZE)
+    frames = os.urandom(40)
+    assert encoder.encode(frames) == encode_reference(frames)
+
+
+def test_encode_reuses_buffers_without_leaking_data():
+    encoder = UncompressedAlacEncoder(2, PACKET_SIZE)
+    encoder.encode(os.urandom(PACKET_SIZE))
+
+    frames = os.urandom(100)
+    assert encoder.encode(frames) == encode_reference(frames)
+
+
+def test_encode_too_many_frames_raises():
+    encoder = UncompressedAlacEncoder(2, PACKET_SIZE)
+    with pytest.raises(ValueError):
+        encoder.encode(bytes(PACKET_SIZE + 4))
+
+
+def test_padding_is_silence():
+    encoder = UncompressedAlacEncoder(2, PACKET_SIZE)
+    assert encoder.padding == encode_reference(b"")
+    assert encoder.padding is encoder.padding
+
+
+def sine_packet(channels: int, offset: int = 0) -> bytes:
+    samples = []
+    for i in range(offset, offset + FRAMES_PER_PACKET):
+        samples.append(int(8000 * math.sin(i * 0.05)))
+        if channels == 2:
+            samples.append(int(5000 * math.sin(i * 0.031)))
+    return struct.pack(f"<{len(samples)}h", *samples)
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_compressed_sine_roundtrip(channels):
+    packet_size = FRAMES_PER_PACKET * 2 * channels
+    encoder = AlacEncoder(channels, packet_size)
+
+    for i in range(5):
+        frames = sine_packet(channels, i * FRAMES_PER_PACKET)
+        encoded = encoder.encode(frames)
+        assert len(encoded) < packet_size
+        assert alac_decode(encoded) == frames
+
+
+def test_compressed_partial_packet_is_padded():
+    encoder = AlacEncoder(2, PACKET_SIZE)
+    frames = sine_packet(2)[0:400]
+    assert alac_decode(encoder.encode(frames)) == frames + bytes(PACKET_SIZE - 400)
+
+
+def test_compressed_extreme_values_roundtrip():
+    encoder = AlacEncoder(2, PACKET_SIZE)
+    frames = struct.pack("<4h", 32767, -32768, -32768, 32767) * (PACKET_SIZE // 8)
+    assert alac_decode(encoder.encode(frames)) == frames
+
+
+def test_compressed_falls_back_to_uncompressed():
+    encoder = AlacEncoder(2, PACKET_SIZE)
+    frames = os.urandom(PACKET_SIZE)
+
+    encoded = encoder.encode(frames)
+    assert encoded == encode_reference(frames)
+    assert alac_decode(encoded) == frames
+
+
+def test_compressed_padding_is_small():
+    encoder = AlacEncoder(2, PACKET_SIZE)
+    assert len(encoder.padding) < 50
+    assert alac_decode(encoder.padding) == bytes(PACKET_SIZE)
+
+
+def test_compressed_unsupported_channels_raises():
+    with pytest.raises(ValueError):
+        AlacEncoder(3, PACKET_SIZE)
@@ -0,0 +1,360 @@
+"""Unit tests for pyatv.protocols.raop.audio_source."""
+import asyncio
+import io
+import os
+from queue import Queue
+import shutil
+
+from aiohttp import ClientSession
+import miniaudio
+import pytest
+
+from pyatv.exceptions import HttpError, NotSupportedError
+from pyatv.protocols.raop.audio_source import (
+    AudioFileCache,
+    BufferedReaderSource,
+    FileSource,
+    HttpReader,
+    HttpSource,
+    PlaylistSource,
+    open_source,
+)
+
+from tests.utils import data_path, until
+
+pytestmark = pytest.mark.asyncio
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+SAMPLE_SIZE = 2
+FRAMES_PER_PACKET = 352
+PACKET_SIZE = FRAMES_PER_PACKET * CHANNELS * SAMPLE_SIZE
+
+
+class FakeReader:
+    """Reader returning data added by test (blocks until data is available)."""
+
+    def __init__(self):
+        self.chunks = Queue()
+
+    def read(self, num_bytes: int) -> bytes:
+        return self.chunks.get()
+
+
+def decode_file(filename: str) -> bytes:
+    return miniaudio.decode_file(
+        data_path(filename),
+        output_format=miniaudio.SampleFormat.SIGNED16,
+        nchannels=CHANNELS,
+        sample_rate=SAMPLE_RATE,
+    ).samples.tobytes()
+
+
+async def read_all(source, nframes: int) -> bytes:
+    data = b""
+    while True:
+        frames = await source.readframes(nframes)
+        if not frames:
+            return data
+        data += frames
+
+
+@pytest.mark.parametrize(
+    "filename", ["audio_10_frames.wav", "audio_3_packets.wav", "static_3sec.ogg"]
+)
+async def test_file_source_matches_decoded_file(filename):
+    expected = decode_file(filename)
+
+    source = await FileSource.open(
+        data_path(filename), SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+    )
+    try:
+        assert await read_all(source, 352) == expected
+    finally:
+        await source.close()
+
+
+async def test_file_source_duration():
+    source = await FileSource.open(
+        data_path("static_3sec.ogg"), SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+    )
+    try:
+        assert source.duration == 3
+    finally:
+        await source.close()
+
+
+async def test_file_source_bounded_read_ahead():
+    source = await FileSource.open(
+        data_path("static_3sec.ogg"), SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+    )
+    try:
+        # Three seconds of audio is more than what fits in the read-ahead buffer, so
+        # decoding should stop once it is full
+        await until(source._chunks.full)
+        assert source._decode_task and not source._decode_task.done()
+    finally:
+        await source.close()
+
+
+async def test_file_source_close_with_full_read_ahead():
+    source = await FileSource.open(
+        data_path("static_3sec.ogg"), SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+    )
+    await until(source._chunks.full)
+    decode_task = source._decode_task
+
+    await asyncio.wait_for(source.close(), timeout=5.0)
+
+    # Cancellation must not be treated as end of stream
+    assert decode_task.cancelled()
+    assert all(chunk for chunk in list(source._chunks._queue))
+
+
+async def test_buffered_reader_source_matches_decoded_file():
+    with io.open(data_path("audio_3_packets.wav"), "rb") as source_file:
+        source = await BufferedReaderSource.open(
+            source_file, SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+        )
+        try:
+            assert await read_all(source, FRAMES_PER_PACKET) == decode_file(
+                "audio_3_packets.wav"
+            )
+            assert source.underruns == 0
+        finally:
+            await source.close()
+
+
+async def test_buffered_reader_source_underrun():
+    reader = FakeReader()
+    source = BufferedReaderSource(
+        reader, None, SAMPLE_RATE, CHANNELS, SAMPLE_SIZE, prebuffer_time=0.0
+    )
+    try:
+        reader.chunks.put(2 * PACKET_SIZE * b"\x01")
+        assert await source.readframes(FRAMES_PER_PACKET) == PACKET_SIZE * b"\x01"
+        assert await source.readframes(FRAMES_PER_PACKET) == PACKET_SIZE * b"\x01"
+        assert source.underruns == 0
+
+        # Buffer is now empty, so next read must wait for more data
+        read_task = asyncio.ensure_future(source.readframes(FRAMES_PER_PACKET))
+        await asyncio.sleep(0)
+        assert not read_task.done()
+
+        reader.chunks.put(PACKET_SIZE * b"\x02")
+        assert await read_task == PACKET_SIZE * b"\x02"
+        assert source.underruns == 1
+
+        # End of stream
+        reader.chunks.put(b"")
+        assert await source.readframes(FRAMES_PER_PACKET) == b""
+        assert source.underruns == 1
+    finally:
+        await source.close()
+
+
+@pytest.fixture(name="session")
+async def session_fixture():
+    session = ClientSession()
+    yield session
+    await session.close()
+
+
+async def test_http_source_matches_decoded_file(data_url, session):
+    source = await HttpSource.open(
+        f"{data_url}/audio_3_packets.wav", session, SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+    )
+    try:
+        assert await read_all(source, FRAMES_PER_PACKET) == decode_file(
+            "audio_3_packets.wav"
+        )
+        assert source.underruns == 0
+    finally:
+        await source.close()
+
+
+async def test_http_source_not_found(data_url, session):
+    with pytest.raises(HttpError) as exc:
+        await HttpSource.open(
+            f"{data_url}/missing.wav", session, SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+        )
+    assert exc.value.status_code == 404
+
+
+async def test_http_reader_bounded_read_ahead(data_url, session):
+    with io.open(data_path("static_3sec.ogg"), "rb") as source_file:
+        expected = source_file.read()
+
+    response = await session.get(f"{data_url}/static_3sec.ogg")
+    reader = HttpReader(response, 1024)
+    try:
+        # Download must pause once the read-ahead buffer is full
+        await until(lambda: reader._space_waiter is not None)
+        assert reader._buffer.available == 1024
+
+        loop = asyncio.get_event_loop()
+        data = b""
+        while True:
+            chunk = await loop.run_in_executor(None, reader.read, 4096)
+            if not chunk:
+                break
+            data += chunk
+        assert data == expected
+    finally:
+        reader.close()
+
+
+async def test_open_source_url_requires_session(data_url):
+    with pytest.raises(NotSupportedError):
+        await open_source(
+            f"{data_url}/audio_3_packets.wav", SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+        )
+
+
+async def test_open_source_buffer_times():
+    with io.open(data_path("audio_3_packets.wav"), "rb") as source_file:
+        source = await open_source(
+            source_file,
+            SAMPLE_RATE,
+            CHANNELS,
+            SAMPLE_SIZE,
+            prebuffer_time=0.25,
+            low_watermark_time=0.75,
+        )
+        try:
+            frame_size = CHANNELS * SAMPLE_SIZE
+            assert source._prebuffer_bytes == int(0.25 * SAMPLE_RATE) * frame_size
+            assert source._low_watermark_bytes == int(0.75 * SAMPLE_RATE) * frame_size
+        finally:
+            await source.close()
+
+
+async def test_playlist_source_plays_sources_without_gaps():
+    files = ["audio_10_frames.wav", "audio_3_packets.wav", "static_3sec.ogg"]
+
+    source = await PlaylistSource.open(
+        [data_path(filename) for filename in files],
+        SAMPLE_RATE,
+        CHANNELS,
+        SAMPLE_SIZE,
+    )
+    try:
+        # Next source is opened in the background while the current one is playing
+        assert source._next_source is not None
+        await until(source._next_source.done)
+
+        data = await read_all(source, FRAMES_PER_PACKET)
+        assert data == b"".join(decode_file(filename) for filename in files)
+    finally:
+        await source.close()
+
+
+async def test_playlist_source_duration():
+    source = await PlaylistSource.open(
+        [data_path("static_3sec.ogg"), data_path("static_3sec.ogg")],
+        SAMPLE_RATE,
+        CHANNELS,
+        SAMPLE_SIZE,
+    )
+    try:
+        assert source.duration == 6
+    finally:
+        await source.close()
+
+
+async def test_playlist_source_close_prefetched_source():
+    source = await PlaylistSource.open(
+        [data_path("audio_3_packets.wav"), data_path("static_3sec.ogg")],
+        SAMPLE_RATE,
+        CHANNELS,
+        SAMPLE_SIZE,
+    )
+    next_source = source._next_source
+    await until(next_source.done)
+
+    await source.close()
+    assert next_source.result()._decode_task is None
+
+
+async def test_file_cache_decodes_file_once(tmp_path):
+    cache = AudioFileCache(str(tmp_path / "cache"))
+
+    for _ in range(2):
+        source = await cache.open(
+            data_path("audio_3_packets.wav"), SAMPLE_RATE, CHANNELS, SAMPLE_SIZE
+        )
+        try:
+            assert await read_all(source, FRAMES_PER_PACKET) == decode_file(
+                "audio_3_packets.wav"
+            )
+        finally:
+            await source.close()
+
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+async def test_file_cache_key_includes_target_format(tmp_path):
+    cache = AudioFileCache(str(tmp_path / "cache"))
+
+    for sample_rate in [SAMPLE_RATE, 48000]:
+        source = await cache.open(
+            data_path("audio_10_frames.wav"), sample_rate, CHANNELS, SAMPLE_SIZE
+        )
+        await source.close()
+
+    assert cache.misses == 2
+
+
+async def test_file_cache_modified_file_is_decoded_again(tmp_path):
+    filename = str(tmp_path / "audio.wav")
+    shutil.copy(data_path("audio_10_frames.wav"), filename)
+    cache = AudioFileCache(str(tmp_path / "cache"))
+
+    source = await cache.open(filename, SAMPLE_RATE, CHANNELS, SAMPLE_SIZE)
+    await source.close()
+
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    source = await cache.open(filename, SAMPLE_RATE, CHANNELS, SAMPLE_SIZE)
+    await source.close()
+
+    assert cache.misses == 2
+
+
+async def test_file_cache_metadata(tmp_path):
+    cache = AudioFileCache(str(tmp_path / "cache"))
+
+    first = await cache.get_metadata(data_path("only_metadata.wav"))
+    second = await cache.get_metadata(data_path("only_metadata.wav"))
+
+    assert first.title == "pyatv"
+    assert first.artist == "postlund"
+    assert first == second
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+async def test_file_cache_evicts_least_recently_used(tmp_path):
+    file_size = len(decode_file("audio_3_packets.wav"))
+    cache = AudioFileCache(str(tmp_path / "cache"), max_size=2 * file_size)
+
+    filenames = []
+    for i in range(3):
+        filename = str(tmp_path / f"audio{i}.wav")
+        shutil.copy(data_path("audio_3_packets.wav"), filename)
+        filenames.append(filename)
+
+    # Use first file again, making the second one least recently used
+    for i in [0, 1, 0, 2]:
+        source = await cache.open(filenames[i], SAMPLE_RATE, CHANNELS, SAMPLE_SIZE)
+        await source.close()
+    assert cache.misses == 3
+    assert cache.size == 2 * file_size
+
+    source = await cache.open(filenames[0], SAMPLE_RATE, CHANNELS, SAMPLE_SIZE)
+    await source.close()
+    source = await cache.open(filenames[1], SAMPLE_RATE, CHANNELS, SAMPLE_SIZE)
+    await source.close()
+    assert cache.misses == 4
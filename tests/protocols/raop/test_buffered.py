@@ -0,0 +1,39 @@
+"""Unit tests for pyatv.protocols.raop.buffered."""
+from cryptography.exceptions import InvalidTag
+import pytest
+
+from pyatv.protocols.raop.buffered import (
+    SHARED_KEY_LENGTH,
+    decode_packet,
+    encode_packet,
+    generate_shared_key,
+)
+from pyatv.support.chacha20 import Chacha20Cipher
+
+HEADER = bytes(range(12))
+AUDIO = b"audio data"
+
+
+@pytest.fixture(name="cipher")
+def cipher_fixture():
+    key = generate_shared_key()
+    assert len(key) == SHARED_KEY_LENGTH
+    yield Chacha20Cipher(key, key)
+
+
+def test_encode_and_decode_packet(cipher):
+    frame = encode_packet(cipher, HEADER + AUDIO, 1)
+
+    assert int.from_bytes(frame[0:2], byteorder="big") == len(frame)
+    assert frame[2:14] == HEADER
+    assert AUDIO not in frame
+    assert frame[-8:] == (1).to_bytes(8, byteorder="little")
+    assert decode_packet(cipher, frame[2:]) == HEADER + AUDIO
+
+
+def test_header_is_authenticated(cipher):
+    frame = bytearray(encode_packet(cipher, HEADER + AUDIO, 0))
+    frame[2 + 4] ^= 0xFF  # Modify timestamp
+
+    with pytest.raises(InvalidTag):
+        decode_packet(cipher, bytes(frame[2:]))
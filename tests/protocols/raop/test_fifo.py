@@ -36,6 +36,17 @@ def test_get_missing_from_fifo():
         fifo[123]
 
 
+def test_get_negative_index_from_fifo():
+    fifo = PacketFifo(10)
+
+    with pytest.raises(KeyError):
+        fifo[-1]
+
+    fifo[0] = 123
+    with pytest.raises(KeyError):
+        fifo[-1]
+
+
 def test_get_index_not_int_raises():
     fifo = PacketFifo(10)
 
@@ -124,3 +135,42 @@ def test_repr():
     fifo[1] = 2
     fifo[2] = 3
     assert repr(fifo) == "{1: 2, 2: 3}"
+
+
+def test_capacity_rounded_to_power_of_two():
+    assert PacketFifo(1000).capacity == 1024
+    assert PacketFifo(2).capacity == 2
+
+
+def test_add_negative_index_raises():
+    fifo = PacketFifo(10)
+
+    with pytest.raises(ValueError):
+        fifo[-1] = 123
+
+
+def test_overflow_with_seqno_wraparound():
+    fifo = PacketFifo(4)
+    for seqno in [65534, 65535, 0, 1, 2]:
+        fifo[seqno] = seqno
+
+    assert len(fifo) == 4
+    assert 65534 not in fifo
+    assert list(fifo) == [65535, 0, 1, 2]
+
+
+def test_get_range():
+    fifo = PacketFifo(4)
+    fifo[1] = "a"
+    fifo[2] = "b"
+    fifo[4] = "c"
+
+    assert list(fifo.get_range(1, 4)) == [(1, "a"), (2, "b"), (3, None), (4, "c")]
+
+
+def test_get_range_with_seqno_wraparound():
+    fifo = PacketFifo(4)
+    fifo[65535] = "a"
+    fifo[0] = "b"
+
+    assert list(fifo.get_range(65535, 2)) == [(65535, "a"), (0, "b")]
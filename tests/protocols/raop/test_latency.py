@@ -0,0 +1,111 @@
+"""Unit tests for pyatv.protocols.raop.latency."""
+import pytest
+
+from pyatv.protocols.raop.latency import (
+    DEFAULT_LATENCY,
+    DEFAULT_PACKETS_COMPENSATE,
+    LATENCY_STEP,
+    MAX_PACKETS_COMPENSATE,
+    MIN_PACKETS_COMPENSATE,
+    LatencyController,
+)
+
+
+def send_packets(controller: LatencyController, count: int) -> None:
+    for _ in range(count):
+        controller.packet_sent()
+
+
+def test_fixed_latency_by_default():
+    controller = LatencyController()
+    send_packets(controller, 1000)
+    controller.stream_finished()
+    assert controller.latency == DEFAULT_LATENCY
+
+
+@pytest.mark.parametrize(
+    "min_latency,max_latency", [(0.0, 1.0), (-1.0, 1.0), (2.0, 1.0)]
+)
+def test_invalid_bounds(min_latency, max_latency):
+    with pytest.raises(ValueError):
+        LatencyController(min_latency, max_latency)
+
+
+@pytest.mark.parametrize(
+    "min_latency,max_latency,expected_min,expected_max",
+    [
+        (2.0, None, 2.0, 2.0),
+        (0.5, None, 0.5, DEFAULT_LATENCY),
+        (None, 1.0, 1.0, 1.0),
+        (None, 3.0, DEFAULT_LATENCY, 3.0),
+    ],
+)
+def test_single_bound(min_latency, max_latency, expected_min, expected_max):
+    controller = LatencyController()
+    controller.set_bounds(min_latency, max_latency)
+    assert controller.min_latency == expected_min
+    assert controller.max_latency == expected_max
+
+
+def test_latency_clamped_to_bounds():
+    controller = LatencyController(2.0, 3.0)
+    assert controller.latency == 2.0
+
+
+def test_decrease_latency_on_good_link():
+    controller = LatencyController(1.0, 2.0)
+    for _ in range(5):
+        send_packets(controller, 1000)
+        controller.stream_finished()
+    assert controller.latency == 1.0
+
+
+def test_increase_latency_on_lossy_link():
+    controller = LatencyController(1.0, 2.0)
+    send_packets(controller, 1000)
+    controller.retransmit_requested(50)
+    controller.stream_finished()
+    assert controller.latency == DEFAULT_LATENCY + LATENCY_STEP
+
+    for _ in range(5):
+        send_packets(controller, 1000)
+        controller.retransmit_requested(50)
+        controller.stream_finished()
+    assert controller.latency == 2.0
+
+
+def test_keep_latency_when_late():
+    controller = LatencyController(1.0, 2.0)
+    send_packets(controller, 1000)
+    controller.late()
+    controller.stream_finished()
+    assert controller.latency == DEFAULT_LATENCY
+
+
+def test_keep_latency_when_nothing_was_sent():
+    controller = LatencyController(1.0, 2.0)
+    controller.stream_finished()
+    assert controller.latency == DEFAULT_LATENCY
+
+
+def test_fewer_packets_compensate_on_lossy_link():
+    controller = LatencyController()
+    for _ in range(10):
+        send_packets(controller, 100)
+        controller.retransmit_requested(10)
+        controller.interval_completed()
+    assert controller.max_packets_compensate == MIN_PACKETS_COMPENSATE
+
+
+def test_more_packets_compensate_when_late_on_good_link():
+    controller = LatencyController()
+    send_packets(controller, 100)
+    controller.late()
+    controller.interval_completed()
+    assert controller.max_packets_compensate == DEFAULT_PACKETS_COMPENSATE + 1
+
+    for _ in range(10):
+        send_packets(controller, 100)
+        controller.late()
+        controller.interval_completed()
+    assert controller.max_packets_compensate == MAX_PACKETS_COMPENSATE
@@ -0,0 +1,70 @@
+"""Unit tests for pyatv.protocols.raop.metrics."""
+from pyatv.protocols.raop.metrics import (
+    RaopMetrics,
+    RaopMetricsListener,
+    SlackHistogram,
+)
+
+
+class MetricsListener(RaopMetricsListener):
+    def __init__(self):
+        self.updates = []
+
+    def metrics_updated(self, metrics: RaopMetrics) -> None:
+        self.updates.append(metrics.packets_sent)
+
+
+def test_slack_histogram():
+    histogram = SlackHistogram([-0.01, 0.0, 0.01])
+    for slack in [-1.0, -0.01, -0.005, 0.0, 0.005, 0.01, 1.0]:
+        histogram.add(slack)
+    assert histogram.counts == [1, 2, 2, 2]
+
+    histogram.reset()
+    assert histogram.counts == [0, 0, 0, 0]
+
+
+def test_packet_sent():
+    metrics = RaopMetrics()
+    metrics.packet_sent(0.005)
+    metrics.packet_sent(-0.001)
+    metrics.packet_sent(-0.010)
+
+    assert metrics.packets_sent == 3
+    assert metrics.late_packets == 1
+    assert sum(metrics.slack.counts) == 3
+
+
+def test_reset():
+    metrics = RaopMetrics()
+    metrics.packet_sent(-1.0)
+    metrics.frames_sent = 352
+    metrics.padding_packets = 1
+    metrics.retransmit_requests = 2
+    metrics.retransmitted_packets = 3
+    metrics.backlog_misses = 4
+    metrics.underruns = 5
+
+    metrics.reset()
+
+    assert metrics.packets_sent == 0
+    assert metrics.frames_sent == 0
+    assert metrics.late_packets == 0
+    assert metrics.padding_packets == 0
+    assert metrics.retransmit_requests == 0
+    assert metrics.retransmitted_packets == 0
+    assert metrics.backlog_misses == 0
+    assert metrics.underruns == 0
+    assert sum(metrics.slack.counts) == 0
+
+
+def test_notify_listener():
+    listener = MetricsListener()
+    metrics = RaopMetrics()
+    metrics.listener = listener
+
+    metrics.notify()
+    metrics.packet_sent(0.0)
+    metrics.notify()
+
+    assert listener.updates == [0, 1]
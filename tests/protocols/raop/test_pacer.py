@@ -0,0 +1,91 @@
+"""Unit tests for pyatv.protocols.raop.pacer."""
+import socket
+import time
+from typing import List
+
+import pytest
+
+from pyatv.protocols.raop.pacer import PacketPacer
+
+from tests.utils import until
+
+pytestmark = pytest.mark.asyncio
+
+PACKET_DURATION = 0.005
+
+
+@pytest.fixture(name="receiver")
+def receiver_fixture():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    yield sock
+    sock.close()
+
+
+@pytest.fixture(name="pacer")
+async def pacer_fixture():
+    pacer = PacketPacer(PACKET_DURATION, max_queued=4)
+    pacer.start()
+    yield pacer
+    await pacer.stop()
+
+
+async def test_send_packets_according_to_schedule(pacer, receiver):
+    address = receiver.getsockname()
+    sent: List[int] = []
+
+    start_time = time.perf_counter()
+    for i in range(10):
+        await pacer.wait_for_space()
+        assert pacer.queued <= 4
+        pacer.put([(address, bytes([i]))], lambda i=i: sent.append(i))
+    await pacer.drain()
+    elapsed = time.perf_counter() - start_time
+
+    assert [receiver.recv(1)[0] for _ in range(10)] == list(range(10))
+    assert sent == list(range(10))
+
+    # First packet is sent immediately, then one packet every PACKET_DURATION
+    assert elapsed >= 9 * PACKET_DURATION
+
+    stats = pacer.statistics
+    assert stats.packets_sent == 10
+    assert stats.max_jitter >= stats.average_jitter >= 0.0
+
+
+async def test_send_to_multiple_receivers(pacer, receiver):
+    second_receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    second_receiver.bind(("127.0.0.1", 0))
+    second_receiver.settimeout(1.0)
+
+    try:
+        pacer.put(
+            [
+                (receiver.getsockname(), b"first"),
+                (second_receiver.getsockname(), b"second"),
+            ]
+        )
+        await pacer.drain()
+
+        assert receiver.recv(10) == b"first"
+        assert second_receiver.recv(10) == b"second"
+        assert pacer.statistics.packets_sent == 1
+    finally:
+        second_receiver.close()
+
+
+async def test_stop_discards_queued_packets(receiver):
+    pacer = PacketPacer(10.0)
+    pacer.start()
+
+    for i in range(3):
+        pacer.put([(receiver.getsockname(), bytes([i]))])
+
+    # First packet is sent immediately, second one is due in ten seconds
+    await until(lambda: pacer.statistics.packets_sent == 1)
+
+    start_time = time.perf_counter()
+    await pacer.stop()
+    assert time.perf_counter() - start_time < 1.0
+    assert pacer.statistics.packets_sent == 1
@@ -14,10 +14,15 @@ from typing import Dict, List
 import pytest
 
 from pyatv import exceptions
+from pyatv.conf import AppleTV, ManualService
 from pyatv.const import DeviceState, FeatureName, FeatureState, MediaType, Protocol
 from pyatv.exceptions import AuthenticationError
 from pyatv.interface import FeatureInfo, Playing, PushListener
+from pyatv.protocols.raop import raop, stream_file_to_many
+from pyatv.protocols.raop.metrics import RaopMetrics, RaopMetricsListener
+from pyatv.protocols.raop.pacer import PacketPacer
 
+from tests.fake_device import FakeAppleTV
 from tests.utils import data_path, stub_sleep, until
 
 pytestmark = pytest.mark.asyncio
@@ -132,6 +137,49 @@ async def test_stream_complete_file(raop_client, raop_state):
     assert await audio_matches(raop_state.raw_audio, frames=10)
 
 
+@pytest.mark.parametrize("raop_properties", [({"et": "0", "md": "0"})])
+async def test_stream_file_with_cache(raop_client, raop_state, tmp_path):
+    cache_dir = tmp_path / "cache"
+
+    await raop_client.stream.stream_file(
+        data_path("audio_1_packet_metadata.wav"), cache_dir=str(cache_dir)
+    )
+
+    assert raop_state.metadata.title == "pyatv"
+    assert await audio_matches(raop_state.raw_audio, frames=FRAMES_PER_PACKET)
+    assert sorted(path.suffix for path in cache_dir.iterdir()) == [".json", ".pcm"]
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_stream_playlist_without_gaps(raop_client, raop_state):
+    await raop_client.stream.stream_file(
+        [data_path("audio_10_frames.wav"), data_path("audio_3_packets.wav")]
+    )
+
+    # Second file must start directly after the first one, without padding
+    assert await audio_matches(raop_state.raw_audio, frames=10)
+    assert await audio_matches(
+        raop_state.raw_audio[10 * CHANNELS * SAMPLE_WIDTH :],
+        frames=3 * FRAMES_PER_PACKET,
+    )
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_stream_from_url(raop_client, raop_state, data_url):
+    await raop_client.stream.stream_file(f"{data_url}/audio_3_packets.wav")
+
+    assert await audio_matches(raop_state.raw_audio, frames=3 * FRAMES_PER_PACKET)
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_stream_complete_file_compressed(raop_client, raop_state):
+    await raop_client.stream.stream_file(
+        data_path("audio_10_frames.wav"), compress=True
+    )
+
+    assert await audio_matches(raop_state.raw_audio, frames=10)
+
+
 @pytest.mark.skip(reason="unstable, must investigate")
 @pytest.mark.parametrize("raop_properties", [({"et": "0"})])
 async def test_stream_complete_file_verify_padding(raop_client, raop_state):
@@ -219,6 +267,56 @@ async def test_stream_with_password(
         assert False
 
 
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_stream_complete_file_threaded_pacing(
+    raop_client, raop_state, monkeypatch
+):
+    # Don't wait in real time for packets to be sent
+    monkeypatch.setattr(raop, "PacketPacer", lambda _: PacketPacer(0.0))
+
+    await raop_client.stream.stream_file(
+        data_path("audio_3_packets.wav"), threaded_pacing=True
+    )
+
+    assert await audio_matches(raop_state.raw_audio, frames=3 * FRAMES_PER_PACKET)
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0", "ft": "0x00000000,0x100"})])
+async def test_stream_complete_file_buffered(raop_client, raop_state):
+    await raop_client.stream.stream_file(
+        data_path("audio_3_packets.wav"), buffered=True
+    )
+
+    assert await audio_matches(raop_state.raw_audio, frames=3 * FRAMES_PER_PACKET)
+    assert raop_state.buffered_packets_received > 0
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_stream_buffered_not_supported(raop_client, raop_state):
+    await raop_client.stream.stream_file(
+        data_path("audio_3_packets.wav"), buffered=True
+    )
+
+    assert await audio_matches(raop_state.raw_audio, frames=3 * FRAMES_PER_PACKET)
+    assert raop_state.buffered_packets_received == 0
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0", "ft": "0x00000000,0x100"})])
+async def test_stream_change_to_buffered_sets_up_new_session(raop_client, raop_state):
+    await raop_client.stream.stream_file(data_path("audio_3_packets.wav"))
+    assert raop_state.buffered_packets_received == 0
+
+    raop_state.audio_packets.clear()
+    await raop_client.stream.stream_file(
+        data_path("audio_3_packets.wav"), buffered=True
+    )
+
+    assert raop_state.setup_count == 2
+    assert raop_state.teardown_called
+    assert await audio_matches(raop_state.raw_audio, frames=3 * FRAMES_PER_PACKET)
+    assert raop_state.buffered_packets_received > 0
+
+
 @pytest.mark.parametrize(
     "raop_properties,drop_packets,enable_retransmission",
     [({"et": "0"}, 0, True), ({"et": "0"}, 2, False), ({"et": "0"}, 2, True)],
@@ -248,6 +346,34 @@ async def test_stream_retransmission(
     )
 
 
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_stream_metrics(raop_client, raop_state, raop_usecase):
+    class MetricsListener(RaopMetricsListener):
+        def __init__(self):
+            self.updates = 0
+
+        def metrics_updated(self, metrics: RaopMetrics) -> None:
+            self.updates += 1
+
+    raop_usecase.drop_n_packets(2)
+
+    listener = MetricsListener()
+    await raop_client.stream.stream_file(
+        data_path("audio_3_packets.wav"), metrics_listener=listener
+    )
+
+    metrics = raop_client.stream.get(Protocol.RAOP).metrics
+    assert listener.updates > 0
+    assert metrics.frames_sent == 3 * FRAMES_PER_PACKET
+    assert metrics.padding_packets > 0
+    assert metrics.packets_sent == 3 + metrics.padding_packets
+    assert sum(metrics.slack.counts) == metrics.packets_sent
+
+    await until(lambda: metrics.retransmitted_packets == 2)
+    assert metrics.retransmit_requests > 0
+    assert metrics.backlog_misses == 0
+
+
 @pytest.mark.parametrize("raop_properties", [({"et": "0"})])
 async def test_push_updates(raop_client, playing_listener):
     await raop_client.stream.stream_file(data_path("only_metadata.wav"))
@@ -526,11 +652,35 @@ async def test_device_not_supporting_info_requests(raop_client, raop_usecase):
 
 
 @pytest.mark.parametrize("raop_properties", [({"et": "0"})])
-async def test_teardown_called_after_playback(raop_client, raop_state):
+async def test_session_kept_alive_after_playback(raop_client, raop_state):
     await raop_client.stream.stream_file(data_path("only_metadata.wav"))
+    assert raop_state.flush_count == 1
+    assert not raop_state.teardown_called
+
+    await asyncio.gather(*raop_client.close())
     assert raop_state.teardown_called
 
 
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_session_reused_for_next_stream(raop_client, raop_state):
+    await raop_client.stream.stream_file(data_path("only_metadata.wav"))
+    raop_state.audio_packets.clear()
+
+    await raop_client.stream.stream_file(data_path("audio_3_packets.wav"))
+
+    assert raop_state.setup_count == 1
+    assert raop_state.flush_count == 2
+    assert await audio_matches(raop_state.raw_audio, frames=3 * FRAMES_PER_PACKET)
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_session_torn_down_when_idle(raop_client, raop_state):
+    await raop_client.stream.stream_file(
+        data_path("only_metadata.wav"), idle_timeout=0.0
+    )
+    await until(lambda: raop_state.teardown_called)
+
+
 @pytest.mark.parametrize("raop_properties", [({"et": "0", "md": "0"})])
 async def test_stream_from_buffer(raop_client, raop_state):
     with io.open(data_path("audio_1_packet_metadata.wav"), "rb") as source_file:
@@ -561,3 +711,40 @@ async def test_stop_playback(raop_client, raop_state):
     await raop_client.stream.stream_file(data_path("audio_3_packets.wav"))
 
     assert len(raop_state.raw_audio) == ONE_FRAME_IN_BYTES
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_stream_to_many(raop_state, raop_conf, event_loop):
+    second_device = FakeAppleTV(event_loop, test_mode=False)
+    second_state, _ = second_device.add_service(Protocol.RAOP)
+    await second_device.start()
+
+    second_conf = AppleTV("127.0.0.1", "Second")
+    second_conf.add_service(
+        ManualService(
+            "raop_id2",
+            Protocol.RAOP,
+            second_device.get_port(Protocol.RAOP),
+            {"et": "0"},
+        )
+    )
+
+    try:
+        await stream_file_to_many(
+            [raop_conf, second_conf], data_path("audio_3_packets.wav")
+        )
+
+        for state in [raop_state, second_state]:
+            assert state.teardown_called
+            assert await audio_matches(state.raw_audio, frames=3 * FRAMES_PER_PACKET)
+    finally:
+        await second_device.stop()
+
+
+@pytest.mark.parametrize("raop_properties", [({"et": "0"})])
+async def test_stream_to_many_missing_service(raop_conf):
+    with pytest.raises(exceptions.NoServiceError):
+        await stream_file_to_many(
+            [raop_conf, AppleTV("127.0.0.1", "Missing")],
+            data_path("audio_3_packets.wav"),
+        )
@@ -0,0 +1,25 @@
+"""Unit tests for AudioRingBuffer in pyatv.protocols.raop.audio_source."""
+from pyatv.protocols.raop.audio_source import AudioRingBuffer
+
+
+def test_ring_buffer_write_and_read():
+    buffer = AudioRingBuffer(8)
+    assert buffer.free == 8
+
+    assert buffer.write(b"abcde") == 5
+    assert buffer.available == 5
+    assert buffer.read(3) == b"abc"
+
+    # Wraps around end of buffer
+    assert buffer.write(b"fghijk") == 6
+    assert buffer.available == 8
+    assert buffer.free == 0
+    assert buffer.read(10) == b"defghijk"
+    assert buffer.available == 0
+
+
+def test_ring_buffer_write_when_full():
+    buffer = AudioRingBuffer(4)
+    assert buffer.write(b"abcdef") == 4
+    assert buffer.read(4) == b"abcd"
+    assert buffer.read(4) == b""
@@ -0,0 +1,111 @@
+"""Unit tests for pyatv.protocols.raop.timing."""
+import asyncio
+
+import pytest
+
+from pyatv.protocols.raop.raop import TimingClient
+from pyatv.protocols.raop.timing import ClockEstimator
+
+from tests.fake_device.raop import TimingServer
+from tests.utils import until
+
+NTP_SECOND = 2 ** 32
+
+
+def ntp(seconds: float) -> int:
+    return int(seconds * NTP_SECOND)
+
+
+def exchange(
+    estimator: ClockEstimator,
+    local_time: float,
+    offset: float,
+    delay: float,
+    processing: float = 0.001,
+) -> None:
+    """Simulate a timing exchange with a receiver with a given clock offset."""
+    t1 = local_time
+    t2 = t1 + delay + offset
+    t3 = t2 + processing
+    t4 = t3 - offset + delay
+    estimator.add_sample(ntp(t1), ntp(t2), ntp(t3), ntp(t4))
+
+
+def test_no_samples():
+    estimator = ClockEstimator()
+    assert estimator.offset is None
+    assert estimator.drift is None
+    assert estimator.rate == 1.0
+    assert estimator.statistics == (0, 0.0, 0.0, 0.0)
+
+
+def test_offset_and_round_trip_time():
+    estimator = ClockEstimator()
+    exchange(estimator, 1000.0, offset=5.0, delay=0.010)
+
+    stats = estimator.statistics
+    assert stats.samples == 1
+    assert stats.offset == pytest.approx(5.0, abs=1e-6)
+    assert stats.round_trip_time == pytest.approx(0.020, abs=1e-6)
+
+
+def test_offset_from_sample_with_lowest_round_trip_time():
+    estimator = ClockEstimator()
+
+    # Asymmetric delay (only on the way back) makes offset wrong, but the sample
+    # with lowest round-trip time is most accurate
+    estimator.add_sample(ntp(1000.0), ntp(1005.005), ntp(1005.006), ntp(1001.100))
+    exchange(estimator, 1002.0, offset=5.0, delay=0.005)
+
+    assert estimator.offset == pytest.approx(5.0, abs=1e-6)
+    assert estimator.statistics.round_trip_time == pytest.approx(0.010, abs=1e-6)
+
+
+def test_ignore_invalid_sample():
+    estimator = ClockEstimator()
+    estimator.add_sample(ntp(1000.0), ntp(1000.0), ntp(1000.5), ntp(1000.1))
+    assert estimator.statistics.samples == 0
+
+
+def test_drift():
+    estimator = ClockEstimator()
+
+    # Receiver clock runs 100 ppm faster than local clock
+    for i in range(20):
+        local_time = 1000.0 + 2 * i
+        exchange(estimator, local_time, offset=5.0 + 2 * i * 100e-6, delay=0.005)
+
+    assert estimator.drift == pytest.approx(100e-6, rel=0.01)
+    assert estimator.rate == pytest.approx(1.0001, abs=1e-7)
+    assert estimator.statistics.drift == pytest.approx(100.0, rel=0.01)
+
+
+def test_no_drift_until_enough_time_has_passed():
+    estimator = ClockEstimator()
+    for i in range(5):
+        exchange(estimator, 1000.0 + i, offset=5.0, delay=0.005)
+    assert estimator.drift is None
+
+
+@pytest.mark.asyncio
+async def test_timing_client_measures_receiver_clock():
+    loop = asyncio.get_event_loop()
+    _, server = await loop.create_datagram_endpoint(
+        TimingServer, local_addr=("127.0.0.1", 0)
+    )
+    estimator = ClockEstimator()
+    _, client = await loop.create_datagram_endpoint(
+        lambda: TimingClient(estimator), local_addr=("127.0.0.1", 0)
+    )
+
+    try:
+        client.start("127.0.0.1", server.port)
+        await until(lambda: estimator.statistics.samples > 0)
+
+        # Fake receiver uses the same clock
+        stats = estimator.statistics
+        assert stats.offset == pytest.approx(0.0, abs=0.1)
+        assert 0.0 <= stats.round_trip_time < 0.1
+    finally:
+        client.close()
+        server.close()
@@ -1,8 +1,12 @@
 """Unit tests for cache."""
 
+from contextlib import contextmanager
+import os
+
 import pytest
 
-from pyatv.support.cache import Cache
+from pyatv.interface import ArtworkInfo
+from pyatv.support.cache import ArtworkCache, Cache
 
 ID1 = "id1"
 ID2 = "id2"
@@ -11,6 +15,10 @@ DATA1 = 123
 DATA2 = 456
 DATA3 = 789
 
+ARTWORK1 = ArtworkInfo(b"1" * 10, "image/png", 64, 64)
+ARTWORK2 = ArtworkInfo(b"2" * 10, "image/png", 1024, 1024)
+ARTWORK3 = ArtworkInfo(b"3" * 10, "image/jpeg", 512, 512)
+
 
 @pytest.fixture
 def cache():
@@ -93,3 +101,131 @@ def test_get_latest_identifier(cache):
 
     cache.get(ID1)
     assert cache.latest() == ID1
+
+
+# ArtworkCache
+
+
+@pytest.fixture(name="artwork_cache")
+def artwork_cache_fixture():
+    yield ArtworkCache(max_size=25)
+
+
+@pytest.mark.asyncio
+async def test_artwork_get_missing(artwork_cache):
+    assert await artwork_cache.get(ID1, 64, 64) is None
+    assert artwork_cache.misses == 1
+    assert artwork_cache.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_artwork_keyed_by_size(artwork_cache):
+    await artwork_cache.put(ID1, 64, 64, ARTWORK1)
+    await artwork_cache.put(ID1, 1024, None, ARTWORK2)
+
+    assert await artwork_cache.get(ID1, 64, 64) == ARTWORK1
+    assert await artwork_cache.get(ID1, 1024, None) == ARTWORK2
+    assert await artwork_cache.get(ID1, 512, None) is None
+    assert artwork_cache.hits == 2
+    assert artwork_cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_artwork_bounded_by_bytes(artwork_cache):
+    await artwork_cache.put(ID1, 64, 64, ARTWORK1)
+    await artwork_cache.put(ID2, 64, 64, ARTWORK2)
+    await artwork_cache.get(ID1, 64, 64)
+    await artwork_cache.put(ID3, 64, 64, ARTWORK3)
+
+    assert len(artwork_cache) == 2
+    assert artwork_cache.size == 20
+    assert await artwork_cache.get(ID1, 64, 64) == ARTWORK1
+    assert await artwork_cache.get(ID2, 64, 64) is None
+    assert await artwork_cache.get(ID3, 64, 64) == ARTWORK3
+
+
+@pytest.mark.asyncio
+async def test_artwork_replace_same_key(artwork_cache):
+    await artwork_cache.put(ID1, 64, 64, ARTWORK1)
+    await artwork_cache.put(ID1, 64, 64, ARTWORK2)
+
+    assert len(artwork_cache) == 1
+    assert artwork_cache.size == 10
+    assert await artwork_cache.get(ID1, 64, 64) == ARTWORK2
+
+
+@pytest.mark.asyncio
+async def test_artwork_larger_than_cache_not_stored(artwork_cache):
+    await artwork_cache.put(ID1, 64, 64, ARTWORK1)
+    await artwork_cache.put(ID2, 64, 64, ArtworkInfo(b"x" * 30, "image/png", 1, 1))
+
+    assert len(artwork_cache) == 1
+    assert await artwork_cache.get(ID1, 64, 64) == ARTWORK1
+
+
+@pytest.mark.asyncio
+async def test_artwork_persisted_to_directory(tmp_path):
+    cache = ArtworkCache(directory=str(tmp_path))
+    await cache.put(ID1, 64, None, ARTWORK1)
+
+    new_cache = ArtworkCache(directory=str(tmp_path))
+    assert await new_cache.get(ID1, 64, None) == ARTWORK1
+    assert await new_cache.get(ID1, 128, None) is None
+    assert new_cache.hits == 1
+    assert new_cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_artwork_directory_bounded_by_bytes(tmp_path):
+    cache = ArtworkCache(directory=str(tmp_path), disk_size=100)
+    for index in range(10):
+        await cache.put(f"id{index}", 64, 64, ARTWORK1)
+
+    files = os.listdir(tmp_path)
+    assert 0 < len(files) < 10
+    assert sum(os.path.getsize(tmp_path / name) for name in files) <= 100
+
+    new_cache = ArtworkCache(directory=str(tmp_path))
+    assert await new_cache.get("id9", 64, 64) == ARTWORK1
+    assert await new_cache.get("id0", 64, 64) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content", [b"garbage", b'["image/png"]\nx', b"5\nx"])
+async def test_artwork_corrupt_file_ignored(tmp_path, content):
+    cache = ArtworkCache(directory=str(tmp_path))
+    await cache.put(ID1, 64, 64, ARTWORK1)
+
+    for name in os.listdir(tmp_path):
+        (tmp_path / name).write_bytes(content)
+
+    assert await ArtworkCache(directory=str(tmp_path)).get(ID1, 64, 64) is None
+
+
+@pytest.mark.asyncio
+async def test_artwork_directory_entry_removed_during_eviction(tmp_path, monkeypatch):
+    class _RemovedEntry:
+        name = "removed.artwork"
+        path = str(tmp_path / name)
+
+        @staticmethod
+        def is_file():
+            return True
+
+        @staticmethod
+        def stat():
+            raise FileNotFoundError(_RemovedEntry.path)
+
+    scandir = os.scandir
+
+    @contextmanager
+    def _scandir(path):
+        with scandir(path) as entries:
+            yield [_RemovedEntry()] + list(entries)
+
+    monkeypatch.setattr(os, "scandir", _scandir)
+
+    cache = ArtworkCache(directory=str(tmp_path), disk_size=100)
+    await cache.put(ID1, 64, 64, ARTWORK1)
+
+    assert await ArtworkCache(directory=str(tmp_path)).get(ID1, 64, 64) == ARTWORK1
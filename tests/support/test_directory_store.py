@@ -0,0 +1,86 @@
+"""Unit tests for pyatv.support.directory_store."""
+
+from contextlib import contextmanager
+import os
+
+import pytest
+
+from pyatv.support.directory_store import DirectoryStore
+
+
+@pytest.fixture(name="store")
+def store_fixture(tmp_path):
+    yield DirectoryStore(str(tmp_path / "store"), 10, (".dat",))
+
+
+def test_write_and_read(store):
+    path = store.path("a.dat")
+    store.write(path, [b"abc", b"def"])
+
+    assert store.read(path) == b"abcdef"
+    assert store.size == 6
+
+
+def test_read_and_touch_missing_file(store):
+    assert store.read(store.path("missing.dat")) is None
+    assert not store.touch(store.path("missing.dat"))
+
+
+def test_failed_write_stores_nothing(store):
+    def _chunks():
+        yield b"abc"
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        store.write(store.path("a.dat"), _chunks())
+
+    assert os.listdir(store.directory) == []
+
+
+def test_evict_least_recently_used(store):
+    for name in ["a.dat", "b.dat"]:
+        store.write(store.path(name), [b"12345"])
+        os.utime(store.path(name), (1, 1) if name == "b.dat" else (2, 2))
+
+    store.write(store.path("c.dat"), [b"12345"])
+
+    assert sorted(os.listdir(store.directory)) == ["a.dat", "c.dat"]
+    assert store.size == 10
+
+
+def test_other_files_are_ignored(store):
+    store.write(store.path("a.dat"), [b"12345"])
+    with open(store.path("other.txt"), "wb") as other_file:
+        other_file.write(b"x" * 100)
+
+    store.write(store.path("b.dat"), [b"12345"])
+
+    assert sorted(os.listdir(store.directory)) == ["a.dat", "b.dat", "other.txt"]
+
+
+def test_file_removed_by_someone_else(store, monkeypatch):
+    class _RemovedEntry:
+        name = "removed.dat"
+        path = store.path(name)
+
+        @staticmethod
+        def is_file():
+            return True
+
+        @staticmethod
+        def stat():
+            raise FileNotFoundError(_RemovedEntry.path)
+
+    scandir = os.scandir
+
+    @contextmanager
+    def _scandir(path):
+        with scandir(path) as entries:
+            yield [_RemovedEntry()] + list(entries)
+
+    monkeypatch.setattr(os, "scandir", _scandir)
+
+    store.write(store.path("a.dat"), [b"12345"])
+
+    assert store.read(store.path("a.dat")) == b"12345"
+    assert store.size == 5
@@ -0,0 +1,102 @@
+"""Unit tests for pyatv.support.framing."""
+from pyatv.support.framing import FrameBuffer
+from pyatv.support.variant import write_variant
+
+
+def _frame_length(header):
+    return 2 + int.from_bytes(header, byteorder="big")
+
+
+def _fixed_frame(payload):
+    return len(payload).to_bytes(2, byteorder="big") + payload
+
+
+def test_empty_buffer():
+    buffer = FrameBuffer()
+    assert len(buffer) == 0
+    assert not buffer
+    assert buffer.read_variant_frame() is None
+    assert buffer.read_frame(2, _frame_length) is None
+
+
+def test_read_variant_frames():
+    buffer = FrameBuffer()
+    buffer.append(write_variant(3) + b"abc" + write_variant(200) + 200 * b"x")
+
+    assert buffer.read_variant_frame() == b"abc"
+    assert buffer.read_variant_frame() == 200 * b"x"
+    assert buffer.read_variant_frame() is None
+    assert len(buffer) == 0
+
+
+def test_read_variant_frame_in_chunks():
+    data = write_variant(300) + 300 * b"y"
+    buffer = FrameBuffer()
+
+    # First byte of variant only, then the rest of the frame byte by byte
+    for byte in data[:-1]:
+        buffer.append(bytes([byte]))
+        assert buffer.read_variant_frame() is None
+
+    buffer.append(data[-1:])
+    assert buffer.read_variant_frame() == 300 * b"y"
+
+
+def test_read_fixed_header_frames():
+    buffer = FrameBuffer()
+    buffer.append(_fixed_frame(b"abc") + _fixed_frame(b"de")[0:3])
+
+    assert buffer.read_frame(2, _frame_length) == b"\x00\x03abc"
+    assert buffer.read_frame(2, _frame_length) is None
+    assert len(buffer) == 3
+
+    buffer.append(b"e")
+    assert buffer.read_frame(2, _frame_length) == b"\x00\x02de"
+
+
+def test_frame_length_shorter_than_header_is_consumed():
+    buffer = FrameBuffer()
+    buffer.append(b"\x00\x00\x00")
+    assert buffer.read_frame(2, lambda header: 0) == b"\x00\x00"
+    assert len(buffer) == 1
+
+
+def test_peek_does_not_consume():
+    buffer = FrameBuffer()
+    buffer.append(b"abcd")
+    assert buffer.peek(2) == b"ab"
+    assert buffer.peek() == b"abcd"
+    assert buffer.read(3) == b"abc"
+    assert buffer.peek() == b"d"
+    assert buffer.read(2) is None
+
+
+def test_find_in_unconsumed_data():
+    buffer = FrameBuffer()
+    buffer.append(b"ab\r\nab\r\n")
+    assert buffer.find(b"\r\n") == 2
+    buffer.read(4)
+    assert buffer.find(b"\r\n") == 2
+    assert buffer.find(b"x") == -1
+
+
+def test_compact_consumed_data():
+    buffer = FrameBuffer(compact_threshold=10)
+    buffer.append(_fixed_frame(20 * b"a") + b"\x00")
+    assert buffer.read_frame(2, _frame_length) is not None
+
+    buffer.append(b"\x01b")
+    assert buffer.read_frame(2, _frame_length) == b"\x00\x01b"
+    assert len(buffer) == 0
+
+
+def test_append_while_frame_referenced():
+    buffer = FrameBuffer(compact_threshold=1)
+    buffer.append(_fixed_frame(b"abc") + b"\x00")
+    frame = buffer.read_frame(2, _frame_length)
+
+    # Buffer cannot be resized while frame is alive, data must still be intact
+    buffer.append(b"\x02de")
+    assert frame == b"\x00\x03abc"
+    assert buffer.read_frame(2, _frame_length) == b"\x00\x02de"
+    frame.release()
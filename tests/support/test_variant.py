@@ -1,7 +1,7 @@
 """Unit tests for pyatv.protocols.mrp.variant."""
 import pytest
 
-from pyatv.support.variant import read_variant, write_variant
+from pyatv.support.variant import decode_variant, read_variant, write_variant
 
 
 def test_read_single_byte():
@@ -25,6 +25,19 @@ def test_read_invalid_variant():
         read_variant(b"\x80")
 
 
+def test_decode_at_offset():
+    assert decode_variant(b"\xca\xb5\x44\xfe", 1) == (8757, 3)
+
+
+def test_decode_memoryview():
+    assert decode_variant(memoryview(b"\xc5\x92\x01")) == (18757, 3)
+
+
+def test_decode_invalid_variant():
+    with pytest.raises(ValueError):
+        decode_variant(b"\x00\x80", 1)
+
+
 def test_write_single_byte():
     assert write_variant(0x00) == b"\x00"
     assert write_variant(0x35) == b"\x35"
@@ -5,7 +5,7 @@ import pytest
 
 from pyatv import exceptions
 from pyatv.conf import AppleTV, ManualService
-from pyatv.const import DeviceModel, OperatingSystem, Protocol
+from pyatv.const import DeviceModel, OperatingSystem, Protocol, UpdateSubscription
 
 ADDRESS_1 = "127.0.0.1"
 ADDRESS_2 = "192.168.0.1"
@@ -224,6 +224,23 @@ def test_service_merge_credentials(creds1, creds2, expected):
     assert service1.credentials == expected
 
 
+def test_service_merge_settings():
+    service1 = ManualService("id1", Protocol.MRP, 0, {})
+    service2 = ManualService("id2", Protocol.MRP, 0, {})
+
+    service1.push_update_window = 0.2
+    service1.artwork_cache_dir = "/cache1"
+    service2.update_subscriptions = UpdateSubscription.Volume
+    service2.push_update_max_latency = 1.0
+
+    service1.merge(service2)
+
+    assert service1.update_subscriptions == UpdateSubscription.Volume
+    assert service1.push_update_window == 0.2
+    assert service1.push_update_max_latency == 1.0
+    assert service1.artwork_cache_dir == "/cache1"
+
+
 @pytest.mark.parametrize(
     "props1,props2,expected",
     [
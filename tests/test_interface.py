@@ -15,7 +15,7 @@ from pyatv.const import (
     RepeatState,
     ShuffleState,
 )
-from pyatv.interface import App, DeviceInfo, FeatureInfo, Playing
+from pyatv.interface import App, DeviceInfo, FeatureInfo, FieldChange, Playing
 
 # Contains two valid values for each property that are tested
 # against each other
@@ -461,3 +461,27 @@ def test_post_ignore_duplicate_update(event_loop, updates):
 
     assert listener.playstatus_update.call_count == 1
     listener.playstatus_update.assert_called_once_with(ANY, playing)
+
+
+def test_post_update_delta(event_loop):
+    listener = MagicMock()
+    first = Playing(title="first", position=10)
+    second = Playing(title="first", position=20)
+
+    async def _post_updates():
+        updater = PushUpdaterDummy(event_loop)
+        updater.listener = listener
+        updater.post_update(first)
+        updater.post_update(second)
+        updater.post_update(second)
+
+    event_loop.run_until_complete(_post_updates())
+
+    assert listener.playstatus_delta.call_count == 2
+    initial, changed = [args[1] for args, _ in listener.playstatus_delta.call_args_list]
+
+    assert initial["title"] == FieldChange(None, "first")
+    assert initial["position"] == FieldChange(None, 10)
+    assert initial.keys() == set(Playing._PROPERTIES)
+
+    assert changed == {"position": FieldChange(10, 20)}